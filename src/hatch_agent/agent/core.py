@@ -1,5 +1,6 @@
 """Agent orchestration: simple, testable Agent class."""
 
+from collections.abc import Iterator
 from typing import Any
 
 from hatch_agent.agent.llm import LLMClient
@@ -70,9 +71,26 @@ class Agent:
         output = f"(simulated) executed task: {task_description}\nusing prompt: {prompt}"
         return {"success": True, "output": output}
 
+    async def arun_task(self, task_description: str) -> dict[str, Any]:
+        """Run a task without blocking the event loop.
+
+        The provider calls are blocking, so the task runs in a worker thread;
+        several agents can then be awaited together with ``asyncio.gather``.
+        """
+        import asyncio
+
+        return await asyncio.to_thread(self.run_task, task_description)
+
     def chat(self, message: str) -> str:
         """Return a simulated chat response for interactive sessions."""
         if self.llm is not None:
             return self.llm.chat(message)
         # Simple echo-style response for now.
         return f"Agent {self.name} received: {message}"
+
+    def chat_stream(self, message: str) -> Iterator[str]:
+        """Yield a chat reply in chunks as soon as they are available."""
+        if self.llm is not None:
+            yield from self.llm.chat_stream(message)
+            return
+        yield self.chat(message)
@@ -9,10 +9,15 @@ The multi-agent approach uses:
 - 1 judge agent that evaluates and selects the best suggestion
 """
 
+from collections.abc import AsyncIterator, Iterator
 from dataclasses import dataclass
 from typing import Any
 
-from strands import Agent as StrandsAgent
+from hatch_agent.agent.models import create_model
+
+_SINGLE_AGENT_PROMPT = (
+    "You are an expert in Hatch project management, configuration, and automation."
+)
 
 
 class StrandsProvider:
@@ -61,24 +66,66 @@ class StrandsProvider:
             return output
         else:
             # Single agent mode - use strands-agents directly
-            underlying_config = self.config.get("underlying_config", {})
+            result = self._single_agent()(prompt)
+            return str(result)
 
-            # Pass through model configuration
-            if self.config.get("model") and "model" not in underlying_config:
-                underlying_config = dict(underlying_config)
-                underlying_config["model"] = self.config.get("model")
+    def _single_agent(self) -> Any:
+        """Create the strands agent for single agent mode.
 
-            system_prompt = (
-                "You are an expert in Hatch project management, configuration, and automation."
-            )
-            agent = StrandsAgent(system_prompt=system_prompt)
-            result = agent(prompt)
-            return str(result)
+        The agent talks to the configured underlying provider and model
+        rather than strands' default model.
+        """
+        underlying_provider = self.config.get("underlying_provider", "openai")
+        underlying_config = self.config.get("underlying_config", {})
+
+        # Pass through model configuration
+        if self.config.get("model") and "model" not in underlying_config:
+            underlying_config = dict(underlying_config)
+            underlying_config["model"] = self.config.get("model")
+
+        from strands import Agent as StrandsAgent
+
+        return StrandsAgent(
+            model=create_model(underlying_provider, underlying_config),
+            system_prompt=_SINGLE_AGENT_PROMPT,
+        )
 
     def chat(self, message: str) -> str:
         """Chat interface - routes to complete."""
         return self.complete(message)
 
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield the response to a prompt as text chunks.
+
+        Single agent mode streams tokens as the model produces them. The
+        multi-agent judge needs every suggestion before it can answer, so that
+        mode yields the complete response as one chunk.
+        """
+        if self.config.get("mode", "multi-agent") == "multi-agent":
+            yield self.complete(prompt)
+            return
+
+        agent = self._single_agent()
+        for event in _iter_async(agent.stream_async(prompt)):
+            if isinstance(event, dict) and isinstance(event.get("data"), str):
+                yield event["data"]
+
+
+def _iter_async(events: AsyncIterator[Any]) -> Iterator[Any]:
+    """Consume an async iterator from synchronous code on a private event loop."""
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(events.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
 
 @dataclass
 class LLMClient:
@@ -157,3 +204,8 @@ class LLMClient:
         """Chat with the LLM."""
         prov = self._provider()
         return prov.chat(message)
+
+    def chat_stream(self, message: str) -> Iterator[str]:
+        """Chat with the LLM, yielding the reply in chunks as it is generated."""
+        prov = self._provider()
+        return prov.stream(message)
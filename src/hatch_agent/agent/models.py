@@ -0,0 +1,96 @@
+"""Build strands model objects from hatch-agent provider settings.
+
+The provider SDKs are imported only when a model for that provider is built,
+so configuring one provider never requires the others to be installed.
+"""
+
+from typing import Any
+
+# Anthropic requires an explicit output budget on every request
+_ANTHROPIC_MAX_TOKENS = 4096
+
+# LiteLLM model prefixes for providers strands has no native model class for
+_LITELLM_PREFIXES = {"azure": "azure", "google": "vertex_ai", "cohere": "cohere"}
+
+# underlying_config keys passed on to LiteLLM, renamed to its argument names
+_LITELLM_ARGS = {
+    "api_key": "api_key",
+    "api_base": "api_base",
+    "project_id": "vertex_project",
+    "location": "vertex_location",
+}
+
+
+def _settings(provider_config: dict[str, Any], names: dict[str, str]) -> dict[str, Any]:
+    """Return the non-empty settings in ``names``, renamed to their target keys."""
+    return {
+        target: provider_config[name] for name, target in names.items() if provider_config.get(name)
+    }
+
+
+def create_model(provider_name: str, provider_config: dict[str, Any]) -> Any:
+    """Return the strands model for a configured provider.
+
+    Args:
+        provider_name: Underlying provider (openai, anthropic, bedrock, azure, google, cohere)
+        provider_config: The provider's ``underlying_config``, including ``model``
+
+    Returns:
+        A strands model instance to pass as ``Agent(model=...)``
+
+    Raises:
+        ValueError: If the provider is not supported or no model is configured
+        RuntimeError: If the provider's SDK is not installed
+    """
+    model_id = provider_config.get("model")
+    if not model_id:
+        raise ValueError(f"No model configured for provider '{provider_name}'")
+
+    try:
+        if provider_name == "openai":
+            from strands.models.openai import OpenAIModel
+
+            client_args = _settings(
+                provider_config, {"api_key": "api_key", "organization": "organization"}
+            )
+            return OpenAIModel(client_args=client_args, model_id=model_id)
+
+        if provider_name == "anthropic":
+            from strands.models.anthropic import AnthropicModel
+
+            return AnthropicModel(
+                client_args=_settings(provider_config, {"api_key": "api_key"}),
+                model_id=model_id,
+                max_tokens=_ANTHROPIC_MAX_TOKENS,
+            )
+
+        if provider_name == "bedrock":
+            import boto3
+            from strands.models.bedrock import BedrockModel
+
+            session = boto3.Session(
+                **_settings(
+                    provider_config,
+                    {
+                        "aws_access_key_id": "aws_access_key_id",
+                        "aws_secret_access_key": "aws_secret_access_key",
+                        "region": "region_name",
+                    },
+                )
+            )
+            return BedrockModel(boto_session=session, model_id=model_id)
+
+        if provider_name in _LITELLM_PREFIXES:
+            from strands.models.litellm import LiteLLMModel
+
+            name = provider_config.get("deployment") or model_id
+            return LiteLLMModel(
+                client_args=_settings(provider_config, _LITELLM_ARGS),
+                model_id=f"{_LITELLM_PREFIXES[provider_name]}/{name}",
+            )
+    except ImportError as e:
+        raise RuntimeError(
+            f"The '{provider_name}' provider needs an extra package that is not installed: {e}"
+        ) from e
+
+    raise ValueError(f"Unsupported provider: '{provider_name}'")
@@ -6,10 +6,22 @@ This module implements a multi-agent approach where:
 """
 
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from strands import Agent as StrandsAgent
+from hatch_agent.agent.plan import extract_plan
+
+if TYPE_CHECKING:
+    # strands pulls in the provider SDKs; it is imported when an agent is built
+    from strands import Agent as StrandsAgent
+
+# Providers whose strands model honours a cachePoint block after the system prompt
+_PROMPT_CACHE_PROVIDERS = frozenset({"anthropic", "bedrock"})
+
+# Token counters reported by strands in ``result.metrics.accumulated_usage``
+_USAGE_KEYS = ("inputTokens", "outputTokens", "cacheReadInputTokens", "cacheWriteInputTokens")
 
 
 @dataclass
@@ -37,16 +49,57 @@ class MultiAgentOrchestrator:
 
         Args:
             provider_name: The LLM provider to use (openai, anthropic, bedrock, etc.)
-            provider_config: Configuration for the LLM provider
+            provider_config: Configuration for the LLM provider; an optional
+                ``max_concurrent_agents`` caps how many specialists are queried at once
         """
         self.provider_name = provider_name
         self.provider_config = provider_config or {}
+        self.max_concurrent_agents = int(self.provider_config.get("max_concurrent_agents") or 0)
+        self._usage: dict[str, int] = {}
+        self._usage_lock = threading.Lock()
+
+    def _create_agent(self, name: str, role: str, instructions: str) -> "StrandsAgent":
+        """Create an agent with the given configuration.
+
+        The role instructions never change between runs, so for providers with
+        prompt caching they are followed by a cache point and only the task
+        prompt is billed at the full input rate on repeat calls. Older
+        strands releases only accept a plain string system prompt and get
+        one instead.
+        """
+        from strands import Agent as StrandsAgent
 
-    def _create_agent(self, name: str, role: str, instructions: str) -> StrandsAgent:
-        """Create an agent with the given configuration."""
         system_prompt = f"You are a {role}.\n\n{instructions}"
+        # Releases that take content blocks expose them as system_prompt_content
+        if self.provider_name in _PROMPT_CACHE_PROVIDERS and hasattr(
+            StrandsAgent, "system_prompt_content"
+        ):
+            try:
+                return StrandsAgent(
+                    system_prompt=[{"text": system_prompt}, {"cachePoint": {"type": "default"}}]
+                )
+            except (TypeError, ValueError):
+                pass
         return StrandsAgent(system_prompt=system_prompt)
 
+    def _record_usage(self, result: Any) -> None:
+        """Accumulate token usage reported on a strands result, if any."""
+        metrics = getattr(result, "metrics", None)
+        usage = getattr(metrics, "accumulated_usage", None)
+        if not isinstance(usage, dict):
+            return
+        with self._usage_lock:
+            for key in _USAGE_KEYS:
+                value = usage.get(key)
+                if isinstance(value, int):
+                    self._usage[key] = self._usage.get(key, 0) + value
+
+    def _with_usage(self, result: dict[str, Any]) -> dict[str, Any]:
+        """Attach the token usage collected during a run to its result."""
+        if self._usage:
+            result["usage"] = dict(self._usage)
+        return result
+
     def run(self, task: str, context: dict[str, Any] | None = None) -> dict[str, Any]:
         """Run the multi-agent system to solve a task.
 
@@ -58,6 +111,7 @@ class MultiAgentOrchestrator:
             Dict with selected suggestion, reasoning, and all agent responses
         """
         context = context or {}
+        self._usage = {}
 
         # Check if this is a dependency update task
         is_update_task = (
@@ -88,34 +142,28 @@ class MultiAgentOrchestrator:
         )
 
         # Get suggestions from both specialist agents
-        suggestions = []
-
-        # Agent 1 suggestion
-        response1 = self._get_agent_response(agent1, task, context)
-        suggestions.append(response1)
-
-        # Agent 2 suggestion
-        response2 = self._get_agent_response(agent2, task, context)
-        suggestions.append(response2)
+        suggestions = self._collect_suggestions([agent1, agent2], task, context)
 
         # Judge evaluates and selects
         selected = self._judge_suggestions(judge_agent, task, suggestions, context)
 
-        return {
-            "success": True,
-            "selected_suggestion": selected["suggestion"],
-            "selected_agent": selected["agent_name"],
-            "reasoning": selected["reasoning"],
-            "all_suggestions": [
-                {
-                    "agent": s.agent_name,
-                    "suggestion": s.suggestion,
-                    "reasoning": s.reasoning,
-                    "confidence": s.confidence,
-                }
-                for s in suggestions
-            ],
-        }
+        return self._with_usage(
+            {
+                "success": True,
+                "selected_suggestion": selected["suggestion"],
+                "selected_agent": selected["agent_name"],
+                "reasoning": selected["reasoning"],
+                "all_suggestions": [
+                    {
+                        "agent": s.agent_name,
+                        "suggestion": s.suggestion,
+                        "reasoning": s.reasoning,
+                        "confidence": s.confidence,
+                    }
+                    for s in suggestions
+                ],
+            }
+        )
 
     def _run_update_agents(self, task: str, context: dict[str, Any]) -> dict[str, Any]:
         """Run specialized agents for dependency updates.
@@ -144,32 +192,28 @@ class MultiAgentOrchestrator:
         )
 
         # Get suggestions from both specialist agents
-        suggestions = []
-
-        response1 = self._get_agent_response(agent1, task, context)
-        suggestions.append(response1)
-
-        response2 = self._get_agent_response(agent2, task, context)
-        suggestions.append(response2)
+        suggestions = self._collect_suggestions([agent1, agent2], task, context)
 
         # Judge evaluates and selects
         selected = self._judge_suggestions(judge_agent, task, suggestions, context)
 
-        return {
-            "success": True,
-            "selected_suggestion": selected["suggestion"],
-            "selected_agent": selected["agent_name"],
-            "reasoning": selected["reasoning"],
-            "all_suggestions": [
-                {
-                    "agent": s.agent_name,
-                    "suggestion": s.suggestion,
-                    "reasoning": s.reasoning,
-                    "confidence": s.confidence,
-                }
-                for s in suggestions
-            ],
-        }
+        return self._with_usage(
+            {
+                "success": True,
+                "selected_suggestion": selected["suggestion"],
+                "selected_agent": selected["agent_name"],
+                "reasoning": selected["reasoning"],
+                "all_suggestions": [
+                    {
+                        "agent": s.agent_name,
+                        "suggestion": s.suggestion,
+                        "reasoning": s.reasoning,
+                        "confidence": s.confidence,
+                    }
+                    for s in suggestions
+                ],
+            }
+        )
 
     def run_bulk_update_analysis(
         self, updates: list[dict[str, str]], context: dict[str, Any]
@@ -321,25 +365,7 @@ Provide this JSON block AFTER your explanation."""
         Returns:
             Parsed update plan dict or None if parsing fails
         """
-        if "UPDATE_PLAN:" not in suggestion:
-            return None
-
-        try:
-            plan_part = suggestion.split("UPDATE_PLAN:")[1].strip()
-
-            # Find the JSON object
-            start = plan_part.find("{")
-            end = plan_part.rfind("}") + 1
-
-            if start == -1 or end == 0:
-                return None
-
-            json_str = plan_part[start:end]
-            plan_data = json.loads(json_str)
-
-            return plan_data
-        except (json.JSONDecodeError, IndexError):
-            return None
+        return extract_plan(suggestion, "UPDATE_PLAN:")
 
     def _deduplicate_code_changes(self, code_changes: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Deduplicate code changes that affect the same file/lines.
@@ -600,16 +626,37 @@ Always provide your response as valid JSON with:
 Prioritize MINIMALISM above all else. The best update makes the fewest changes."""
 
     def _get_agent_response(
-        self, agent: StrandsAgent, task: str, context: dict[str, Any]
+        self, agent: "StrandsAgent", task: str, context: dict[str, Any]
     ) -> AgentResponse:
         """Get a response from a single agent."""
         prompt = self._build_prompt(task, context)
         result = agent.run(prompt)
+        self._record_usage(result)
         return self._parse_agent_response(agent.config.name, result)
 
+    def _collect_suggestions(
+        self, agents: list["StrandsAgent"], task: str, context: dict[str, Any]
+    ) -> list[AgentResponse]:
+        """Query the specialist agents concurrently.
+
+        Each call blocks on a provider round-trip, so running them in threads
+        makes the wait roughly the slowest agent instead of the sum of all.
+        Responses are returned in the same order as ``agents``. A positive
+        ``max_concurrent_agents`` bounds the pool for rate-limited providers.
+        """
+        workers = len(agents)
+        if self.max_concurrent_agents > 0:
+            workers = min(workers, self.max_concurrent_agents)
+        if workers < 2:
+            return [self._get_agent_response(agent, task, context) for agent in agents]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(
+                pool.map(lambda agent: self._get_agent_response(agent, task, context), agents)
+            )
+
     def _judge_suggestions(
         self,
-        judge: StrandsAgent,
+        judge: "StrandsAgent",
         task: str,
         suggestions: list[AgentResponse],
         context: dict[str, Any],
@@ -617,6 +664,7 @@ Prioritize MINIMALISM above all else. The best update makes the fewest changes."
         """Have the judge agent evaluate and select the best suggestion."""
         judge_prompt = self._build_judge_prompt(task, suggestions, context)
         result = judge.run(judge_prompt)
+        self._record_usage(result)
         decision = self._parse_judge_decision(result, suggestions)
         return decision
 
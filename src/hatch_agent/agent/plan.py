@@ -0,0 +1,40 @@
+"""Extraction of structured plans from agent suggestions.
+
+Commands ask the agents to end their answer with a marker such as
+``FIX_PLAN:`` followed by a JSON object. The last occurrence of the marker
+is used, since agents sometimes echo the instructions (marker included)
+before giving the real plan. The object is decoded in place with
+``JSONDecoder.raw_decode``, which stops at the end of the first complete
+value, so trailing prose (including stray braces) is ignored and the
+suggestion is never split or sliced.
+"""
+
+import json
+from typing import Any
+
+_DECODER = json.JSONDecoder()
+
+
+def extract_plan(suggestion: str, marker: str) -> dict[str, Any] | None:
+    """Return the JSON object that follows the last ``marker`` in a suggestion.
+
+    Args:
+        suggestion: Agent suggestion text
+        marker: Section marker, e.g. ``"FIX_PLAN:"``
+
+    Returns:
+        Parsed plan dict, or None if the marker, object or valid JSON is missing
+    """
+    marker_pos = suggestion.rfind(marker)
+    if marker_pos == -1:
+        return None
+
+    start = suggestion.find("{", marker_pos + len(marker))
+    if start == -1:
+        return None
+
+    try:
+        plan, _ = _DECODER.raw_decode(suggestion, start)
+    except json.JSONDecodeError:
+        return None
+    return plan
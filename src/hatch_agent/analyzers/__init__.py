@@ -1,13 +1,22 @@
-"""Project analysis helpers."""
+"""Project analysis helpers.
 
-from hatch_agent.analyzers.config import analyze_config
-from hatch_agent.analyzers.dependencies import analyze_dependencies
-from hatch_agent.analyzers.doctor import ProjectDoctor
-from hatch_agent.analyzers.fix import BuildFixer
-from hatch_agent.analyzers.migrate import ProjectMigrator
-from hatch_agent.analyzers.project import analyze_project
-from hatch_agent.analyzers.security import SecurityAuditor
-from hatch_agent.analyzers.sync import DependencySync
+Exports are resolved on first access so that importing one analyzer does not
+pull in the dependencies (hatch, requests) of all the others.
+"""
+
+import importlib
+from typing import Any
+
+_EXPORTS = {
+    "analyze_config": "hatch_agent.analyzers.config",
+    "analyze_dependencies": "hatch_agent.analyzers.dependencies",
+    "ProjectDoctor": "hatch_agent.analyzers.doctor",
+    "BuildFixer": "hatch_agent.analyzers.fix",
+    "ProjectMigrator": "hatch_agent.analyzers.migrate",
+    "analyze_project": "hatch_agent.analyzers.project",
+    "SecurityAuditor": "hatch_agent.analyzers.security",
+    "DependencySync": "hatch_agent.analyzers.sync",
+}
 
 __all__ = [
     "analyze_project",
@@ -19,3 +28,17 @@ __all__ = [
     "ProjectMigrator",
     "SecurityAuditor",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
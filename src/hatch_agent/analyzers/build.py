@@ -1,20 +1,27 @@
 """Utilities for analyzing Hatch build failures and project state."""
 
 import sys
+from collections import deque
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 if sys.version_info >= (3, 11):
     import tomllib as tomli
 else:
     import tomli
-from hatch.cli.application import Application
+
+if TYPE_CHECKING:
+    from hatch.cli.application import Application
+
+# Lines of each command's output kept for the agents; a long run keeps its
+# tail, where test summaries and the final errors are printed
+_MAX_OUTPUT_LINES = 2000
 
 
 class BuildAnalyzer:
     """Analyzes Hatch build failures including tests, formatting, and type checking."""
 
-    def __init__(self, project_root: Path | None = None, app: Application | None = None):
+    def __init__(self, project_root: Path | None = None, app: "Application | None" = None):
         """Initialize the build analyzer.
 
         Args:
@@ -25,7 +32,7 @@ class BuildAnalyzer:
         self.pyproject_path = self.project_root / "pyproject.toml"
         self.app = app
 
-    def _get_app(self) -> Application:
+    def _get_app(self) -> "Application":
         """Get or create the Hatch application instance."""
         if self.app is None:
             from hatch.cli.application import Application
@@ -46,25 +53,17 @@ class BuildAnalyzer:
 
         app = self._get_app()
 
-        # Run tests and capture output
-        test_result = self._run_tests(app)
-        context["test_result"] = test_result
-
-        # Check formatting
-        format_result = self._check_formatting(app)
-        context["format_result"] = format_result
-
-        # Check type hints
-        type_result = self._check_types(app)
-        context["type_result"] = type_result
-
-        # Get environment info
-        env_info = self._get_env_info(app)
-        context["env_info"] = env_info
+        # The steps share one hatch Application and usually the same
+        # environment, which hatch does not create safely from several
+        # threads at once, so they run one after another
+        context["test_result"] = self._run_tests(app)
+        context["format_result"] = self._check_formatting(app)
+        context["type_result"] = self._check_types(app)
+        context["env_info"] = self._get_env_info(app)
 
         return context
 
-    def _run_tests(self, app: Application) -> dict[str, Any]:
+    def _run_tests(self, app: "Application") -> dict[str, Any]:
         """Run tests using Hatch's environment system."""
         try:
             # Get the default or test environment
@@ -79,14 +78,15 @@ class BuildAnalyzer:
             env = app.get_environment(env_name)
 
             # Run the test command
-            output_lines = []
+            output_lines: deque[str] = deque(maxlen=_MAX_OUTPUT_LINES)
 
             try:
                 # Execute tests in the environment
-                for line in env.run_shell_command(
-                    ["pytest"] if env_name == "test" else ["hatch", "run", "test"]
-                ):
-                    output_lines.append(line)
+                output_lines.extend(
+                    env.run_shell_command(
+                        ["pytest"] if env_name == "test" else ["hatch", "run", "test"]
+                    )
+                )
 
                 return {
                     "success": True,
@@ -107,7 +107,7 @@ class BuildAnalyzer:
         except Exception as e:
             return {"success": False, "error": str(e), "command": "hatch run test"}
 
-    def _check_formatting(self, app: Application) -> dict[str, Any]:
+    def _check_formatting(self, app: "Application") -> dict[str, Any]:
         """Check code formatting using Hatch environment."""
         # Try to find a lint or format environment
         env_name = self._find_format_env(app)
@@ -121,11 +121,10 @@ class BuildAnalyzer:
 
         try:
             env = app.get_environment(env_name)
-            output_lines = []
+            output_lines: deque[str] = deque(maxlen=_MAX_OUTPUT_LINES)
 
             try:
-                for line in env.run_shell_command(["ruff", "check", "."]):
-                    output_lines.append(line)
+                output_lines.extend(env.run_shell_command(["ruff", "check", "."]))
 
                 return {
                     "success": True,
@@ -145,7 +144,7 @@ class BuildAnalyzer:
         except Exception as e:
             return {"success": None, "error": str(e), "command": "N/A"}
 
-    def _check_types(self, app: Application) -> dict[str, Any]:
+    def _check_types(self, app: "Application") -> dict[str, Any]:
         """Check type hints using Hatch environment."""
         env_name = self._find_type_env(app)
 
@@ -158,11 +157,10 @@ class BuildAnalyzer:
 
         try:
             env = app.get_environment(env_name)
-            output_lines = []
+            output_lines: deque[str] = deque(maxlen=_MAX_OUTPUT_LINES)
 
             try:
-                for line in env.run_shell_command(["mypy", "."]):
-                    output_lines.append(line)
+                output_lines.extend(env.run_shell_command(["mypy", "."]))
 
                 return {
                     "success": True,
@@ -182,7 +180,7 @@ class BuildAnalyzer:
         except Exception as e:
             return {"success": None, "error": str(e), "command": "N/A"}
 
-    def _get_env_info(self, app: Application) -> dict[str, Any]:
+    def _get_env_info(self, app: "Application") -> dict[str, Any]:
         """Get Hatch environment information."""
         try:
             environments = list(app.project.config.envs.keys())
@@ -191,7 +189,7 @@ class BuildAnalyzer:
         except Exception as e:
             return {"available": False, "error": str(e)}
 
-    def _find_test_env(self, app: Application) -> str | None:
+    def _find_test_env(self, app: "Application") -> str | None:
         """Find the test environment."""
         env_names = list(app.project.config.envs.keys())
 
@@ -203,7 +201,7 @@ class BuildAnalyzer:
         # Return first environment if available
         return env_names[0] if env_names else None
 
-    def _find_format_env(self, app: Application) -> str | None:
+    def _find_format_env(self, app: "Application") -> str | None:
         """Find the formatting/linting environment."""
         env_names = list(app.project.config.envs.keys())
 
@@ -213,7 +211,7 @@ class BuildAnalyzer:
 
         return env_names[0] if env_names else None
 
-    def _find_type_env(self, app: Application) -> str | None:
+    def _find_type_env(self, app: "Application") -> str | None:
         """Find the type checking environment."""
         env_names = list(app.project.config.envs.keys())
 
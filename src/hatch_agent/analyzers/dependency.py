@@ -1,32 +1,36 @@
 """Utilities for managing dependencies in pyproject.toml."""
 
-import sys
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-if sys.version_info >= (3, 11):
-    import tomllib as tomli
-else:
-    import tomli
-import tomli_w
-from hatch.cli.application import Application
+from hatch_agent.analyzers.updater import PyProjectIO
+
+if TYPE_CHECKING:
+    from hatch.cli.application import Application
 
 
 class DependencyManager:
     """Manages dependencies in pyproject.toml and Hatch environments."""
 
-    def __init__(self, project_root: Path | None = None, app: Application | None = None):
+    def __init__(
+        self,
+        project_root: Path | None = None,
+        app: "Application | None" = None,
+        pyproject_io: PyProjectIO | None = None,
+    ):
         """Initialize the dependency manager.
 
         Args:
             project_root: Root directory of the Hatch project (defaults to current directory)
             app: Hatch Application instance (will be created if not provided)
+            pyproject_io: Shared pyproject.toml reader/writer (created if not provided)
         """
         self.project_root = project_root or Path.cwd()
         self.pyproject_path = self.project_root / "pyproject.toml"
         self.app = app
+        self.pyproject_io = pyproject_io or PyProjectIO(self.pyproject_path)
 
-    def _get_app(self) -> Application:
+    def _get_app(self) -> "Application":
         """Get or create the Hatch application instance."""
         if self.app is None:
             from hatch.cli.application import Application
@@ -35,17 +39,12 @@ class DependencyManager:
         return self.app
 
     def read_pyproject(self) -> dict[str, Any]:
-        """Read the current pyproject.toml file."""
-        if not self.pyproject_path.exists():
-            raise FileNotFoundError(f"pyproject.toml not found at {self.pyproject_path}")
-
-        with open(self.pyproject_path, "rb") as f:
-            return tomli.load(f)
+        """Read the current pyproject.toml file (parsed once per change)."""
+        return self.pyproject_io.load()
 
     def write_pyproject(self, config: dict[str, Any]) -> None:
         """Write the updated pyproject.toml file."""
-        with open(self.pyproject_path, "wb") as f:
-            tomli_w.dump(config, f)
+        self.pyproject_io.save(config)
 
     def add_dependency(
         self, package: str, version_spec: str | None = None, optional_group: str | None = None
@@ -91,6 +90,8 @@ class DependencyManager:
             # Check if package already exists
             existing = self._find_existing_dependency(deps_list, package)
             if existing:
+                # Tables may have been added to the cached document above
+                self.pyproject_io.invalidate()
                 return {
                     "success": False,
                     "error": f"Package '{package}' already exists as '{existing}'",
@@ -111,6 +112,7 @@ class DependencyManager:
                 "action": "added",
             }
         except Exception as e:
+            self.pyproject_io.invalidate()
             return {"success": False, "error": str(e), "action": "failed"}
 
     def _find_existing_dependency(self, deps_list: list[str], package: str) -> str | None:
@@ -3,6 +3,7 @@
 import ast
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -706,14 +707,13 @@ class ProjectDoctor:
         warned = 0
         failed = 0
 
-        for category, method in check_methods:
-            try:
-                items = method()
-            except Exception as e:
-                items = [{"field": category, "status": "fail", "message": f"Check error: {e}"}]
+        # The checks only read project files, so they can run concurrently;
+        # results are still reported in the order listed above
+        with ThreadPoolExecutor(max_workers=len(check_methods)) as pool:
+            results = list(pool.map(self._run_check, check_methods))
 
+        for items in results:
             for item in items:
-                item["category"] = category
                 all_checks.append(item)
                 if item["status"] == "pass":
                     passed += 1
@@ -731,6 +731,25 @@ class ProjectDoctor:
     # Helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _run_check(check: tuple[str, Any]) -> list[dict[str, Any]]:
+        """Run one check, tagging its items with the category.
+
+        Args:
+            check: Tuple of (category, check method)
+
+        Returns:
+            The check's items, or a single failure item if the check raised
+        """
+        category, method = check
+        try:
+            items = method()
+        except Exception as e:
+            items = [{"field": category, "status": "fail", "message": f"Check error: {e}"}]
+        for item in items:
+            item["category"] = category
+        return items
+
     def _collect_imports(self) -> set[str]:
         """Walk source files and collect top-level import names."""
         imports: set[str] = set()
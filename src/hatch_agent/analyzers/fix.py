@@ -2,15 +2,16 @@
 
 import shutil
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from hatch.cli.application import Application
+if TYPE_CHECKING:
+    from hatch.cli.application import Application
 
 
 class BuildFixer:
     """Runs auto-fixes and collects remaining errors for AI-assisted fixing."""
 
-    def __init__(self, project_root: Path | None = None, app: Application | None = None):
+    def __init__(self, project_root: Path | None = None, app: "Application | None" = None):
         """Initialize the build fixer.
 
         Args:
@@ -21,13 +22,15 @@ class BuildFixer:
         self.pyproject_path = self.project_root / "pyproject.toml"
         self.app = app
 
-    def _get_app(self) -> Application:
+    def _get_app(self) -> "Application":
         """Get or create the Hatch application instance."""
         if self.app is None:
+            from hatch.cli.application import Application
+
             self.app = Application(self.project_root)
         return self.app
 
-    def _find_env(self, app: Application) -> str | None:
+    def _find_env(self, app: "Application") -> str | None:
         """Find a suitable environment to run commands in."""
         env_names = list(app.project.config.envs.keys())
         for name in ("lint", "format", "style", "default"):
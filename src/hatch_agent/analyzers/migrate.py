@@ -1,7 +1,9 @@
 """Migration utilities for converting projects to Hatch from other build systems."""
 
 import configparser
+import os
 import re
+import shutil
 import sys
 from pathlib import Path
 from typing import Any
@@ -557,13 +559,26 @@ class ProjectMigrator:
     def write_pyproject(self, config: dict[str, Any], path: Path | None = None) -> None:
         """Write a pyproject.toml dict to disk.
 
+        The new file is written next to the target and moved into place, so
+        the old file's inode (and any hard-linked backup of it) is untouched.
+        A symlinked pyproject.toml stays a symlink, with its target replaced,
+        and the existing file's permissions carry over.
+
         Args:
             config: The pyproject.toml dict to write.
             path: Output path (defaults to project_root/pyproject.toml).
         """
-        path = path or self.pyproject_path
-        with open(path, "wb") as f:
-            tomli_w.dump(config, f)
+        path = Path(os.path.realpath(path or self.pyproject_path))
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                tomli_w.dump(config, f)
+            if path.exists():
+                shutil.copymode(path, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
 
     def get_migration_diff(self, parsed_data: dict[str, Any], new_config: dict[str, Any]) -> str:
         """Generate a human-readable summary of the migration.
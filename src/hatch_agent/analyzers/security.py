@@ -1,32 +1,80 @@
 """Security auditing utilities for hatch-agent security command."""
 
+import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 if sys.version_info >= (3, 11):
     import tomllib as tomli
 else:
     import tomli
 
-import requests as http_requests
+if TYPE_CHECKING:
+    import requests
+
+from hatch_agent.cache.exact import ResponseCache
+from hatch_agent.config import get_cache_dir
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
+
+# OSV accepts at most 1000 queries per querybatch request
+_OSV_BATCH_SIZE = 1000
+_MAX_FETCH_WORKERS = 8
+# Advisories change rarely; a day-old OSV answer is fine for an audit
+OSV_CACHE_TTL = 24 * 60 * 60
+
+
+def _decode_json(response: Any) -> Any:
+    """Decode a JSON response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
 
 
 class SecurityAuditor:
     """Audits project dependencies for known security vulnerabilities."""
 
     OSV_API_URL = "https://api.osv.dev/v1/query"
+    OSV_BATCH_URL = "https://api.osv.dev/v1/querybatch"
+    OSV_VULN_URL = "https://api.osv.dev/v1/vulns/{vuln_id}"
     PYPI_API_URL = "https://pypi.org/pypi/{package}/json"
 
-    def __init__(self, project_root: Path | None = None):
+    def __init__(self, project_root: Path | None = None, cache_ttl: float = OSV_CACHE_TTL):
         """Initialize the security auditor.
 
         Args:
             project_root: Root directory of the Hatch project (defaults to current directory)
+            cache_ttl: Seconds to reuse OSV lookups from the on-disk cache (0 disables it)
         """
         self.project_root = project_root or Path.cwd()
         self.pyproject_path = self.project_root / "pyproject.toml"
+        self.cache_ttl = cache_ttl
+        self._session: requests.Session | None = None
+
+    def _get_session(self) -> "requests.Session":
+        """Get the HTTP session shared by all OSV and PyPI requests.
+
+        Reusing one session keeps connections to each host alive, so only the
+        first request pays for the TCP and TLS handshakes.
+        """
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+            self._session.headers["User-Agent"] = "hatch-agent"
+        return self._session
+
+    def close(self) -> None:
+        """Close the HTTP session, if one was opened."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
     def get_all_dependencies(self) -> list[dict[str, str]]:
         """Get all declared dependencies with their version specs.
@@ -69,26 +117,78 @@ class SecurityAuditor:
         Returns:
             List of vulnerability records from OSV.
         """
-        payload: dict[str, Any] = {
-            "package": {"name": package, "ecosystem": "PyPI"},
-        }
-        if version:
-            payload["version"] = version
+        payload = self._osv_query(package, version)
 
         try:
-            response = http_requests.post(
+            response = self._get_session().post(
                 self.OSV_API_URL,
                 json=payload,
                 timeout=15,
-                headers={"User-Agent": "hatch-agent"},
             )
             if response.status_code == 200:
-                data = response.json()
+                data = _decode_json(response)
                 return data.get("vulns", [])
             return []
         except Exception:
             return []
 
+    def query_osv_batch(self, queries: list[tuple[str, str | None]]) -> list[list[str] | None]:
+        """Query the OSV.dev batch API for the vulnerability IDs of many packages.
+
+        The batch endpoint only returns IDs; use ``fetch_osv_vuln`` to get the
+        full records.
+
+        Args:
+            queries: (package, version) pairs; version may be None
+
+        Returns:
+            One list of vulnerability IDs per query, in query order; None marks
+            a query whose request failed.
+        """
+        results: list[list[str] | None] = []
+        for start in range(0, len(queries), _OSV_BATCH_SIZE):
+            chunk = queries[start : start + _OSV_BATCH_SIZE]
+            payload = {"queries": [self._osv_query(package, version) for package, version in chunk]}
+            chunk_results: list[dict[str, Any]] | None = None
+            try:
+                response = self._get_session().post(
+                    self.OSV_BATCH_URL,
+                    json=payload,
+                    timeout=30,
+                )
+                if response.status_code == 200:
+                    chunk_results = _decode_json(response).get("results", [])
+            except Exception:
+                pass
+            if chunk_results is None or len(chunk_results) != len(chunk):
+                results.extend([None] * len(chunk))
+                continue
+            results.extend(
+                [vuln["id"] for vuln in result.get("vulns", []) if vuln.get("id")]
+                for result in chunk_results
+            )
+        return results
+
+    def fetch_osv_vuln(self, vuln_id: str) -> dict[str, Any] | None:
+        """Fetch the full OSV.dev record for a vulnerability ID.
+
+        Args:
+            vuln_id: OSV vulnerability ID, e.g. ``GHSA-xxxx-xxxx-xxxx``
+
+        Returns:
+            Vulnerability record, or None if it could not be fetched.
+        """
+        try:
+            response = self._get_session().get(
+                self.OSV_VULN_URL.format(vuln_id=vuln_id),
+                timeout=15,
+            )
+            if response.status_code == 200:
+                return _decode_json(response)
+            return None
+        except Exception:
+            return None
+
     def query_pypi_advisory(self, package: str) -> list[dict[str, Any]]:
         """Query the PyPI JSON API for vulnerability advisories.
 
@@ -99,13 +199,12 @@ class SecurityAuditor:
             List of vulnerability dicts from PyPI's vulnerabilities field.
         """
         try:
-            response = http_requests.get(
+            response = self._get_session().get(
                 self.PYPI_API_URL.format(package=package),
                 timeout=10,
-                headers={"User-Agent": "hatch-agent"},
             )
             if response.status_code == 200:
-                data = response.json()
+                data = _decode_json(response)
                 return data.get("vulnerabilities", [])
             return []
         except Exception:
@@ -126,23 +225,58 @@ class SecurityAuditor:
                 "packages_checked": 0,
             }
 
+        versions = [
+            dep.get("installed_version") or re.sub(r"^[>=<~!]+", "", dep.get("version_spec", ""))
+            for dep in deps
+        ]
+
+        # One batch request finds the matching OSV IDs; the full records and
+        # PyPI advisories are then fetched concurrently, each OSV ID only once.
+        # OSV answers are cached on disk, so unchanged dependencies skip OSV.
+        with ResponseCache(os.path.join(get_cache_dir(), "osv.sqlite"), self.cache_ttl) as cache:
+            osv_ids = self._lookup_osv_ids(
+                [
+                    (dep["name"], version or None)
+                    for dep, version in zip(deps, versions, strict=True)
+                ],
+                cache,
+            )
+            unique_ids = list(dict.fromkeys(vuln_id for ids in osv_ids for vuln_id in ids))
+            osv_records = {
+                vuln_id: record
+                for vuln_id in unique_ids
+                if (record := self._cache_get(cache, f"osv-vuln:{vuln_id}")) is not None
+            }
+            missing_ids = [vuln_id for vuln_id in unique_ids if vuln_id not in osv_records]
+
+            # Open the shared session here rather than racing to create it in the workers
+            self._get_session()
+            with ThreadPoolExecutor(
+                max_workers=min(_MAX_FETCH_WORKERS, len(missing_ids) + len(deps))
+            ) as pool:
+                pypi_pending = pool.map(self.query_pypi_advisory, [dep["name"] for dep in deps])
+                for vuln_id, record in zip(
+                    missing_ids, pool.map(self.fetch_osv_vuln, missing_ids), strict=True
+                ):
+                    if record is not None:
+                        osv_records[vuln_id] = record
+                        self._cache_set(cache, f"osv-vuln:{vuln_id}", record)
+                pypi_results = list(pypi_pending)
+
         vulnerabilities: list[dict[str, Any]] = []
         seen_ids: set[str] = set()
 
-        for dep in deps:
+        for dep, version, ids, pypi_vulns in zip(
+            deps, versions, osv_ids, pypi_results, strict=True
+        ):
             package = dep["name"]
-            version = dep.get("installed_version") or re.sub(
-                r"^[>=<~!]+", "", dep.get("version_spec", "")
-            )
 
-            # Query OSV
-            osv_vulns = self.query_osv(package, version if version else None)
-            for vuln in osv_vulns:
-                vuln_id = vuln.get("id", "")
+            for vuln_id in ids:
                 if vuln_id in seen_ids:
                     continue
                 seen_ids.add(vuln_id)
 
+                vuln = osv_records.get(vuln_id) or {"id": vuln_id}
                 severity = self._extract_severity(vuln)
                 fixed_in = self._extract_fixed_version(vuln, package)
 
@@ -154,13 +288,11 @@ class SecurityAuditor:
                         "severity": severity,
                         "summary": vuln.get("summary", vuln.get("details", "No description")[:200]),
                         "fixed_in": fixed_in,
-                        "url": f"https://osv.dev/vulnerability/{vuln_id}" if vuln_id else None,
+                        "url": f"https://osv.dev/vulnerability/{vuln_id}",
                         "source": "osv",
                     }
                 )
 
-            # Query PyPI advisories
-            pypi_vulns = self.query_pypi_advisory(package)
             for vuln in pypi_vulns:
                 vuln_id = vuln.get("id", "")
                 if vuln_id in seen_ids:
@@ -241,6 +373,41 @@ class SecurityAuditor:
     # Helpers
     # ------------------------------------------------------------------
 
+    def _lookup_osv_ids(
+        self, queries: list[tuple[str, str | None]], cache: ResponseCache
+    ) -> list[list[str]]:
+        """Return OSV IDs per query, batching only the ones not in the cache.
+
+        Clean packages are cached as empty lists so they are not re-queried;
+        failed lookups are reported as clean but never cached.
+        """
+        keys = [f"osv-match:PyPI:{package.lower()}@{version or ''}" for package, version in queries]
+        hits = [self._cache_get(cache, key) for key in keys]
+        missing = [i for i, hit in enumerate(hits) if hit is None]
+        fetched = self.query_osv_batch([queries[i] for i in missing]) if missing else []
+
+        results = [hit["ids"] if hit is not None else [] for hit in hits]
+        for i, ids in zip(missing, fetched, strict=True):
+            if ids is not None:
+                results[i] = ids
+                self._cache_set(cache, keys[i], {"ids": ids})
+        return results
+
+    def _cache_get(self, cache: ResponseCache, key: str) -> dict[str, Any] | None:
+        return cache.get(key) if self.cache_ttl > 0 else None
+
+    def _cache_set(self, cache: ResponseCache, key: str, value: dict[str, Any]) -> None:
+        if self.cache_ttl > 0:
+            cache.set(key, value)
+
+    @staticmethod
+    def _osv_query(package: str, version: str | None) -> dict[str, Any]:
+        """Build an OSV query object for a PyPI package."""
+        query: dict[str, Any] = {"package": {"name": package, "ecosystem": "PyPI"}}
+        if version:
+            query["version"] = version
+        return query
+
     @staticmethod
     def _parse_dep_string(dep: str) -> dict[str, str] | None:
         """Parse a PEP 508 dependency string into name and version spec."""
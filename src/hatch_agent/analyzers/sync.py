@@ -1,11 +1,13 @@
 """Utilities for syncing dependencies and tracking version changes."""
 
+import importlib.metadata
 import json
 import re
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from hatch.cli.application import Application
+if TYPE_CHECKING:
+    from hatch.cli.application import Application
 
 
 class DependencySync:
@@ -18,7 +20,7 @@ class DependencySync:
     - Semver change classification
     """
 
-    def __init__(self, project_root: Path | None = None, app: Application | None = None):
+    def __init__(self, project_root: Path | None = None, app: "Application | None" = None):
         """Initialize the dependency sync manager.
 
         Args:
@@ -29,9 +31,11 @@ class DependencySync:
         self._app = app
         self._env_cache: dict[str, Any] = {}
 
-    def _get_app(self) -> Application:
+    def _get_app(self) -> "Application":
         """Get or create the Hatch application instance."""
         if self._app is None:
+            from hatch.cli.application import Application
+
             self._app = Application(self.project_root)
         return self._app
 
@@ -82,7 +86,10 @@ class DependencySync:
         return list(env.dependencies)
 
     def get_installed_versions(self, env_name: str | None = None) -> dict[str, str]:
-        """Get installed package versions using pip list in environment.
+        """Get installed package versions in the environment.
+
+        Virtual environments are read directly from their distribution
+        metadata; other environments fall back to ``pip list``.
 
         Args:
             env_name: Specific environment name, or None for default
@@ -92,6 +99,10 @@ class DependencySync:
         """
         env = self._get_environment(env_name)
 
+        versions = self._read_installed_metadata(env)
+        if versions:
+            return versions
+
         try:
             # Build the pip list command using Hatch's command construction
             # construct_pip_install_command builds pip/uv command prefix
@@ -123,6 +134,28 @@ class DependencySync:
             # If we can't get versions, return empty dict
             return {}
 
+    def _read_installed_metadata(self, env) -> dict[str, str]:
+        """Read installed versions from the metadata on the environment's sys.path.
+
+        Hatch caches the interpreter's sys.path on the environment, so the
+        snapshot after an upgrade costs no subprocess at all.
+
+        Returns:
+            Dict mapping lowercase package names to versions, empty if unavailable
+        """
+        try:
+            sys_path = [str(path) for path in env.virtual_env.sys_path]
+        except Exception:
+            return {}
+
+        versions: dict[str, str] = {}
+        for dist in importlib.metadata.distributions(path=sys_path):
+            name = dist.metadata["Name"]
+            # The first match on sys.path is the one the interpreter imports
+            if name and dist.version:
+                versions.setdefault(name.lower(), dist.version)
+        return versions
+
     def _get_uv_command(self, env) -> list[str]:
         """Get the uv command prefix from environment."""
         if hasattr(env, "uv_path") and env.uv_path:
@@ -1,33 +1,283 @@
 """Utilities for updating dependencies and analyzing API changes."""
 
+import json
+import os
 import re
+import sqlite3
 import sys
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 if sys.version_info >= (3, 11):
-    import tomllib as tomli
+    import tomllib
 else:
-    import tomli
+    import tomli as tomllib
 import tomli_w
-from hatch.cli.application import Application
+
+from hatch_agent.cache.exact import ResponseCache
+from hatch_agent.config import get_cache_dir
+
+if TYPE_CHECKING:
+    from hatch.cli.application import Application
+
+# project_urls labels that point at release notes, in order of preference
+_CHANGELOG_KEYS = (
+    "changelog",
+    "change log",
+    "changes",
+    "release notes",
+    "releases",
+    "what's new",
+    "history",
+)
+
+# project_urls labels that may point at the source repository
+_REPOSITORY_KEYS = ("homepage", "source", "source code", "repository")
+
+# Seconds PyPI package metadata is reused from the on-disk cache
+PYPI_CACHE_TTL = 60 * 60
+
+# Directory entries scanned serially before get_project_files switches to threads
+_PARALLEL_SCAN_THRESHOLD = 256
+
+# Characters that end the distribution name in a dependency string
+_NAME_TERMINATORS = frozenset("[<>=~!;,() \t")
+
+# Version specifier operators and the specifier that follows them
+_VERSION_SPEC = re.compile(r"([><=~!]+[^,;\s]+)")
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Runs of separators that PEP 503 treats as equivalent in distribution names
+_NAME_SEPARATORS = re.compile(r"[-_.]+")
+
+# Conventional source directories, listed first when file listings are truncated
+_SOURCE_DIRS = ("src", "lib")
+
+# Directories that never contain project sources worth scanning
+_EXCLUDED_DIRS = frozenset(
+    {
+        "__pycache__",
+        ".git",
+        ".hatch",
+        "dist",
+        "build",
+        ".eggs",
+        ".tox",
+        ".nox",
+        "venv",
+        ".venv",
+        "node_modules",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+    }
+)
+
+
+def _normalize_name(name: str) -> str:
+    """Normalize a distribution name for comparison (PEP 503)."""
+    return _NAME_SEPARATORS.sub("-", name).lower()
+
+
+def _patch_dependency_line(text: bytes, old_dep: str, new_dep: str) -> bytes | None:
+    """Replace one quoted dependency literal in raw ``pyproject.toml`` bytes.
+
+    Only the literal itself is rewritten, so comments and formatting around it
+    survive. Returns None when the literal is not present exactly once in a
+    single form (or needs escaping), in which case callers should fall back to
+    a full parse-and-rewrite.
+    """
+    if any(c in old_dep or c in new_dep for c in "\"'\\\n"):
+        return None
+
+    candidates = [(quote + old_dep + quote).encode() for quote in ('"', "'")]
+    counts = [text.count(literal) for literal in candidates]
+    if sorted(counts) != [0, 1]:
+        return None
+
+    literal = candidates[counts.index(1)]
+    quote = literal[:1]
+    return text.replace(literal, quote + new_dep.encode() + quote, 1)
+
+
+def _cached_info(
+    cache: ResponseCache | None, key: str, stale: bool = False
+) -> dict[str, Any] | None:
+    """Return a cached PyPI ``info`` object, ignoring malformed entries."""
+    hit = cache.get(key, stale=stale) if cache is not None else None
+    info = hit.get("info") if isinstance(hit, dict) else None
+    return info if isinstance(info, dict) else None
+
+
+def _stream_pypi_info(response: Any, chunk_size: int = 65536) -> dict[str, Any] | None:
+    """Decode the leading ``info`` object from a streamed PyPI JSON response."""
+    buffer = b""
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        buffer += chunk
+        key = buffer.find(b'"info"')
+        if key == -1:
+            continue
+        # A multi-byte character split at the chunk boundary can only fall
+        # after the object's end or inside an incomplete object, so dropping
+        # it never changes a successful decode.
+        text = buffer.decode("utf-8", errors="ignore")
+        start = text.find("{", text.find('"info"') + len('"info"'))
+        if start == -1:
+            continue
+        try:
+            info, _ = _JSON_DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            continue
+        return info
+    return None
+
+
+def _scan_directory(path: str, exts: frozenset[str]) -> tuple[list[str], list[Path], int]:
+    """List one directory for ``get_project_files``.
+
+    Returns:
+        Tuple of (subdirectories to descend into, matching files, entry count)
+    """
+    subdirs: list[str] = []
+    matched: list[Path] = []
+    entries = 0
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                entries += 1
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _EXCLUDED_DIRS:
+                        subdirs.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in exts:
+                    matched.append(Path(entry.path))
+    except OSError:
+        # Unreadable directories are skipped, as os.walk does
+        pass
+    return subdirs, matched, entries
+
+
+def _iter_sorted_files(
+    path: str, exts: frozenset[str], skip: tuple[str, ...] = ()
+) -> Iterator[Path]:
+    """Yield matching files under ``path`` in ``Path`` sort order.
+
+    Entries are visited depth-first in name order, which is the order
+    ``sorted()`` puts the resulting paths in, so a caller that only needs
+    the first few files can stop the walk early. Directories named in
+    ``skip`` are left out at the top level only.
+    """
+    try:
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda entry: os.path.normcase(entry.name))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in _EXCLUDED_DIRS and entry.name not in skip:
+                yield from _iter_sorted_files(entry.path, exts)
+        elif os.path.splitext(entry.name)[1].lower() in exts:
+            yield Path(entry.path)
+
+
+def _iter_project_files(root: str, exts: frozenset[str]) -> Iterator[Path]:
+    """Yield matching files under ``root``, source directories first.
+
+    Files under ``src`` and ``lib`` come first so that a truncated listing
+    is not crowded out by docs, examples or benchmarks; each group is in
+    sorted order.
+    """
+    for name in _SOURCE_DIRS:
+        yield from _iter_sorted_files(os.path.join(root, name), exts)
+    yield from _iter_sorted_files(root, exts, skip=_SOURCE_DIRS)
+
+
+class PyProjectIO:
+    """Reads and writes one pyproject.toml, parsing it at most once per change.
+
+    A single instance can be shared by ``DependencyManager`` and
+    ``DependencyUpdater`` so that one command parses the file once. The parsed
+    document is cached until the file's mtime or size changes; callers that
+    edit it in place must ``save`` it or ``invalidate`` the cache.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the reader/writer.
+
+        Args:
+            path: Path to pyproject.toml
+        """
+        self.path = path
+        self._doc: dict[str, Any] | None = None
+        self._key: tuple[int, int] | None = None
+
+    def load(self) -> dict[str, Any]:
+        """Return the parsed document, re-reading it only if the file changed."""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"pyproject.toml not found at {self.path}") from None
+
+        key = (st.st_mtime_ns, st.st_size)
+        if self._doc is None or key != self._key:
+            with open(self.path, "rb") as f:
+                self._doc = tomllib.load(f)
+            self._key = key
+        return self._doc
+
+    def save(self, doc: dict[str, Any]) -> None:
+        """Serialize and write the whole document."""
+        self.invalidate()
+        with open(self.path, "wb") as f:
+            tomli_w.dump(doc, f)
+
+    def read_bytes(self) -> bytes:
+        """Return the raw file contents."""
+        return self.path.read_bytes()
+
+    def write_bytes(self, data: bytes) -> None:
+        """Replace the raw file contents."""
+        self.invalidate()
+        self.path.write_bytes(data)
+
+    def invalidate(self) -> None:
+        """Drop the cached parse."""
+        self._doc = None
+        self._key = None
 
 
 class DependencyUpdater:
     """Manages dependency updates and tracks version changes."""
 
-    def __init__(self, project_root: Path | None = None, app: Application | None = None):
+    def __init__(
+        self,
+        project_root: Path | None = None,
+        app: "Application | None" = None,
+        pyproject_io: PyProjectIO | None = None,
+        pypi_cache_ttl: float = PYPI_CACHE_TTL,
+    ):
         """Initialize the dependency updater.
 
         Args:
             project_root: Root directory of the Hatch project (defaults to current directory)
             app: Hatch Application instance (will be created if not provided)
+            pyproject_io: Shared pyproject.toml reader/writer (created if not provided)
+            pypi_cache_ttl: Seconds to reuse PyPI metadata from the on-disk cache (0 disables it)
         """
         self.project_root = project_root or Path.cwd()
+        self.pypi_cache_ttl = pypi_cache_ttl
         self.pyproject_path = self.project_root / "pyproject.toml"
         self.app = app
+        self.pyproject_io = pyproject_io or PyProjectIO(self.pyproject_path)
+        # Dependency index (see _build_dep_index) and the parsed document it
+        # was built from
+        self._dep_index: dict[str, list[tuple[str | None, int, str]]] = {}
+        self._indexed_doc: dict[str, Any] | None = None
 
-    def _get_app(self) -> Application:
+    def _get_app(self) -> "Application":
         """Get or create the Hatch application instance."""
         if self.app is None:
             from hatch.cli.application import Application
@@ -35,6 +285,76 @@ class DependencyUpdater:
             self.app = Application(self.project_root)
         return self.app
 
+    def _fetch_pypi_info(self, package: str, version: str | None = None) -> dict[str, Any] | None:
+        """Fetch the ``info`` object for a package from the PyPI JSON API.
+
+        The project document lists every release after ``info``, which for
+        popular packages is most of the payload. The body is streamed and the
+        connection closed as soon as ``info`` has been decoded. When a version
+        is given, the much smaller per-release document is requested first.
+
+        Decoded ``info`` objects are cached on disk for ``pypi_cache_ttl``
+        seconds. If PyPI cannot be reached, the last cached answer is used
+        even when it has expired.
+
+        Args:
+            package: Package name
+            version: Specific release to describe, if known
+
+        Returns:
+            The ``info`` dict, or None if the package could not be found
+        """
+        import requests
+
+        urls = [f"https://pypi.org/pypi/{package}/json"]
+        if version:
+            urls.insert(0, f"https://pypi.org/pypi/{package}/{version}/json")
+
+        cache = self._open_pypi_cache()
+        try:
+            for url in urls:
+                key = f"pypi-info:{url}"
+                if (hit := _cached_info(cache, key)) is not None:
+                    return hit
+
+                try:
+                    response = requests.get(
+                        url,
+                        timeout=10,
+                        headers={"User-Agent": "hatch-agent"},
+                        stream=True,
+                    )
+                except requests.RequestException:
+                    if (hit := _cached_info(cache, key, stale=True)) is not None:
+                        return hit
+                    raise
+                try:
+                    if response.status_code == 200:
+                        info = _stream_pypi_info(response)
+                        if cache is not None and info is not None:
+                            cache.set(key, {"info": info})
+                        return info
+                finally:
+                    response.close()
+        finally:
+            if cache is not None:
+                cache.close()
+
+        return None
+
+    def _open_pypi_cache(self) -> ResponseCache | None:
+        """Open the on-disk PyPI metadata cache.
+
+        Returns None when caching is disabled or the cache cannot be opened,
+        so lookups go straight to PyPI instead of failing.
+        """
+        if self.pypi_cache_ttl <= 0:
+            return None
+        try:
+            return ResponseCache(os.path.join(get_cache_dir(), "pypi.sqlite"), self.pypi_cache_ttl)
+        except (OSError, sqlite3.Error):
+            return None
+
     def get_latest_version(self, package: str) -> str | None:
         """Get the latest version of a package from PyPI.
 
@@ -45,70 +365,53 @@ class DependencyUpdater:
             Latest version string or None if not found
         """
         try:
-            import requests
-
             # Query PyPI JSON API
-            response = requests.get(
-                f"https://pypi.org/pypi/{package}/json",
-                timeout=10,
-                headers={"User-Agent": "hatch-agent"},
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                return data["info"]["version"]
-            else:
-                return None
+            info = self._fetch_pypi_info(package)
+            return info["version"] if info else None
         except Exception:
             # If PyPI is unreachable or package not found, return None
             return None
 
-    def get_changelog_url(self, package: str, version: str | None = None) -> str | None:
+    def get_changelog_url(
+        self, package: str, version: str | None = None, latest: bool = False
+    ) -> str | None:
         """Try to find the changelog or release notes URL for a package.
 
         Args:
             package: Package name
             version: Specific version (if None, gets latest)
+            latest: ``version`` is the latest release, so its metadata is read
+                from the project document that ``get_latest_version`` cached
 
         Returns:
             URL to changelog if available, None otherwise
         """
         try:
-            import requests
-
-            response = requests.get(
-                f"https://pypi.org/pypi/{package}/json",
-                timeout=10,
-                headers={"User-Agent": "hatch-agent"},
-            )
-
-            if response.status_code != 200:
+            info = self._fetch_pypi_info(package, None if latest else version)
+            if info is None:
                 return None
 
-            data = response.json()
-            info = data.get("info", {})
-
-            # Try to find changelog in project URLs
-            project_urls = info.get("project_urls", {})
-
-            # Common changelog URL keys
-            changelog_keys = [
-                "Changelog",
-                "CHANGELOG",
-                "Change Log",
-                "Changes",
-                "Release Notes",
-                "Releases",
-                "What's New",
-            ]
+            # Try to find changelog in project URLs; labels are free-form, so
+            # match them case-insensitively in a single pass over the dict
+            project_urls = {
+                label.strip().lower(): url
+                for label, url in (info.get("project_urls") or {}).items()
+            }
 
-            for key in changelog_keys:
+            for key in _CHANGELOG_KEYS:
                 if key in project_urls:
                     return project_urls[key]
 
             # Try to construct GitHub releases URL if project is on GitHub
-            home_page = info.get("home_page") or project_urls.get("Homepage", "")
-            if "github.com" in home_page:
+            home_page = next(
+                (
+                    url
+                    for url in (info.get("home_page"), *map(project_urls.get, _REPOSITORY_KEYS))
+                    if url and "github.com" in url
+                ),
+                "",
+            )
+            if home_page:
                 # Convert repo URL to releases URL
                 if home_page.endswith("/"):
                     home_page = home_page[:-1]
@@ -122,17 +425,49 @@ class DependencyUpdater:
             return None
 
     def read_pyproject(self) -> dict[str, Any]:
-        """Read the current pyproject.toml file."""
-        if not self.pyproject_path.exists():
-            raise FileNotFoundError(f"pyproject.toml not found at {self.pyproject_path}")
+        """Read the current pyproject.toml file.
 
-        with open(self.pyproject_path, "rb") as f:
-            return tomli.load(f)
+        Parsing is cached by ``pyproject_io``, so repeated lookups during a
+        batch of updates parse the file once.
+        """
+        config = self.pyproject_io.load()
+        if config is not self._indexed_doc:
+            self._dep_index = self._build_dep_index(config)
+            self._indexed_doc = config
+        return config
 
     def write_pyproject(self, config: dict[str, Any]) -> None:
         """Write the updated pyproject.toml file."""
-        with open(self.pyproject_path, "wb") as f:
-            tomli_w.dump(config, f)
+        self.pyproject_io.save(config)
+
+    def _build_dep_index(
+        self, config: dict[str, Any]
+    ) -> dict[str, list[tuple[str | None, int, str]]]:
+        """Map normalized package names to every place they are declared.
+
+        Each entry is ``(optional group or None, list index, original string)``.
+        Main dependencies use a ``None`` group and come before optional groups,
+        matching the order lookups have always used.
+        """
+        index: dict[str, list[tuple[str | None, int, str]]] = {}
+        project = config.get("project", {})
+
+        for i, dep in enumerate(project.get("dependencies", [])):
+            name = _normalize_name(self._extract_package_name(dep))
+            index.setdefault(name, []).append((None, i, dep))
+
+        for group, deps in project.get("optional-dependencies", {}).items():
+            for i, dep in enumerate(deps):
+                name = _normalize_name(self._extract_package_name(dep))
+                index.setdefault(name, []).append((group, i, dep))
+
+        return index
+
+    def _dependency_list(self, config: dict[str, Any], group: str | None) -> list[str]:
+        """Return the dependency list a dependency index entry points into."""
+        if group is None:
+            return config["project"]["dependencies"]
+        return config["project"]["optional-dependencies"][group]
 
     def get_current_version(self, package: str) -> str | None:
         """Get the current version constraint for a package.
@@ -143,22 +478,13 @@ class DependencyUpdater:
         Returns:
             Current version constraint or None if not found
         """
-        config = self.read_pyproject()
+        self.read_pyproject()
 
-        # Check main dependencies
-        if "project" in config and "dependencies" in config["project"]:
-            for dep in config["project"]["dependencies"]:
-                if self._matches_package(dep, package):
-                    return self._extract_version(dep)
+        entries = self._dep_index.get(_normalize_name(package))
+        if not entries:
+            return None
 
-        # Check optional dependencies
-        if "project" in config and "optional-dependencies" in config["project"]:
-            for _group, deps in config["project"]["optional-dependencies"].items():
-                for dep in deps:
-                    if self._matches_package(dep, package):
-                        return self._extract_version(dep)
-
-        return None
+        return self._extract_version(entries[0][2])
 
     def update_dependency(
         self, package: str, new_version: str, optional_group: str | None = None
@@ -175,46 +501,41 @@ class DependencyUpdater:
         """
         try:
             config = self.read_pyproject()
-            old_version = None
-            updated = False
-            target_location = None
-
-            # Try to update in main dependencies
-            if "project" in config and "dependencies" in config["project"]:
-                for i, dep in enumerate(config["project"]["dependencies"]):
-                    if self._matches_package(dep, package):
-                        old_version = self._extract_version(dep)
-                        config["project"]["dependencies"][i] = f"{package}{new_version}"
-                        updated = True
-                        target_location = "project.dependencies"
-                        break
-
-            # Try to update in optional dependencies
-            if not updated and "project" in config and "optional-dependencies" in config["project"]:
-                for group, deps in config["project"]["optional-dependencies"].items():
-                    if optional_group and group != optional_group:
-                        continue
-                    for i, dep in enumerate(deps):
-                        if self._matches_package(dep, package):
-                            old_version = self._extract_version(dep)
-                            config["project"]["optional-dependencies"][group][i] = (
-                                f"{package}{new_version}"
-                            )
-                            updated = True
-                            target_location = f"project.optional-dependencies.{group}"
-                            break
-                    if updated:
-                        break
-
-            if not updated:
+
+            # Main dependencies always win; optional groups may be narrowed
+            entry = next(
+                (
+                    (group, i, dep)
+                    for group, i, dep in self._dep_index.get(_normalize_name(package), [])
+                    if group is None or not optional_group or group == optional_group
+                ),
+                None,
+            )
+
+            if entry is None:
                 return {
                     "success": False,
                     "error": f"Package '{package}' not found in dependencies",
                     "action": "none",
                 }
 
-            # Write back to file
-            self.write_pyproject(config)
+            group, i, old_dep = entry
+            old_version = self._extract_version(old_dep)
+            new_dep = f"{package}{new_version}"
+            target_location = (
+                "project.dependencies"
+                if group is None
+                else f"project.optional-dependencies.{group}"
+            )
+
+            # Patch the single literal in place when it is unambiguous;
+            # otherwise re-serialize the whole document.
+            patched = _patch_dependency_line(self.pyproject_io.read_bytes(), old_dep, new_dep)
+            if patched is not None:
+                self.pyproject_io.write_bytes(patched)
+            else:
+                self._dependency_list(config, group)[i] = new_dep
+                self.write_pyproject(config)
 
             return {
                 "success": True,
@@ -225,6 +546,8 @@ class DependencyUpdater:
                 "action": "updated",
             }
         except Exception as e:
+            # The cached document may have been edited in place before failing
+            self.pyproject_io.invalidate()
             return {"success": False, "error": str(e), "action": "failed"}
 
     def _matches_package(self, dep_string: str, package: str) -> bool:
@@ -234,15 +557,20 @@ class DependencyUpdater:
 
     def _extract_package_name(self, dep_string: str) -> str:
         """Extract the package name from a dependency string."""
-        # Remove extras and version specifiers
-        name = dep_string.split("[")[0]
-        name = re.split(r"[><=~!]", name)[0]
-        return name.strip()
+        # The name runs from the first non-space character up to the first
+        # extras bracket, specifier operator, marker separator, or space.
+        i, n = 0, len(dep_string)
+        while i < n and dep_string[i].isspace():
+            i += 1
+        start = i
+        while i < n and dep_string[i] not in _NAME_TERMINATORS:
+            i += 1
+        return dep_string[start:i]
 
     def _extract_version(self, dep_string: str) -> str | None:
         """Extract the version specification from a dependency string."""
         # Find version specifier
-        match = re.search(r"([><=~!]+[^,;\s]+)", dep_string)
+        match = _VERSION_SPEC.search(dep_string)
         if match:
             return match.group(1)
         return None
@@ -256,79 +584,134 @@ class DependencyUpdater:
         Returns:
             Installed version or None
         """
+        return self.get_installed_versions([package]).get(package)
+
+    def get_installed_versions(self, packages: list[str]) -> dict[str, str | None]:
+        """Get the installed versions of several packages with one ``pip show``.
+
+        Args:
+            packages: Package names
+
+        Returns:
+            Dict mapping each requested name to its installed version or None
+        """
+        versions: dict[str, str | None] = dict.fromkeys(packages)
+        if not packages:
+            return versions
+
+        # pip reports canonical names, so match records back case-insensitively
+        requested = {_normalize_name(pkg): pkg for pkg in packages}
+
         try:
             app = self._get_app()
             env_names = list(app.project.config.envs.keys())
 
             if not env_names:
-                return None
+                return versions
 
             env = app.get_environment(env_names[0])
 
-            # Run pip show to get version
-            output_lines = []
+            # Records are separated by "---"; parse them as the lines stream in
             try:
-                for line in env.run_shell_command(["pip", "show", package]):
-                    output_lines.append(line)
-
-                # Parse version from output
-                output = "\n".join(output_lines)
-                for line in output.split("\n"):
-                    if line.startswith("Version:"):
-                        return line.split(":", 1)[1].strip()
+                current = None
+                for line in env.run_shell_command(["pip", "show", *packages]):
+                    if line.startswith("Name:"):
+                        current = requested.get(_normalize_name(line[5:].strip()))
+                    elif line.startswith("Version:") and current is not None:
+                        versions[current] = line[8:].strip()
+                    elif line.startswith("---"):
+                        current = None
             except Exception:
-                return None
+                return versions
 
-            return None
+            return versions
         except Exception:
-            return None
-
-    def get_project_files(self, extensions: list[str] | None = None) -> list[Path]:
+            return versions
+
+    def get_project_files(
+        self,
+        extensions: list[str] | None = None,
+        max_workers: int | None = None,
+        limit: int | None = None,
+    ) -> list[Path]:
         """Get all project source files.
 
+        Small trees are scanned on the calling thread. Once a scan has seen
+        more than ``_PARALLEL_SCAN_THRESHOLD`` entries, the remaining
+        directories are fanned out to a thread pool, which hides per-directory
+        latency on network and container-mounted filesystems. With a
+        ``limit``, the tree is instead walked in sorted order, ``src`` and
+        ``lib`` first, and the walk stops as soon as enough files are found.
+
         Args:
             extensions: File extensions to include
+            max_workers: Thread pool size for large trees
+            limit: Return at most ``limit`` files, preferring ``src`` and ``lib``
 
         Returns:
-            List of source file paths
+            Sorted list of source file paths (source directories first with a limit)
         """
         if extensions is None:
             extensions = [".py"]
-        files = []
-
-        # Common source directories
-        src_dirs = [
-            self.project_root / "src",
-            self.project_root / "lib",
-            self.project_root,
-        ]
-
-        for src_dir in src_dirs:
-            if src_dir.exists():
-                for ext in extensions:
-                    files.extend(src_dir.rglob(f"*{ext}"))
-
-        # Filter out common non-source directories
-        exclude_patterns = [
-            "__pycache__",
-            ".git",
-            ".hatch",
-            "dist",
-            "build",
-            ".eggs",
-            ".tox",
-            "venv",
-            ".venv",
-        ]
-        files = [f for f in files if not any(pattern in f.parts for pattern in exclude_patterns)]
-
+        exts = frozenset(ext.lower() for ext in extensions)
+        if limit is not None:
+            return list(islice(_iter_project_files(os.fspath(self.project_root), exts), limit))
+        files: list[Path] = []
+
+        # ``src`` and ``lib`` live under the project root, so a single
+        # traversal covers them; excluded directories are never entered.
+        pending = [os.fspath(self.project_root)]
+        scanned = 0
+        while pending and scanned < _PARALLEL_SCAN_THRESHOLD:
+            subdirs, matched, entries = _scan_directory(pending.pop(), exts)
+            pending.extend(subdirs)
+            files.extend(matched)
+            scanned += entries
+
+        if pending:
+            if max_workers is None:
+                max_workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = {pool.submit(_scan_directory, d, exts) for d in pending}
+                while futures:
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        subdirs, matched, _ = future.result()
+                        files.extend(matched)
+                        futures.update(pool.submit(_scan_directory, d, exts) for d in subdirs)
+
+        files.sort()
         return files
 
-    def sync_environment(self, env_name: str | None = None) -> dict[str, Any]:
+    def _environment_dependency_names(self, env: Any) -> set[str]:
+        """Return the normalized names of the packages a Hatch environment installs.
+
+        Covers the project dependencies (including the features the
+        environment selects) and the environment's own extra dependencies.
+        """
+        names = set()
+        for attr in ("dependencies", "project_dependencies"):
+            for dep in getattr(env, attr, None) or ():
+                name = self._extract_package_name(dep)
+                if name:
+                    names.add(_normalize_name(name))
+        return names
+
+    def sync_environment(
+        self,
+        env_name: str | None = None,
+        changed_packages: list[tuple[str, str]] | None = None,
+    ) -> dict[str, Any]:
         """Sync Hatch environment after updating dependencies.
 
+        When the changed packages are known and the environment already
+        exists, the ones it depends on are upgraded in place. The environment
+        is recreated from scratch if that upgrade fails, if the environment
+        type cannot pip-install into itself, or if none of the changes apply.
+
         Args:
             env_name: Optional specific environment name to sync
+            changed_packages: ``(package, version_spec)`` pairs that changed
 
         Returns:
             Dict with success status
@@ -345,6 +728,28 @@ class DependencyUpdater:
             # Get the environment
             env = app.get_environment(env_name)
 
+            # Only hatch's virtual environments can pip-install into themselves,
+            # and only packages the environment already depends on belong there
+            specs = []
+            if changed_packages and hasattr(env, "construct_pip_install_command"):
+                installed = self._environment_dependency_names(env)
+                specs = [
+                    f"{package}{spec}"
+                    for package, spec in changed_packages
+                    if _normalize_name(package) in installed
+                ]
+
+            if specs and env.exists():
+                command = env.construct_pip_install_command(["--upgrade", *specs])
+                with env.command_context():
+                    result = env.platform.run_command(command, capture_output=True)
+                if result.returncode == 0:
+                    return {
+                        "success": True,
+                        "environment": env_name,
+                        "action": f"Upgraded {', '.join(specs)} in place",
+                    }
+
             # Remove the environment to force recreation with new dependencies
             if env.exists():
                 env.remove()
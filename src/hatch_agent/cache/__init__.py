@@ -0,0 +1,6 @@
+"""Local caches for LLM responses."""
+
+from hatch_agent.cache.conversation import ConversationCache
+from hatch_agent.cache.exact import ResponseCache, cached_run_task
+
+__all__ = ["ConversationCache", "ResponseCache", "cached_run_task"]
@@ -0,0 +1,59 @@
+"""Shared SQLite plumbing for the hatch-agent caches."""
+
+import os
+import sqlite3
+from typing import Any, TypeVar
+
+from hatch_agent.config import get_cache_dir
+
+_CacheT = TypeVar("_CacheT", bound="SQLiteCache")
+
+
+class SQLiteCache:
+    """Base class for caches stored in one SQLite file under the cache dir.
+
+    Subclasses set ``_FILENAME`` (the default database name) and ``_SCHEMA``
+    (the ``CREATE TABLE IF NOT EXISTS`` statement run on first use).
+    """
+
+    _FILENAME: str
+    _SCHEMA: str
+
+    def __init__(self, path: str | None, ttl: float):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database path (defaults to the hatch-agent cache dir)
+            ttl: Seconds an entry stays valid
+        """
+        self.path = path or os.path.join(get_cache_dir(), self._FILENAME)
+        self.ttl = ttl
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """Open the database, or return None if the cache dir is unusable.
+
+        A cache must never be fatal: an unwritable or missing cache
+        directory turns every lookup into a miss and every write into a no-op.
+        """
+        if self._conn is None:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                conn = sqlite3.connect(self.path)
+                conn.execute(self._SCHEMA)
+            except (OSError, sqlite3.Error):
+                return None
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self: _CacheT) -> _CacheT:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,124 @@
+"""Exact-match cache for conversational LLM responses.
+
+A reply is only reused when the normalized prompt and the whole conversation
+that led up to it are identical, so a repeated question in a different
+context (or a reworded one that flips its meaning) always reaches the model.
+Entries are stored in a SQLite database under the hatch-agent cache directory
+and are partitioned by session and namespace (typically provider and model).
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections.abc import Sequence
+
+from hatch_agent.cache.base import SQLiteCache
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Return a prompt with case and runs of whitespace folded."""
+    return " ".join(prompt.split()).casefold()
+
+
+def make_key(prompt: str, history: Sequence[tuple[str, str]] = ()) -> str:
+    """Return the cache key for a prompt asked after ``history``.
+
+    Args:
+        prompt: User prompt
+        history: Earlier (prompt, reply) turns of the conversation
+
+    Returns:
+        Hex SHA-256 digest of the normalized prompt and the history
+    """
+    history_digest = hashlib.sha256(
+        json.dumps([list(turn) for turn in history]).encode("utf-8")
+    ).hexdigest()
+    payload = f"{history_digest}|{normalize_prompt(prompt)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ConversationCache(SQLiteCache):
+    """Cache replies for prompts repeated at the same point of a conversation."""
+
+    _FILENAME = "conversation.sqlite"
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        session TEXT NOT NULL,
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        response TEXT NOT NULL,
+        created REAL NOT NULL,
+        PRIMARY KEY (session, namespace, key)
+    )
+    """
+
+    def __init__(self, path: str | None = None, ttl: float = 24 * 60 * 60):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database path (defaults to the hatch-agent cache dir)
+            ttl: Seconds an entry stays valid
+        """
+        super().__init__(path, ttl)
+
+    def get(
+        self,
+        prompt: str,
+        history: Sequence[tuple[str, str]] = (),
+        session_id: str = "default",
+        namespace: str = "",
+    ) -> str | None:
+        """Look up the cached reply for a prompt.
+
+        Args:
+            prompt: User prompt
+            history: Earlier (prompt, reply) turns of the conversation
+            session_id: Session the entry belongs to
+            namespace: Partition key, e.g. provider and model
+
+        Returns:
+            The cached reply, or None if missing or expired
+        """
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT response FROM responses"
+                " WHERE session = ? AND namespace = ? AND key = ? AND created >= ?",
+                (session_id, namespace, make_key(prompt, history), time.time() - self.ttl),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row is not None else None
+
+    def set(
+        self,
+        prompt: str,
+        response: str,
+        history: Sequence[tuple[str, str]] = (),
+        session_id: str = "default",
+        namespace: str = "",
+    ) -> None:
+        """Store the reply to a prompt.
+
+        Args:
+            prompt: User prompt
+            response: Reply to return when the prompt is repeated
+            history: Earlier (prompt, reply) turns of the conversation
+            session_id: Session the entry belongs to
+            namespace: Partition key, e.g. provider and model
+        """
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                    (session_id, namespace, make_key(prompt, history), response, time.time()),
+                )
+        except sqlite3.Error:
+            # A cache that cannot be written is just a cache miss next time
+            pass
@@ -0,0 +1,151 @@
+"""Exact-match cache for deterministic multi-agent task results.
+
+Commands such as ``doctor`` and ``explain`` build their task text from
+project state, so re-running them on an unchanged project produces the same
+task and context. Results are stored under a SHA-256 key of the provider,
+model, prepared context and task, and are reused until their TTL expires.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections.abc import Callable
+from typing import Any
+
+from hatch_agent.cache.base import SQLiteCache
+
+DEFAULT_TTL = 60 * 60
+
+
+def make_key(provider: str, model: str, task: str, context: dict[str, Any] | None = None) -> str:
+    """Return the cache key for a task run.
+
+    Args:
+        provider: LLM provider name
+        model: Model name
+        task: Task description sent to the agents
+        context: Context passed to ``Agent.prepare``
+
+    Returns:
+        Hex SHA-256 digest identifying the inputs
+    """
+    payload = "|".join(
+        (provider, model, json.dumps(context or {}, sort_keys=True, default=str), task)
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(SQLiteCache):
+    """SQLite store of task results keyed by exact input hash."""
+
+    _FILENAME = "responses.sqlite"
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS results (
+        key TEXT PRIMARY KEY,
+        result TEXT NOT NULL,
+        created REAL NOT NULL
+    )
+    """
+
+    def __init__(self, path: str | None = None, ttl: float = DEFAULT_TTL):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database path (defaults to the hatch-agent cache dir)
+            ttl: Seconds an entry stays valid
+        """
+        super().__init__(path, ttl)
+
+    def get(self, key: str, stale: bool = False) -> dict[str, Any] | None:
+        """Return the cached result for a key, or None if missing or expired.
+
+        With ``stale=True`` expired entries are returned too, for callers
+        that prefer an old answer to none at all.
+        """
+        cutoff = 0.0 if stale else time.time() - self.ttl
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT result FROM results WHERE key = ? AND created >= ?",
+                (key, cutoff),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return None
+
+    def set(self, key: str, result: dict[str, Any]) -> None:
+        """Store a result; results that cannot be serialized are skipped."""
+        try:
+            encoded = json.dumps(result)
+        except (TypeError, ValueError):
+            return
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                    (key, encoded, time.time()),
+                )
+        except sqlite3.Error:
+            # A cache that cannot be written is just a cache miss next time
+            pass
+
+
+def cached_run_task(
+    agent: Any,
+    task: str,
+    context: dict[str, Any] | None,
+    provider: str,
+    model: str,
+    ttl: float = DEFAULT_TTL,
+    enabled: bool = True,
+    prepare: Callable[[], Any] | None = None,
+) -> dict[str, Any]:
+    """Run ``agent.run_task`` unless an identical run is cached.
+
+    Only successful results are stored, so failures are always retried.
+
+    Args:
+        agent: Agent to run on a cache miss
+        task: Task description
+        context: Context the agent was, or will be, prepared with
+        provider: LLM provider name
+        model: Model name
+        ttl: Seconds a cached result stays valid
+        enabled: When False, always call the agent and leave the cache untouched
+        prepare: Called just before the agent runs, so setup such as
+            ``agent.prepare`` is skipped on a cache hit
+
+    Returns:
+        Task result dictionary; cache hits carry ``"cached": True``
+    """
+
+    def run() -> dict[str, Any]:
+        if prepare is not None:
+            prepare()
+        return agent.run_task(task)
+
+    if not enabled or ttl <= 0:
+        return run()
+
+    key = make_key(provider, model, task, context)
+    with ResponseCache(ttl=ttl) as cache:
+        cached = cache.get(key)
+        if cached is not None:
+            cached["cached"] = True
+            return cached
+
+        result = run()
+        if isinstance(result, dict) and result.get("success"):
+            cache.set(key, result)
+        return result
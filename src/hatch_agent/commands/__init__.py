@@ -1,19 +1,98 @@
-"""Command entry points for hatch-agent."""
-
-from hatch_agent.commands.add_dependency import add_dep
-from hatch_agent.commands.chat import chat
-from hatch_agent.commands.config import generate_config
-from hatch_agent.commands.doctor import doctor
-from hatch_agent.commands.explain import explain
-from hatch_agent.commands.fix import fix
-from hatch_agent.commands.migrate import migrate
-from hatch_agent.commands.multi_task import multi_task
-from hatch_agent.commands.update_dependency import update_dep
+"""Command entry points for hatch-agent.
 
+Commands are resolved lazily: importing this package does not import any
+command module, so invoking one subcommand only loads that command's
+dependencies.
+"""
+
+import importlib
+import sys
+import types
+from typing import Any
+
+import click
+
+# CLI subcommand name -> "module:attribute" of the click command
+COMMANDS = {
+    "task": "hatch_agent.commands.multi_task:multi_task",
+    "chat": "hatch_agent.commands.chat:chat",
+    "explain": "hatch_agent.commands.explain:explain",
+    "add-dep": "hatch_agent.commands.add_dependency:add_dep",
+    "update-dep": "hatch_agent.commands.update_dependency:update_dep",
+    "config": "hatch_agent.commands.config:generate_config",
+    "sync": "hatch_agent.commands.sync:sync",
+    "doctor": "hatch_agent.commands.doctor:doctor",
+    "fix": "hatch_agent.commands.fix:fix",
+    "migrate": "hatch_agent.commands.migrate:migrate",
+    "security": "hatch_agent.commands.security:security",
+}
+
+# Package attributes re-exported on first access.
 # Note: sync and security are intentionally not re-exported here to avoid
 # shadowing their module names. Import them directly:
 # from hatch_agent.commands.sync import sync
 # from hatch_agent.commands.security import security
+_LAZY = {
+    "chat": COMMANDS["chat"],
+    "generate_config": COMMANDS["config"],
+    "doctor": COMMANDS["doctor"],
+    "explain": COMMANDS["explain"],
+    "fix": COMMANDS["fix"],
+    "migrate": COMMANDS["migrate"],
+    "add_dep": COMMANDS["add-dep"],
+    "update_dep": COMMANDS["update-dep"],
+    "multi_task": COMMANDS["task"],
+}
+
+_loaded: dict[str, click.Command] = {}
+
+
+class _CommandsPackage(types.ModuleType):
+    """Package module that keeps re-exported names bound to their commands.
+
+    Importing ``hatch_agent.commands.chat`` binds the submodule as this
+    package's ``chat`` attribute; swap it for the command it defines so the
+    re-export is not shadowed.
+    """
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        target = _LAZY.get(name)
+        if target is not None and isinstance(value, types.ModuleType):
+            value = getattr(value, target.partition(":")[2])
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _CommandsPackage
+
+
+def _resolve(target: str) -> Any:
+    """Import ``module:attribute`` and return the attribute."""
+    module_name, attr = target.split(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def load_command(name: str) -> click.Command | None:
+    """Return the click command registered under a CLI name, importing it once.
+
+    Args:
+        name: Subcommand name as typed on the command line (e.g. ``add-dep``)
+
+    Returns:
+        The click command, or None if no command has that name
+    """
+    if name not in _loaded:
+        target = COMMANDS.get(name)
+        if target is None:
+            return None
+        _loaded[name] = _resolve(target)
+    return _loaded[name]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        return _resolve(_LAZY[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "chat",
@@ -1,13 +1,23 @@
 """CLI command for adding dependencies using natural language and multi-agent AI."""
 
+import io
 import json
+import re
 from pathlib import Path
 
 import click
 
 from hatch_agent.agent.core import Agent
 from hatch_agent.analyzers.dependency import DependencyManager
-from hatch_agent.config import load_config
+from hatch_agent.config import load_config, resolve_provider
+
+# Marker introducing the structured action, up to the opening brace of its JSON
+_ACTION_RE = re.compile(r"ACTION:[^{]*\{")
+_JSON_DECODER = json.JSONDecoder()
+
+# Banner rules, styled once per process
+_CYAN_RULE = click.style("=" * 70, fg="cyan")
+_YELLOW_RULE = click.style("=" * 70, fg="yellow")
 
 
 @click.command()
@@ -71,13 +81,7 @@ def add_dep(
 
     # Load agent configuration
     cfg = load_config(config)
-    provider = cfg.get("underlying_provider", "openai")
-    provider_cfg = cfg.get("underlying_config", {})
-
-    # Ensure model is set
-    if cfg.get("model") and "model" not in provider_cfg:
-        provider_cfg = dict(provider_cfg)
-        provider_cfg["model"] = cfg.get("model")
+    provider, provider_cfg = resolve_provider(cfg)
 
     click.echo("🤖 Consulting AI agents to determine the best approach...")
     click.echo()
@@ -104,28 +108,28 @@ def add_dep(
     # Parse the suggestion to extract dependency details
     suggestion = result.get("selected_suggestion", "")
 
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo(click.style("RECOMMENDED ACTION", fg="cyan", bold=True))
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo()
-    click.echo(suggestion)
-    click.echo()
-    click.echo(click.style(f"Selected from: {result.get('selected_agent', 'N/A')}", fg="blue"))
+    # Report blocks are assembled in memory and written with a single echo
+    out = io.StringIO()
+    out.write(f"{_CYAN_RULE}\n")
+    out.write(click.style("RECOMMENDED ACTION", fg="cyan", bold=True) + "\n")
+    out.write(f"{_CYAN_RULE}\n\n")
+    out.write(f"{suggestion}\n\n")
+    out.write(
+        click.style(f"Selected from: {result.get('selected_agent', 'N/A')}", fg="blue") + "\n"
+    )
 
     # Show all suggestions if requested
     if show_all and "all_suggestions" in result:
-        click.echo()
-        click.echo(click.style("=" * 70, fg="yellow"))
-        click.echo(click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True))
-        click.echo(click.style("=" * 70, fg="yellow"))
+        out.write(f"\n{_YELLOW_RULE}\n")
+        out.write(click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True) + "\n")
+        out.write(f"{_YELLOW_RULE}\n")
 
         for i, sug in enumerate(result["all_suggestions"], 1):
-            click.echo()
-            click.echo(click.style(f"{i}. {sug['agent']}", fg="yellow", bold=True))
-            click.echo(click.style(f"   Confidence: {sug['confidence']:.2f}", fg="yellow"))
-            click.echo(f"   Suggestion: {sug['suggestion']}")
+            out.write("\n" + click.style(f"{i}. {sug['agent']}", fg="yellow", bold=True) + "\n")
+            out.write(click.style(f"   Confidence: {sug['confidence']:.2f}", fg="yellow") + "\n")
+            out.write(f"   Suggestion: {sug['suggestion']}\n")
 
-    click.echo()
+    click.echo(out.getvalue())
 
     # Try to parse structured action from the suggestion
     dependency_info = _extract_dependency_info(suggestion)
@@ -136,13 +140,14 @@ def add_dep(
         return
 
     # Show what will be done
-    click.echo(click.style("📝 Proposed changes:", fg="green", bold=True))
-    click.echo(f"  Package: {dependency_info['package']}")
+    out = io.StringIO()
+    out.write(click.style("📝 Proposed changes:", fg="green", bold=True) + "\n")
+    out.write(f"  Package: {dependency_info['package']}\n")
     if dependency_info.get("version"):
-        click.echo(f"  Version: {dependency_info['version']}")
+        out.write(f"  Version: {dependency_info['version']}\n")
     if dependency_info.get("group"):
-        click.echo(f"  Group: {dependency_info['group']}")
-    click.echo()
+        out.write(f"  Group: {dependency_info['group']}\n")
+    click.echo(out.getvalue())
 
     if dry_run:
         click.echo(click.style("🔍 DRY RUN - No changes will be made", fg="yellow"))
@@ -245,31 +250,22 @@ Be precise with package names and version specifications."""
 def _extract_dependency_info(suggestion: str) -> dict:
     """Extract structured dependency information from agent suggestion."""
     # Look for ACTION: JSON block
-    if "ACTION:" not in suggestion:
+    match = _ACTION_RE.search(suggestion)
+    if match is None:
         return None
 
-    # Extract the JSON portion
+    # Decode the object in place; raw_decode stops at its closing brace
     try:
-        action_part = suggestion.split("ACTION:")[1].strip()
-
-        # Find the JSON object
-        start = action_part.find("{")
-        end = action_part.rfind("}") + 1
-
-        if start == -1 or end == 0:
-            return None
-
-        json_str = action_part[start:end]
-        action_data = json.loads(json_str)
-
-        # Validate required fields
-        if "package" not in action_data:
-            return None
+        action_data, _ = _JSON_DECODER.raw_decode(suggestion, match.end() - 1)
+    except json.JSONDecodeError:
+        return None
 
-        return action_data
-    except (json.JSONDecodeError, IndexError):
+    # Validate required fields
+    if not isinstance(action_data, dict) or "package" not in action_data:
         return None
 
+    return action_data
+
 
 if __name__ == "__main__":
     add_dep()
@@ -1,11 +1,34 @@
 """Interactive chat command implementation using multi-agent system."""
 
+import atexit
+import contextlib
+import os
+import sys
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 import click
 
 from hatch_agent.agent.core import Agent
-from hatch_agent.config import load_config
+from hatch_agent.agent.llm import LLMClient
+from hatch_agent.cache import ConversationCache
+from hatch_agent.config import get_config_dir, load_config, resolve_provider
+
+# Number of chat inputs remembered across sessions
+HISTORY_LENGTH = 1000
+
+# prompt_toolkit's history format differs from readline's, so it gets its own file
+PROMPT_HISTORY_FILE = "prompt_history"
+
+# Styled fragments printed on every turn, rendered once
+_YOU_PROMPT = click.style("You", fg="green", bold=True)
+_AGENT_PROMPT = click.style("Agent", fg="cyan", bold=True) + "> "
+_ERROR_PROMPT = click.style("Error> ", fg="red")
+_CACHED_TAG = click.style("  [cached]", fg="blue", dim=True)
+_THINKING = click.style("🤔 Thinking...", fg="yellow")
+_CLEAR_LINE = "\r" + " " * 20 + "\r"
+_RULE = click.style("─" * 70, fg="cyan")
 
 
 @click.command()
@@ -21,7 +44,12 @@ from hatch_agent.config import load_config
     is_flag=True,
     help="Use single agent mode instead of multi-agent (faster, less thorough)",
 )
-def chat(config: Path | None, name: str, single_agent: bool) -> None:
+@click.option(
+    "--cache/--no-cache",
+    default=False,
+    help="Answer a question repeated at the same point of a conversation from the local cache",
+)
+def chat(config: Path | None, name: str, single_agent: bool, cache: bool) -> None:
     """Start an interactive chat session with the AI agent.
 
     This provides a REPL interface where you can ask questions about
@@ -35,18 +63,18 @@ def chat(config: Path | None, name: str, single_agent: bool) -> None:
     """
     # Load configuration
     cfg = load_config(str(config) if config else None)
-    provider = cfg.get("underlying_provider", "openai")
-    provider_cfg = cfg.get("underlying_config", {})
-
-    # Ensure model is set
-    if cfg.get("model") and "model" not in provider_cfg:
-        provider_cfg = dict(provider_cfg)
-        provider_cfg["model"] = cfg.get("model")
+    provider, provider_cfg = resolve_provider(cfg)
 
     # Create agent
     use_multi = not single_agent
+    # Single agent mode talks to the model directly so replies can stream
+    llm_client = None if use_multi else LLMClient.from_config({**cfg, "mode": "single"})
     agent = Agent(
-        name=name, use_multi_agent=use_multi, provider_name=provider, provider_config=provider_cfg
+        name=name,
+        llm_client=llm_client,
+        use_multi_agent=use_multi,
+        provider_name=provider,
+        provider_config=provider_cfg,
     )
 
     # Display welcome message
@@ -59,14 +87,22 @@ def chat(config: Path | None, name: str, single_agent: bool) -> None:
     )
     click.echo()
     click.echo("Type your questions or commands. Type 'exit' or 'quit' to end the session.")
-    click.echo(click.style("─" * 70, fg="cyan"))
+    click.echo(_RULE)
     click.echo()
 
+    read_input = _input_reader()
+
+    # Cached answers are only reused for the same provider, model and mode,
+    # and only when every earlier turn of the conversation matches too
+    response_cache = ConversationCache() if cache else None
+    namespace = f"{provider}:{cfg.get('model', 'default')}:{mode_str}"
+    history: list[tuple[str, str]] = []
+
     try:
         while True:
             # Get user input
             try:
-                msg = click.prompt(click.style("You", fg="green", bold=True), prompt_suffix="> ")
+                msg = read_input()
             except click.Abort:
                 break
 
@@ -74,44 +110,142 @@ def chat(config: Path | None, name: str, single_agent: bool) -> None:
                 click.echo(click.style("\n👋 Goodbye!", fg="cyan"))
                 break
 
-            # Show thinking indicator
-            click.echo(click.style("🤔 Thinking...", fg="yellow"), nl=False)
-            click.echo("\r" + " " * 20 + "\r", nl=False)  # Clear the line
+            if response_cache is not None:
+                cached = response_cache.get(msg, history, session_id=name, namespace=namespace)
+                if cached is not None:
+                    click.echo(f"{_AGENT_PROMPT}{cached}\n{_CACHED_TAG}\n")
+                    history.append((msg, cached))
+                    continue
 
             # Get response from agent
             if use_multi:
+                # The judge answers only once every specialist has replied
+                click.echo(_THINKING, nl=False)
+                click.echo(_CLEAR_LINE, nl=False)
+
                 # Use multi-agent task runner
                 result = agent.run_task(msg)
 
                 if result.get("success"):
-                    click.echo(click.style("Agent", fg="cyan", bold=True) + "> ", nl=False)
-                    click.echo(
-                        result.get("selected_suggestion", result.get("output", "No response"))
-                    )
+                    text = result.get("selected_suggestion", result.get("output", "No response"))
+                    reply = f"{_AGENT_PROMPT}{text}"
+                    _remember(response_cache, history, msg, text, name, namespace)
 
                     # Show which agent answered
                     if result.get("selected_agent"):
-                        click.echo(
-                            click.style(
-                                f"  [from {result.get('selected_agent')}]", fg="blue", dim=True
-                            )
+                        reply += "\n" + click.style(
+                            f"  [from {result.get('selected_agent')}]", fg="blue", dim=True
                         )
                 else:
-                    click.echo(
-                        click.style("Error> ", fg="red") + result.get("output", "Unknown error")
-                    )
+                    reply = _ERROR_PROMPT + result.get("output", "Unknown error")
+                click.echo(reply + "\n")
             else:
-                # Use simple chat
-                try:
-                    resp = agent.chat(msg)
-                    click.echo(click.style("Agent", fg="cyan", bold=True) + f"> {resp}")
-                except Exception as e:
-                    click.echo(click.style(f"Error> {e}", fg="red"))
-
-            click.echo()
+                # Use simple chat, printing the reply as it streams in
+                _stream_reply(agent, msg, response_cache, history, name, namespace)
 
     except (KeyboardInterrupt, EOFError):
         click.echo(click.style("\n\n👋 Interrupted. Goodbye!", fg="cyan"))
+    finally:
+        if response_cache is not None:
+            response_cache.close()
+
+
+def _stream_reply(
+    agent: Agent,
+    msg: str,
+    response_cache: ConversationCache | None,
+    history: list[tuple[str, str]],
+    name: str,
+    namespace: str,
+) -> None:
+    """Echo a chat reply chunk by chunk and cache it once complete."""
+    click.echo(_AGENT_PROMPT, nl=False)
+    chunks = []
+    try:
+        for chunk in agent.chat_stream(msg):
+            chunks.append(chunk)
+            click.echo(chunk, nl=False)
+            sys.stdout.flush()
+    except Exception as e:
+        click.echo(click.style(f"\nError> {e}", fg="red") + "\n")
+        return
+    click.echo("\n")
+    _remember(response_cache, history, msg, "".join(chunks), name, namespace)
+
+
+def _remember(
+    response_cache: ConversationCache | None,
+    history: list[tuple[str, str]],
+    msg: str,
+    response: Any,
+    name: str,
+    namespace: str,
+) -> None:
+    """Store a successful text reply in the response cache and the history.
+
+    Only text replies extend the history, so a failed turn does not change
+    which later answers can be reused.
+    """
+    if response_cache is None or not isinstance(response, str):
+        return
+    response_cache.set(msg, response, history, session_id=name, namespace=namespace)
+    history.append((msg, response))
+
+
+def _input_reader() -> Callable[[], str]:
+    """Return a function that reads one line of chat input.
+
+    Interactive terminals use prompt_toolkit when it is installed, which gives
+    line editing, persistent history and reverse search. Otherwise input goes
+    through click.prompt with readline history where available.
+    """
+    if sys.stdin.isatty():
+        try:
+            from prompt_toolkit import PromptSession
+            from prompt_toolkit.formatted_text import ANSI
+            from prompt_toolkit.history import FileHistory
+        except ImportError:
+            pass
+        else:
+            config_dir = get_config_dir()
+            with contextlib.suppress(OSError):
+                os.makedirs(config_dir, exist_ok=True)
+            session = PromptSession(
+                history=FileHistory(os.path.join(config_dir, PROMPT_HISTORY_FILE))
+            )
+            message = ANSI(f"{_YOU_PROMPT}> ")
+            return lambda: session.prompt(message)
+
+    _enable_history()
+    return lambda: click.prompt(_YOU_PROMPT, prompt_suffix="> ")
+
+
+def _enable_history() -> None:
+    """Enable readline line editing with input history kept between sessions.
+
+    Only interactive terminals get history; piped input is left untouched.
+    """
+    if not sys.stdin.isatty():
+        return
+
+    try:
+        import readline
+    except ImportError:
+        # Not available on every platform (e.g. Windows)
+        return
+
+    history_path = os.path.join(get_config_dir(), "chat_history")
+    with contextlib.suppress(OSError):
+        readline.read_history_file(history_path)
+    readline.set_history_length(HISTORY_LENGTH)
+    atexit.register(_save_history, readline, history_path)
+
+
+def _save_history(readline, history_path: str) -> None:
+    """Persist the chat input history, ignoring filesystem errors."""
+    with contextlib.suppress(OSError):
+        os.makedirs(os.path.dirname(history_path), exist_ok=True)
+        readline.write_history_file(history_path)
 
 
 if __name__ == "__main__":
@@ -4,7 +4,12 @@ from pathlib import Path
 
 import click
 
-from hatch_agent.config import DEFAULT_CONFIG, PROVIDER_TEMPLATES, get_config_path, write_config
+from hatch_agent.config import (
+    generate_default_config,
+    get_config_path,
+    materialize_template,
+    write_config,
+)
 
 
 @click.command()
@@ -61,7 +66,7 @@ def generate_config(provider: str | None, interactive: bool, path: Path | None)
         provider = provider_map[provider_choice]
 
         # Get template
-        config = PROVIDER_TEMPLATES[provider].copy()
+        config = materialize_template(provider)
 
         # Prompt for credentials based on provider
         click.echo()
@@ -110,7 +115,7 @@ def generate_config(provider: str | None, interactive: bool, path: Path | None)
 
     elif provider:
         # Use template for specified provider
-        config = PROVIDER_TEMPLATES[provider].copy()
+        config = materialize_template(provider)
         click.echo(f"Using template for {provider}")
         click.echo()
         click.echo(
@@ -119,13 +124,16 @@ def generate_config(provider: str | None, interactive: bool, path: Path | None)
 
     else:
         # Use default config
-        config = DEFAULT_CONFIG.copy()
+        config = None
         click.echo("Using default configuration (OpenAI)")
         click.echo()
         click.echo(click.style("⚠️  Remember to add your API key to the config file!", fg="yellow"))
 
     # Write config
-    success = write_config(config, config_path)
+    if config is None:
+        success = generate_default_config(config_path)
+    else:
+        success = write_config(config, config_path)
 
     if success:
         click.echo()
@@ -1,12 +1,25 @@
 """CLI command for project health checking using multi-agent analysis."""
 
+import io
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import click
 
 from hatch_agent.agent.core import Agent
 from hatch_agent.analyzers.doctor import ProjectDoctor
-from hatch_agent.config import load_config
+from hatch_agent.cache.exact import DEFAULT_TTL, cached_run_task
+from hatch_agent.config import load_config, resolve_provider
+
+_ICON_FAIL = click.style("✗", fg="red")
+_ICONS = {
+    "pass": click.style("✓", fg="green"),
+    "warn": click.style("⚠", fg="yellow"),
+    "fail": _ICON_FAIL,
+}
+_SUMMARY_RULE = click.style("─" * 50, fg="cyan")
+_CYAN_RULE = click.style("=" * 70, fg="cyan")
+_YELLOW_RULE = click.style("=" * 70, fg="yellow")
 
 
 @click.command()
@@ -26,7 +39,24 @@ from hatch_agent.config import load_config
     "--show-all", is_flag=True, help="Show all agent suggestions, not just the selected one"
 )
 @click.option("--no-ai", is_flag=True, help="Run checks only, skip AI analysis and recommendations")
-def doctor(project_root: Path | None, config: Path | None, show_all: bool, no_ai: bool):
+@click.option("--verbose", "-v", is_flag=True, help="Show token usage for the AI analysis")
+@click.option("--no-cache", is_flag=True, help="Always query the agents, ignoring cached results")
+@click.option(
+    "--cache-ttl",
+    type=click.IntRange(min=0),
+    default=DEFAULT_TTL,
+    show_default=True,
+    help="Seconds to reuse a cached result for identical inputs (0 disables caching)",
+)
+def doctor(
+    project_root: Path | None,
+    config: Path | None,
+    show_all: bool,
+    no_ai: bool,
+    verbose: bool,
+    no_cache: bool,
+    cache_ttl: int,
+):
     """Check project health and get AI-powered recommendations.
 
     Runs a suite of checks on your Hatch project including PEP 621 compliance,
@@ -39,44 +69,43 @@ def doctor(project_root: Path | None, config: Path | None, show_all: bool, no_ai
 
       hatch-agent doctor --no-ai
 
+      hatch-agent doctor --no-cache
+
       hatch-agent doctor --project-root /path/to/project --show-all
     """
     click.echo(click.style("🩺 Hatch Agent Doctor", fg="cyan", bold=True))
     click.echo()
 
-    # Run all checks
-    project_doctor = ProjectDoctor(project_root)
-    report = project_doctor.run_all_checks()
+    # Load the agent configuration while the checks run; neither needs the other
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        setup = None if no_ai else pool.submit(_create_doctor_agent, config)
+
+        # Run all checks
+        project_doctor = ProjectDoctor(project_root)
+        report = project_doctor.run_all_checks()
 
     checks = report["checks"]
     summary = report["summary"]
 
-    # Display results grouped by category
+    # Display results grouped by category, written with a single echo
+    out = io.StringIO()
     current_category = None
     for item in checks:
         if item["category"] != current_category:
             current_category = item["category"]
-            click.echo(click.style(f"── {current_category} ──", fg="cyan"))
-
-        status = item["status"]
-        if status == "pass":
-            icon = click.style("✓", fg="green")
-        elif status == "warn":
-            icon = click.style("⚠", fg="yellow")
-        else:
-            icon = click.style("✗", fg="red")
+            out.write(click.style(f"── {current_category} ──", fg="cyan") + "\n")
 
-        click.echo(f"  {icon} {item['field']}: {item['message']}")
+        icon = _ICONS.get(item["status"], _ICON_FAIL)
+        out.write(f"  {icon} {item['field']}: {item['message']}\n")
 
     # Summary
-    click.echo()
-    click.echo(click.style("─" * 50, fg="cyan"))
-    click.echo(
+    out.write(f"\n{_SUMMARY_RULE}\n")
+    out.write(
         f"  {click.style(str(summary['passed']), fg='green')} passed  "
         f"{click.style(str(summary['warned']), fg='yellow')} warnings  "
-        f"{click.style(str(summary['failed']), fg='red')} failed"
+        f"{click.style(str(summary['failed']), fg='red')} failed\n"
     )
-    click.echo()
+    click.echo(out.getvalue())
 
     if no_ai:
         return
@@ -84,82 +113,99 @@ def doctor(project_root: Path | None, config: Path | None, show_all: bool, no_ai
     # Build task for AI analysis
     task = _build_doctor_task(checks, summary)
 
-    # Load agent configuration
-    cfg = load_config(config)
-    provider = cfg.get("underlying_provider", "openai")
-    provider_cfg = cfg.get("underlying_config", {})
-
-    if cfg.get("model") and "model" not in provider_cfg:
-        provider_cfg = dict(provider_cfg)
-        provider_cfg["model"] = cfg.get("model")
+    provider, provider_cfg, agent = setup.result()
 
     click.echo("🤖 Consulting AI agents for recommendations...")
     click.echo()
 
-    agent = Agent(
-        name="project-doctor",
-        use_multi_agent=True,
-        provider_name=provider,
-        provider_config=provider_cfg,
+    context = {"checks": checks, "summary": summary}
+    agent.prepare(context)
+
+    result = cached_run_task(
+        agent,
+        task,
+        context,
+        provider=provider,
+        model=str(provider_cfg.get("model", "")),
+        ttl=cache_ttl,
+        enabled=not no_cache,
     )
 
-    agent.prepare({"checks": checks, "summary": summary})
-
-    result = agent.run_task(task)
-
     if not result.get("success"):
         click.echo(click.style("❌ AI analysis failed:", fg="red"))
         click.echo(result.get("output", "Unknown error"))
         raise click.Abort()
 
+    if result.get("cached"):
+        click.echo(click.style("Using cached result (run with --no-cache to refresh)", fg="blue"))
+        click.echo()
+
     # Display the selected suggestion
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo(click.style("RECOMMENDATIONS", fg="cyan", bold=True))
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo()
-    click.echo(result.get("selected_suggestion", "No recommendations available"))
-    click.echo()
-    click.echo(click.style(f"Selected from: {result.get('selected_agent', 'N/A')}", fg="blue"))
-    click.echo(click.style("Reasoning:", fg="blue"))
-    click.echo(result.get("reasoning", "N/A"))
+    out = io.StringIO()
+    out.write(f"{_CYAN_RULE}\n")
+    out.write(click.style("RECOMMENDATIONS", fg="cyan", bold=True) + "\n")
+    out.write(f"{_CYAN_RULE}\n\n")
+    out.write(f"{result.get('selected_suggestion', 'No recommendations available')}\n\n")
+    out.write(
+        click.style(f"Selected from: {result.get('selected_agent', 'N/A')}", fg="blue") + "\n"
+    )
+    out.write(click.style("Reasoning:", fg="blue") + "\n")
+    out.write(f"{result.get('reasoning', 'N/A')}\n")
+
+    if verbose and result.get("usage"):
+        usage = result["usage"]
+        out.write("\n")
+        out.write(
+            click.style(
+                f"Tokens: {usage.get('inputTokens', 0)} in, "
+                f"{usage.get('outputTokens', 0)} out, "
+                f"{usage.get('cacheReadInputTokens', 0)} read from prompt cache, "
+                f"{usage.get('cacheWriteInputTokens', 0)} written to prompt cache",
+                fg="blue",
+            )
+            + "\n"
+        )
 
     if show_all and "all_suggestions" in result:
-        click.echo()
-        click.echo(click.style("=" * 70, fg="yellow"))
-        click.echo(click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True))
-        click.echo(click.style("=" * 70, fg="yellow"))
+        out.write(f"\n{_YELLOW_RULE}\n")
+        out.write(click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True) + "\n")
+        out.write(f"{_YELLOW_RULE}\n")
 
         for i, suggestion in enumerate(result["all_suggestions"], 1):
-            click.echo()
-            click.echo(click.style(f"{i}. {suggestion['agent']}", fg="yellow", bold=True))
-            click.echo(click.style(f"   Confidence: {suggestion['confidence']:.2f}", fg="yellow"))
-            click.echo(f"   Suggestion: {suggestion['suggestion']}")
-            click.echo(f"   Reasoning: {suggestion['reasoning']}")
+            heading = click.style(f"{i}. {suggestion['agent']}", fg="yellow", bold=True)
+            confidence = click.style(f"   Confidence: {suggestion['confidence']:.2f}", fg="yellow")
+            out.write(f"\n{heading}\n{confidence}\n")
+            out.write(f"   Suggestion: {suggestion['suggestion']}\n")
+            out.write(f"   Reasoning: {suggestion['reasoning']}\n")
 
+    click.echo(out.getvalue(), nl=False)
 
-def _build_doctor_task(checks: list[dict], summary: dict) -> str:
-    """Build the task description for AI agents based on check results."""
-    issues = [c for c in checks if c["status"] != "pass"]
 
-    if not issues:
-        return (
-            "All project health checks passed. Provide recommendations for "
-            "maintaining best practices and any proactive improvements."
-        )
+def _create_doctor_agent(config: Path | None) -> tuple[str, dict, Agent]:
+    """Load the agent configuration and build the doctor agent.
+
+    Returns:
+        Tuple of (provider name, provider config, agent)
+    """
+    cfg = load_config(config)
+    provider, provider_cfg = resolve_provider(cfg)
 
-    issues_text = "\n".join(
-        f"- [{c['status'].upper()}] {c['category']} > {c['field']}: {c['message']}" for c in issues
+    agent = Agent(
+        name="project-doctor",
+        use_multi_agent=True,
+        provider_name=provider,
+        provider_config=provider_cfg,
     )
+    return provider, provider_cfg, agent
 
-    return f"""Analyze the following Hatch project health check results and provide
-actionable recommendations to improve project quality:
 
-Summary: {summary["passed"]} passed, {summary["warned"]} warnings, {summary["failed"]} failures
+# Fixed parts of every doctor task; only the summary and issue list vary per run
+_DOCTOR_PREAMBLE = """Analyze the following Hatch project health check results and provide
+actionable recommendations to improve project quality:
 
-Issues found:
-{issues_text}
+"""
 
-Please:
+_DOCTOR_INSTRUCTIONS = """Please:
 1. Prioritize the most impactful issues to fix first
 2. Provide specific steps to resolve each issue
 3. Explain why each fix matters
@@ -167,5 +213,30 @@ Please:
 5. Suggest any additional best practices"""
 
 
+def _build_doctor_task(checks: list[dict], summary: dict) -> str:
+    """Build the task description for AI agents based on check results."""
+    # Filter and format in one pass over the checks
+    issue_lines = [
+        f"- [{c['status'].upper()}] {c['category']} > {c['field']}: {c['message']}\n"
+        for c in checks
+        if c["status"] != "pass"
+    ]
+
+    if not issue_lines:
+        return (
+            "All project health checks passed. Provide recommendations for "
+            "maintaining best practices and any proactive improvements."
+        )
+
+    parts = [
+        _DOCTOR_PREAMBLE,
+        f"Summary: {summary['passed']} passed, {summary['warned']} warnings, "
+        f"{summary['failed']} failures\n\nIssues found:\n",
+    ]
+    parts += issue_lines
+    parts += ("\n", _DOCTOR_INSTRUCTIONS)
+    return "".join(parts)
+
+
 if __name__ == "__main__":
     doctor()
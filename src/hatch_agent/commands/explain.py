@@ -1,12 +1,22 @@
 """CLI command for explaining build failures using multi-agent analysis."""
 
+import io
 from pathlib import Path
 
 import click
 
 from hatch_agent.agent.core import Agent
 from hatch_agent.analyzers.build import BuildAnalyzer
-from hatch_agent.config import load_config
+from hatch_agent.cache.exact import DEFAULT_TTL, cached_run_task
+from hatch_agent.config import load_config, resolve_provider
+
+_STATUS_ICONS = {
+    True: click.style("PASSED", fg="green"),
+    False: click.style("FAILED", fg="red"),
+    None: click.style("SKIPPED", fg="yellow"),
+}
+_CYAN_RULE = click.style("=" * 70, fg="cyan")
+_YELLOW_RULE = click.style("=" * 70, fg="yellow")
 
 
 @click.command()
@@ -25,7 +35,15 @@ from hatch_agent.config import load_config
 @click.option(
     "--show-all", is_flag=True, help="Show all agent suggestions, not just the selected one"
 )
-def explain(project_root: Path, config: Path, show_all: bool):
+@click.option("--no-cache", is_flag=True, help="Always query the agents, ignoring cached results")
+@click.option(
+    "--cache-ttl",
+    type=click.IntRange(min=0),
+    default=DEFAULT_TTL,
+    show_default=True,
+    help="Seconds to reuse a cached result for identical inputs (0 disables caching)",
+)
+def explain(project_root: Path, config: Path, show_all: bool, no_cache: bool, cache_ttl: int):
     """Explain why a Hatch build failed.
 
     This command analyzes test failures, formatting issues, and type checking
@@ -50,13 +68,7 @@ def explain(project_root: Path, config: Path, show_all: bool):
 
     # Load agent configuration
     cfg = load_config(config)
-    provider = cfg.get("underlying_provider", "openai")
-    provider_cfg = cfg.get("underlying_config", {})
-
-    # Ensure model is set
-    if cfg.get("model") and "model" not in provider_cfg:
-        provider_cfg = dict(provider_cfg)
-        provider_cfg["model"] = cfg.get("model")
+    provider, provider_cfg = resolve_provider(cfg)
 
     click.echo("🤖 Consulting AI agents for analysis...")
     click.echo()
@@ -72,48 +84,73 @@ def explain(project_root: Path, config: Path, show_all: bool):
     # Add build context to agent state
     agent.prepare(build_context)
 
-    # Run the analysis
-    result = agent.run_task(task)
+    # Run the analysis, reusing the result of an identical earlier run
+    result = cached_run_task(
+        agent,
+        task,
+        build_context,
+        provider=provider,
+        model=str(provider_cfg.get("model", "")),
+        ttl=cache_ttl,
+        enabled=not no_cache,
+    )
 
     if not result.get("success"):
         click.echo(click.style("❌ Analysis failed:", fg="red"))
         click.echo(result.get("output", "Unknown error"))
         raise click.Abort()
 
-    # Display the selected suggestion
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo(click.style("ANALYSIS & RECOMMENDATIONS", fg="cyan", bold=True))
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo()
-    click.echo(result.get("selected_suggestion", "No suggestion available"))
-    click.echo()
-    click.echo(click.style(f"Selected from: {result.get('selected_agent', 'N/A')}", fg="blue"))
-    click.echo(click.style("Reasoning:", fg="blue"))
-    click.echo(result.get("reasoning", "N/A"))
+    if result.get("cached"):
+        click.echo(click.style("Using cached result (run with --no-cache to refresh)", fg="blue"))
+        click.echo()
+
+    # Display the selected suggestion, written with a single echo
+    out = io.StringIO()
+    out.write(f"{_CYAN_RULE}\n")
+    out.write(click.style("ANALYSIS & RECOMMENDATIONS", fg="cyan", bold=True) + "\n")
+    out.write(f"{_CYAN_RULE}\n\n")
+    out.write(f"{result.get('selected_suggestion', 'No suggestion available')}\n\n")
+    out.write(
+        click.style(f"Selected from: {result.get('selected_agent', 'N/A')}", fg="blue") + "\n"
+    )
+    out.write(click.style("Reasoning:", fg="blue") + "\n")
+    out.write(f"{result.get('reasoning', 'N/A')}\n")
 
     # Show all suggestions if requested
     if show_all and "all_suggestions" in result:
-        click.echo()
-        click.echo(click.style("=" * 70, fg="yellow"))
-        click.echo(click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True))
-        click.echo(click.style("=" * 70, fg="yellow"))
+        out.write(f"\n{_YELLOW_RULE}\n")
+        out.write(click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True) + "\n")
+        out.write(f"{_YELLOW_RULE}\n")
 
         for i, suggestion in enumerate(result["all_suggestions"], 1):
-            click.echo()
-            click.echo(click.style(f"{i}. {suggestion['agent']}", fg="yellow", bold=True))
-            click.echo(click.style(f"   Confidence: {suggestion['confidence']:.2f}", fg="yellow"))
-            click.echo(f"   Suggestion: {suggestion['suggestion']}")
-            click.echo(f"   Reasoning: {suggestion['reasoning']}")
+            heading = click.style(f"{i}. {suggestion['agent']}", fg="yellow", bold=True)
+            confidence = click.style(f"   Confidence: {suggestion['confidence']:.2f}", fg="yellow")
+            out.write(f"\n{heading}\n{confidence}\n")
+            out.write(f"   Suggestion: {suggestion['suggestion']}\n")
+            out.write(f"   Reasoning: {suggestion['reasoning']}\n")
+
+    click.echo(out.getvalue(), nl=False)
 
 
 def _status_icon(result: dict) -> str:
     """Get a status icon for a result."""
-    if result.get("success") is True:
-        return click.style("PASSED", fg="green")
-    elif result.get("success") is False:
-        return click.style("FAILED", fg="red")
-    else:
-        return click.style("SKIPPED", fg="yellow")
+    return _STATUS_ICONS.get(result.get("success"), _STATUS_ICONS[None])
+
+
+# Fixed parts of every explanation task; only the failure details vary per run
+_EXPLAIN_PREAMBLE = (
+    "Analyze the following Hatch build failures and provide a clear explanation "
+    "with actionable recommendations:\n\n"
+)
+
+_EXPLAIN_INSTRUCTIONS = """
+
+Please:
+1. Identify the root cause of each failure
+2. Explain what went wrong in clear terms
+3. Provide step-by-step fixes
+4. Suggest preventive measures for the future
+5. Include any relevant Hatch commands to resolve issues"""
 
 
 def _build_explanation_task(context: dict) -> str:
@@ -122,37 +159,25 @@ def _build_explanation_task(context: dict) -> str:
 
     test_result = context.get("test_result", {})
     if test_result.get("success") is False:
+        output = test_result.get("stderr", test_result.get("stdout", ""))
         failures.append(
-            f"Tests failed with exit code {test_result.get('exit_code')}:\n{test_result.get('stderr', test_result.get('stdout', ''))[:500]}"
+            f"Tests failed with exit code {test_result.get('exit_code')}:\n{output[:500]}"
         )
 
     format_result = context.get("format_result", {})
     if format_result.get("success") is False:
-        failures.append(
-            f"Formatting issues:\n{format_result.get('stdout', format_result.get('stderr', ''))[:500]}"
-        )
+        output = format_result.get("stdout", format_result.get("stderr", ""))
+        failures.append(f"Formatting issues:\n{output[:500]}")
 
     type_result = context.get("type_result", {})
     if type_result.get("success") is False:
-        failures.append(
-            f"Type checking errors:\n{type_result.get('stdout', type_result.get('stderr', ''))[:500]}"
-        )
+        output = type_result.get("stdout", type_result.get("stderr", ""))
+        failures.append(f"Type checking errors:\n{output[:500]}")
 
     if not failures:
         return "All checks passed. Provide recommendations for maintaining code quality."
 
-    failure_text = "\n\n".join(failures)
-
-    return f"""Analyze the following Hatch build failures and provide a clear explanation with actionable recommendations:
-
-{failure_text}
-
-Please:
-1. Identify the root cause of each failure
-2. Explain what went wrong in clear terms
-3. Provide step-by-step fixes
-4. Suggest preventive measures for the future
-5. Include any relevant Hatch commands to resolve issues"""
+    return "".join((_EXPLAIN_PREAMBLE, "\n\n".join(failures), _EXPLAIN_INSTRUCTIONS))
 
 
 if __name__ == "__main__":
@@ -1,14 +1,23 @@
 """CLI command for auto-fixing build failures using multi-agent analysis."""
 
-import contextlib
-import json
+import itertools
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 import click
 
 from hatch_agent.agent.core import Agent
+from hatch_agent.agent.plan import extract_plan
 from hatch_agent.analyzers.fix import BuildFixer
-from hatch_agent.config import load_config
+from hatch_agent.config import load_config, resolve_provider
+
+_CYAN_RULE = click.style("=" * 70, fg="cyan")
+_YELLOW_RULE = click.style("=" * 70, fg="yellow")
+_PROPOSED_FIXES_HEADING = click.style("PROPOSED FIXES", fg="cyan", bold=True)
+_ALL_SUGGESTIONS_HEADING = click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True)
 
 
 @click.command()
@@ -64,32 +73,37 @@ def fix(
 
     fixer = BuildFixer(project_root)
 
-    # Step 1: Autofix with ruff
-    if not no_autofix:
-        click.echo("⚡ Running ruff autofix...")
-        autofix_result = fixer.run_autofix()
+    # Load the agent configuration while ruff and mypy run; a dry run never
+    # consults the agents
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        setup = None if dry_run else pool.submit(_create_fix_agent, config)
+
+        # Step 1: Autofix with ruff
+        if not no_autofix:
+            click.echo("⚡ Running ruff autofix...")
+            autofix_result = fixer.run_autofix()
 
-        if autofix_result.get("success"):
-            files_fixed = autofix_result.get("files_fixed", 0)
-            if files_fixed > 0:
-                click.echo(click.style(f"   ✅ Auto-fixed {files_fixed} issue(s)", fg="green"))
+            if autofix_result.get("success"):
+                files_fixed = autofix_result.get("files_fixed", 0)
+                if files_fixed > 0:
+                    click.echo(click.style(f"   ✅ Auto-fixed {files_fixed} issue(s)", fg="green"))
+                else:
+                    click.echo("   No auto-fixable issues found")
             else:
-                click.echo("   No auto-fixable issues found")
-        else:
-            click.echo(
-                click.style(
-                    f"   ⚠️  Autofix error: {autofix_result.get('error', 'Unknown')}",
-                    fg="yellow",
+                click.echo(
+                    click.style(
+                        f"   ⚠️  Autofix error: {autofix_result.get('error', 'Unknown')}",
+                        fg="yellow",
+                    )
                 )
-            )
-        click.echo()
-    else:
-        click.echo("⏭️  Skipped autofix (--no-autofix)")
-        click.echo()
+            click.echo()
+        else:
+            click.echo("⏭️  Skipped autofix (--no-autofix)")
+            click.echo()
 
-    # Step 2: Collect remaining errors
-    click.echo("🔍 Checking for remaining errors...")
-    remaining = fixer.get_remaining_errors()
+        # Step 2: Collect remaining errors
+        click.echo("🔍 Checking for remaining errors...")
+        remaining = fixer.get_remaining_errors()
 
     if not remaining:
         click.echo(click.style("✅ No remaining errors!", fg="green", bold=True))
@@ -116,34 +130,19 @@ def fix(
         return
 
     # Step 3: Read relevant source files for AI context
-    error_files: dict[str, str] = {}
-    for err in remaining:
-        file_path = project_root / err["file"]
-        if file_path.exists() and str(file_path) not in error_files:
-            with contextlib.suppress(Exception):
-                error_files[str(file_path)] = file_path.read_text(encoding="utf-8")
+    # Many errors usually share a file, so join each distinct name only once
+    error_files = _read_sources(
+        project_root / name for name in dict.fromkeys(err["file"] for err in remaining)
+    )
 
     # Step 4: Build task and run AI
     task = _build_fix_task(remaining, error_files)
 
-    cfg = load_config(config)
-    provider = cfg.get("underlying_provider", "openai")
-    provider_cfg = cfg.get("underlying_config", {})
-
-    if cfg.get("model") and "model" not in provider_cfg:
-        provider_cfg = dict(provider_cfg)
-        provider_cfg["model"] = cfg.get("model")
+    agent = setup.result()
 
     click.echo("🤖 Consulting AI agents for fixes...")
     click.echo()
 
-    agent = Agent(
-        name="build-fixer",
-        use_multi_agent=True,
-        provider_name=provider,
-        provider_config=provider_cfg,
-    )
-
     agent.prepare({"errors": remaining, "files": {k: v[:2000] for k, v in error_files.items()}})
 
     result = agent.run_task(task)
@@ -156,9 +155,9 @@ def fix(
     suggestion = result.get("selected_suggestion", "")
 
     # Display the suggestion
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo(click.style("PROPOSED FIXES", fg="cyan", bold=True))
-    click.echo(click.style("=" * 70, fg="cyan"))
+    click.echo(_CYAN_RULE)
+    click.echo(_PROPOSED_FIXES_HEADING)
+    click.echo(_CYAN_RULE)
     click.echo()
     click.echo(suggestion)
     click.echo()
@@ -166,9 +165,9 @@ def fix(
 
     if show_all and "all_suggestions" in result:
         click.echo()
-        click.echo(click.style("=" * 70, fg="yellow"))
-        click.echo(click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True))
-        click.echo(click.style("=" * 70, fg="yellow"))
+        click.echo(_YELLOW_RULE)
+        click.echo(_ALL_SUGGESTIONS_HEADING)
+        click.echo(_YELLOW_RULE)
 
         for i, sug in enumerate(result["all_suggestions"], 1):
             click.echo()
@@ -177,62 +176,18 @@ def fix(
             click.echo(f"   Suggestion: {sug['suggestion']}")
 
     # Step 5: Try to parse structured fixes and apply
-    fix_plan = _extract_fix_plan(suggestion)
+    fixes = _planned_fixes(_extract_fix_plan(suggestion))
 
-    if fix_plan and fix_plan.get("fixes"):
+    if fixes:
         click.echo()
-        click.echo(
-            click.style(f"📝 {len(fix_plan['fixes'])} structured fix(es) available", fg="green")
-        )
+        click.echo(click.style(f"📝 {len(fixes)} structured fix(es) available", fg="green"))
 
-        for i, fx in enumerate(fix_plan["fixes"], 1):
-            click.echo(
-                f"  {i}. {fx.get('file', '?')}:{fx.get('line', '?')} - {fx.get('description', 'N/A')}"
-            )
+        for i, fx in enumerate(fixes, 1):
+            click.echo(f"  {i}. {fx.file or '?'}:{fx.line} - {fx.description}")
 
         click.echo()
         if click.confirm("Apply these fixes? (.bak backups will be created)"):
-            applied = 0
-            for fx in fix_plan["fixes"]:
-                file_path = project_root / fx.get("file", "")
-                if not file_path.exists():
-                    click.echo(click.style(f"  ⚠️  File not found: {file_path}", fg="yellow"))
-                    continue
-
-                original = fx.get("original", "")
-                fixed = fx.get("fixed", "")
-
-                if original and fixed:
-                    try:
-                        content = file_path.read_text(encoding="utf-8")
-                        if original in content:
-                            new_content = content.replace(original, fixed, 1)
-                            apply_result = fixer.apply_fix(file_path, content, new_content)
-                            if apply_result["success"]:
-                                click.echo(click.style(f"  ✅ Fixed {file_path}", fg="green"))
-                                applied += 1
-                            else:
-                                click.echo(
-                                    click.style(
-                                        f"  ⚠️  Could not apply fix to {file_path}: "
-                                        f"{apply_result.get('error', '')}",
-                                        fg="yellow",
-                                    )
-                                )
-                        else:
-                            click.echo(
-                                click.style(
-                                    f"  ⚠️  Original code not found in {file_path}", fg="yellow"
-                                )
-                            )
-                    except Exception as e:
-                        click.echo(click.style(f"  ⚠️  Error fixing {file_path}: {e}", fg="yellow"))
-                else:
-                    click.echo(
-                        click.style(
-                            f"  ⚠️  Fix for {file_path} missing original/fixed code", fg="yellow"
-                        )
-                    )
+            applied = _apply_fix_plan(fixer, fixes, project_root, error_files)
 
             click.echo()
             if applied > 0:
@@ -262,39 +217,182 @@ def fix(
     click.echo(click.style("🎉 Done!", fg="green", bold=True))
 
 
-def _build_fix_task(errors: list[dict], files: dict[str, str]) -> str:
-    """Build the task description for AI agents."""
-    errors_text = "\n".join(
-        f"- [{e['tool']}] {e['file']}:{e['line']} [{e.get('code', '')}] {e['message']}"
-        for e in errors
+@dataclass(frozen=True)
+class PlannedFix:
+    """A single entry of the agent's FIX_PLAN, with missing fields defaulted."""
+
+    file: str
+    line: int | str
+    description: str
+    original: str
+    fixed: str
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PlannedFix":
+        """Build a fix from a FIX_PLAN entry."""
+        return cls(
+            file=data.get("file") or "",
+            line=data.get("line", "?"),
+            description=data.get("description", "N/A"),
+            original=data.get("original") or "",
+            fixed=data.get("fixed") or "",
+        )
+
+
+def _planned_fixes(fix_plan: dict | None) -> list[PlannedFix]:
+    """Normalize the entries of a FIX_PLAN once; malformed entries are dropped."""
+    entries = fix_plan.get("fixes") if fix_plan else None
+    if not isinstance(entries, list):
+        return []
+    return [PlannedFix.from_dict(fx) for fx in entries if isinstance(fx, dict)]
+
+
+def _create_fix_agent(config: Path | None) -> Agent:
+    """Load the agent configuration and build the fixer agent."""
+    cfg = load_config(config)
+    provider, provider_cfg = resolve_provider(cfg)
+
+    return Agent(
+        name="build-fixer",
+        use_multi_agent=True,
+        provider_name=provider,
+        provider_config=provider_cfg,
     )
 
-    # Include file snippets (truncated)
-    files_text = ""
-    for path, content in list(files.items())[:5]:  # Limit to 5 files
-        files_text += f"\n\n--- {path} ---\n{content[:1500]}"
 
-    return f"""Fix the following {len(errors)} remaining errors in a Hatch project:
+def _splice_fixes(content: str, pairs: list[tuple[str, str]]) -> tuple[str, list[bool]]:
+    """Apply several ``(original, fixed)`` replacements to content in plan order.
+
+    Each original replaces its first occurrence in the content as edited by
+    the earlier pairs, so a fix may build on the output of a previous one.
+
+    Args:
+        content: Source text to edit
+        pairs: Replacements in plan order
+
+    Returns:
+        Tuple of the edited text and, per pair, whether it was applied
+    """
+    matched: list[bool] = []
+    for original, fixed in pairs:
+        found = original in content
+        matched.append(found)
+        if found:
+            content = content.replace(original, fixed, 1)
+    return content, matched
+
+
+def _apply_fix_plan(
+    fixer: BuildFixer, fixes: list[PlannedFix], project_root: Path, error_files: dict[str, str]
+) -> int:
+    """Apply structured fixes, writing each affected file once.
+
+    Args:
+        fixer: Fixer used to write files (with .bak backups)
+        fixes: Fixes from the FIX_PLAN
+        project_root: Root the fix paths are relative to
+        error_files: Source contents already read for the prompt, by path string;
+            updated with the new contents of each file written
+
+    Returns:
+        Number of fixes applied
+    """
+    fixes_by_file: dict[Path, list[PlannedFix]] = {}
+    for fx in fixes:
+        file_path = project_root / fx.file
+        if not fx.original or not fx.fixed:
+            click.echo(
+                click.style(f"  ⚠️  Fix for {file_path} missing original/fixed code", fg="yellow")
+            )
+            continue
+        fixes_by_file.setdefault(file_path, []).append(fx)
+
+    applied = 0
+    for file_path, file_fixes in fixes_by_file.items():
+        if not file_path.exists():
+            click.echo(click.style(f"  ⚠️  File not found: {file_path}", fg="yellow"))
+            continue
+
+        try:
+            # Reuse the contents read for the prompt; apply_fix still checks
+            # them against the file before writing
+            content = error_files.get(str(file_path))
+            if content is None:
+                content = file_path.read_text(encoding="utf-8")
+
+            new_content, matched = _splice_fixes(
+                content, [(fx.original, fx.fixed) for fx in file_fixes]
+            )
+            for _ in range(matched.count(False)):
+                click.echo(click.style(f"  ⚠️  Original code not found in {file_path}", fg="yellow"))
+            count = matched.count(True)
+            if not count:
+                continue
+
+            apply_result = fixer.apply_fix(file_path, content, new_content)
+            if apply_result["success"]:
+                error_files[str(file_path)] = new_content
+                click.echo(click.style(f"  ✅ Fixed {file_path}", fg="green"))
+                applied += count
+            else:
+                click.echo(
+                    click.style(
+                        f"  ⚠️  Could not apply fix to {file_path}: {apply_result.get('error', '')}",
+                        fg="yellow",
+                    )
+                )
+        except Exception as e:
+            click.echo(click.style(f"  ⚠️  Error fixing {file_path}: {e}", fg="yellow"))
+
+    return applied
+
+
+def _read_source(path: Path) -> str | None:
+    """Read a source file, returning None if it is missing or unreadable."""
+    try:
+        return path.read_text(encoding="utf-8")
+    except Exception:
+        return None
+
 
-{errors_text}
+def _read_sources(paths: Iterable[Path]) -> dict[str, str]:
+    """Read each distinct source file once, overlapping the reads.
 
-Relevant source files:{files_text}
+    Args:
+        paths: Files referenced by errors, possibly repeated
+
+    Returns:
+        Mapping of path string to contents, in first-seen order, for files
+        that could be read
+    """
+    unique = list(dict.fromkeys(paths))
+    if not unique:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(8, len(unique))) as pool:
+        contents = pool.map(_read_source, unique)
+    return {
+        str(path): text for path, text in zip(unique, contents, strict=True) if text is not None
+    }
+
+
+# Fixed tail of every fix task; only the error list and file snippets vary per run
+_FIX_INSTRUCTIONS = """
 
 IMPORTANT: Your response MUST include a structured fix plan at the END in this EXACT format:
 
 FIX_PLAN:
-{{
+{
     "fixes": [
-        {{
+        {
             "file": "relative/path/to/file.py",
             "line": 42,
             "error_code": "E501",
             "description": "Brief description of the fix",
             "original": "exact original code to replace",
             "fixed": "corrected code"
-        }}
+        }
     ]
-}}
+}
 
 Requirements:
 1. Make ONLY the minimum changes needed to fix each error
@@ -304,23 +402,28 @@ Requirements:
 5. The "fixed" field must contain ONLY the corrected version of that text"""
 
 
-def _extract_fix_plan(suggestion: str) -> dict | None:
-    """Extract structured fix plan from agent suggestion."""
-    if "FIX_PLAN:" not in suggestion:
-        return None
+def _build_fix_task(errors: list[dict], files: dict[str, str]) -> str:
+    """Build the task description for AI agents."""
+    errors_text = "\n".join(
+        f"- [{e['tool']}] {e['file']}:{e['line']} [{e.get('code', '')}] {e['message']}"
+        for e in errors
+    )
 
-    try:
-        plan_part = suggestion.split("FIX_PLAN:")[1].strip()
-        start = plan_part.find("{")
-        end = plan_part.rfind("}") + 1
+    # Include file snippets (truncated), limited to 5 files
+    files_text = "".join(
+        f"\n\n--- {path} ---\n{content[:1500]}"
+        for path, content in itertools.islice(files.items(), 5)
+    )
 
-        if start == -1 or end == 0:
-            return None
+    return (
+        f"Fix the following {len(errors)} remaining errors in a Hatch project:\n\n"
+        f"{errors_text}\n\nRelevant source files:{files_text}{_FIX_INSTRUCTIONS}"
+    )
 
-        json_str = plan_part[start:end]
-        return json.loads(json_str)
-    except (json.JSONDecodeError, IndexError):
-        return None
+
+def _extract_fix_plan(suggestion: str) -> dict | None:
+    """Extract structured fix plan from agent suggestion."""
+    return extract_plan(suggestion, "FIX_PLAN:")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 """CLI command for migrating projects to Hatch from other build systems."""
 
 import json
+import os
 import shutil
 from pathlib import Path
 
@@ -8,8 +9,14 @@ import click
 import tomli_w
 
 from hatch_agent.agent.core import Agent
+from hatch_agent.agent.plan import extract_plan
 from hatch_agent.analyzers.migrate import ProjectMigrator
-from hatch_agent.config import load_config
+from hatch_agent.config import load_config, resolve_provider
+
+_CYAN_RULE = click.style("=" * 70, fg="cyan")
+_YELLOW_RULE = click.style("=" * 70, fg="yellow")
+_ANALYSIS_HEADING = click.style("MIGRATION ANALYSIS", fg="cyan", bold=True)
+_ALL_SUGGESTIONS_HEADING = click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True)
 
 
 @click.command()
@@ -104,12 +111,7 @@ def migrate(
     task = _build_migration_task(source_system, parsed_data, base_config)
 
     cfg = load_config(config)
-    provider = cfg.get("underlying_provider", "openai")
-    provider_cfg = cfg.get("underlying_config", {})
-
-    if cfg.get("model") and "model" not in provider_cfg:
-        provider_cfg = dict(provider_cfg)
-        provider_cfg["model"] = cfg.get("model")
+    provider, provider_cfg = resolve_provider(cfg)
 
     click.echo("🤖 Consulting AI agents for migration refinement...")
     click.echo()
@@ -150,17 +152,17 @@ def migrate(
             click.echo("Using auto-generated configuration (AI refinement not parseable)")
 
         click.echo()
-        click.echo(click.style("=" * 70, fg="cyan"))
-        click.echo(click.style("MIGRATION ANALYSIS", fg="cyan", bold=True))
-        click.echo(click.style("=" * 70, fg="cyan"))
+        click.echo(_CYAN_RULE)
+        click.echo(_ANALYSIS_HEADING)
+        click.echo(_CYAN_RULE)
         click.echo()
         click.echo(suggestion)
         click.echo()
 
         if show_all and "all_suggestions" in result:
-            click.echo(click.style("=" * 70, fg="yellow"))
-            click.echo(click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True))
-            click.echo(click.style("=" * 70, fg="yellow"))
+            click.echo(_YELLOW_RULE)
+            click.echo(_ALL_SUGGESTIONS_HEADING)
+            click.echo(_YELLOW_RULE)
 
             for i, sug in enumerate(result["all_suggestions"], 1):
                 click.echo()
@@ -178,11 +180,7 @@ def migrate(
     click.echo()
 
     # Serialize to TOML string for preview
-    import io
-
-    buf = io.BytesIO()
-    tomli_w.dump(final_config, buf)
-    toml_preview = buf.getvalue().decode("utf-8")
+    toml_preview = tomli_w.dumps(final_config)
     click.echo(toml_preview)
     click.echo()
 
@@ -199,7 +197,7 @@ def migrate(
     pyproject_path = project_root / "pyproject.toml"
     if pyproject_path.exists():
         backup_path = project_root / "pyproject.toml.bak"
-        shutil.copy2(pyproject_path, backup_path)
+        _backup_file(pyproject_path, backup_path)
         click.echo(f"   Backed up existing file to {backup_path}")
 
     migrator.write_pyproject(final_config)
@@ -212,6 +210,20 @@ def migrate(
     click.echo("  4. Remove old build files (setup.py, setup.cfg, Pipfile) once verified")
 
 
+def _backup_file(source: Path, backup: Path) -> None:
+    """Back up ``source`` as ``backup``, hard-linking when the filesystem allows.
+
+    A hard link costs no copy and is safe because ``write_pyproject`` replaces
+    the file rather than rewriting it in place. Filesystems without hard
+    links (or cross-device paths) fall back to a full copy.
+    """
+    backup.unlink(missing_ok=True)
+    try:
+        os.link(source, backup)
+    except OSError:
+        shutil.copy2(source, backup)
+
+
 def _parse_source(migrator: ProjectMigrator, source_system: str) -> dict:
     """Parse the source build system configuration."""
     if source_system == "setuptools":
@@ -234,6 +246,27 @@ def _parse_source(migrator: ProjectMigrator, source_system: str) -> dict:
         return {"error": f"Unsupported build system: {source_system}"}
 
 
+# Same output as json.dumps(obj, indent=2, default=str); with an indent the
+# encoder yields small fragments, so serialization can stop early
+_PROMPT_ENCODER = json.JSONEncoder(indent=2, default=str)
+
+
+def _dump_bounded(obj: object, limit: int) -> str:
+    """Serialize ``obj`` as indented JSON, truncated to ``limit`` characters.
+
+    Encoding stops as soon as the limit is reached, so large configs are not
+    fully serialized only to be cut off.
+    """
+    chunks = []
+    size = 0
+    for chunk in _PROMPT_ENCODER.iterencode(obj):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return "".join(chunks)[:limit]
+
+
 def _build_migration_task(source_system: str, parsed_data: dict, base_config: dict) -> str:
     """Build the task description for AI agents."""
     # Remove raw content to keep prompt size reasonable
@@ -248,10 +281,10 @@ def _build_migration_task(source_system: str, parsed_data: dict, base_config: di
 Source build system: {source_system}
 
 Parsed configuration:
-{json.dumps(clean_data, indent=2, default=str)[:3000]}
+{_dump_bounded(clean_data, 3000)}
 
 Auto-generated Hatch configuration:
-{json.dumps(base_config, indent=2, default=str)[:2000]}
+{_dump_bounded(base_config, 2000)}
 
 Please:
 1. Review the auto-generated Hatch pyproject.toml for correctness
@@ -275,21 +308,7 @@ Only include the MIGRATION_PLAN if you have specific improvements over the base
 
 def _extract_migration_plan(suggestion: str) -> dict | None:
     """Extract structured migration plan from agent suggestion."""
-    if "MIGRATION_PLAN:" not in suggestion:
-        return None
-
-    try:
-        plan_part = suggestion.split("MIGRATION_PLAN:")[1].strip()
-        start = plan_part.find("{")
-        end = plan_part.rfind("}") + 1
-
-        if start == -1 or end == 0:
-            return None
-
-        json_str = plan_part[start:end]
-        return json.loads(json_str)
-    except (json.JSONDecodeError, IndexError):
-        return None
+    return extract_plan(suggestion, "MIGRATION_PLAN:")
 
 
 if __name__ == "__main__":
@@ -5,7 +5,12 @@ from pathlib import Path
 import click
 
 from hatch_agent.agent.core import Agent
-from hatch_agent.config import load_config
+from hatch_agent.config import load_config, resolve_provider
+
+_CYAN_RULE = click.style("=" * 70, fg="cyan")
+_YELLOW_RULE = click.style("=" * 70, fg="yellow")
+_SELECTED_HEADING = click.style("SELECTED SUGGESTION", fg="cyan", bold=True)
+_ALL_SUGGESTIONS_HEADING = click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True)
 
 
 @click.command()
@@ -40,13 +45,7 @@ def multi_task(task: tuple, config: Path, show_all: bool):
 
     # Load agent configuration
     cfg = load_config(config)
-    provider = cfg.get("underlying_provider", "openai")
-    provider_cfg = cfg.get("underlying_config", {})
-
-    # Ensure model is set
-    if cfg.get("model") and "model" not in provider_cfg:
-        provider_cfg = dict(provider_cfg)
-        provider_cfg["model"] = cfg.get("model")
+    provider, provider_cfg = resolve_provider(cfg)
 
     click.echo("🤖 Consulting AI agents...")
     click.echo()
@@ -67,9 +66,9 @@ def multi_task(task: tuple, config: Path, show_all: bool):
         raise click.Abort()
 
     # Format the multi-agent output
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo(click.style("SELECTED SUGGESTION", fg="cyan", bold=True))
-    click.echo(click.style("=" * 70, fg="cyan"))
+    click.echo(_CYAN_RULE)
+    click.echo(_SELECTED_HEADING)
+    click.echo(_CYAN_RULE)
     click.echo()
     click.echo(result.get("selected_suggestion", result.get("output", "")))
     click.echo()
@@ -79,9 +78,9 @@ def multi_task(task: tuple, config: Path, show_all: bool):
     # Show all suggestions if requested
     if show_all and "all_suggestions" in result:
         click.echo()
-        click.echo(click.style("=" * 70, fg="yellow"))
-        click.echo(click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True))
-        click.echo(click.style("=" * 70, fg="yellow"))
+        click.echo(_YELLOW_RULE)
+        click.echo(_ALL_SUGGESTIONS_HEADING)
+        click.echo(_YELLOW_RULE)
 
         for i, suggestion in enumerate(result["all_suggestions"], 1):
             click.echo()
@@ -1,12 +1,31 @@
 """CLI command for auditing dependency security using multi-agent analysis."""
 
+import io
+import sys
 from pathlib import Path
 
 import click
 
 from hatch_agent.agent.core import Agent
-from hatch_agent.analyzers.security import SecurityAuditor
-from hatch_agent.config import load_config
+from hatch_agent.analyzers.security import OSV_CACHE_TTL, SecurityAuditor
+from hatch_agent.config import load_config, resolve_provider
+
+_SEVERITY_COLORS = {
+    "critical": "red",
+    "high": "red",
+    "medium": "yellow",
+    "low": "green",
+    "unknown": "white",
+}
+_SEVERITY_ORDER = ("critical", "high", "medium", "low", "unknown")
+_RED_RULE = click.style("=" * 70, fg="red")
+_VULNS_HEADING = click.style("VULNERABILITIES FOUND", fg="red", bold=True)
+_SUMMARY_RULE = click.style("─" * 50, fg="red")
+_CYAN_RULE = click.style("=" * 70, fg="cyan")
+_YELLOW_RULE = click.style("=" * 70, fg="yellow")
+_ANALYSIS_HEADING = click.style("SECURITY ANALYSIS & REMEDIATION", fg="cyan", bold=True)
+_ALL_SUGGESTIONS_HEADING = click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True)
+_PAGER_THRESHOLD = 20
 
 
 @click.command()
@@ -32,12 +51,16 @@ from hatch_agent.config import load_config
     is_flag=True,
     help="Suggest and apply version bumps for vulnerable dependencies",
 )
+@click.option(
+    "--no-cache", is_flag=True, help="Always query OSV.dev, ignoring cached vulnerability data"
+)
 def security(
     project_root: Path | None,
     config: Path | None,
     show_all: bool,
     no_ai: bool,
     apply_fix: bool,
+    no_cache: bool,
 ):
     """Audit dependencies for known security vulnerabilities.
 
@@ -55,11 +78,14 @@ def security(
     click.echo(click.style("🔒 Hatch Agent Security Audit", fg="cyan", bold=True))
     click.echo()
 
-    auditor = SecurityAuditor(project_root)
+    auditor = SecurityAuditor(project_root, cache_ttl=0 if no_cache else OSV_CACHE_TTL)
 
     # Run audit
     click.echo("🔍 Checking dependencies against vulnerability databases...")
-    report = auditor.run_audit()
+    try:
+        report = auditor.run_audit()
+    finally:
+        auditor.close()
 
     vulns = report["vulnerabilities"]
     summary = report["summary"]
@@ -72,38 +98,39 @@ def security(
         click.echo(click.style("✅ No known vulnerabilities found!", fg="green", bold=True))
         return
 
-    # Display vulnerability table
-    click.echo(click.style("=" * 70, fg="red"))
-    click.echo(click.style("VULNERABILITIES FOUND", fg="red", bold=True))
-    click.echo(click.style("=" * 70, fg="red"))
-    click.echo()
+    # Display vulnerability table, written with a single echo
+    out = io.StringIO()
+    out.write(f"{_RED_RULE}\n{_VULNS_HEADING}\n{_RED_RULE}\n\n")
 
     for v in vulns:
         severity = v["severity"]
         sev_color = _severity_color(severity)
 
-        click.echo(
+        out.write(
             f"  {click.style(severity.upper(), fg=sev_color, bold=True)}  "
             f"{click.style(v['package'], fg='white', bold=True)} "
-            f"({v['installed_version']})"
+            f"({v['installed_version']})\n"
         )
-        click.echo(f"    ID: {v['vuln_id']}")
-        click.echo(f"    {v['summary']}")
+        out.write(f"    ID: {v['vuln_id']}\n")
+        out.write(f"    {v['summary']}\n")
         if v.get("fixed_in"):
-            click.echo(f"    Fixed in: {click.style(v['fixed_in'], fg='green')}")
+            out.write(f"    Fixed in: {click.style(v['fixed_in'], fg='green')}\n")
         if v.get("url"):
-            click.echo(f"    URL: {click.style(v['url'], fg='blue')}")
-        click.echo()
+            out.write(f"    URL: {click.style(v['url'], fg='blue')}\n")
+        out.write("\n")
 
     # Summary line
-    click.echo(click.style("─" * 50, fg="red"))
-    parts = []
-    for level in ("critical", "high", "medium", "low", "unknown"):
-        count = summary.get(level, 0)
-        if count > 0:
-            parts.append(click.style(f"{count} {level}", fg=_severity_color(level)))
-    click.echo(f"  Total: {' | '.join(parts)}")
-    click.echo()
+    parts = [
+        click.style(f"{summary[level]} {level}", fg=_severity_color(level))
+        for level in _SEVERITY_ORDER
+        if summary.get(level, 0) > 0
+    ]
+    out.write(f"{_SUMMARY_RULE}\n  Total: {' | '.join(parts)}\n")
+    # Long reports go through a pager on a terminal; piped output is unchanged
+    if len(vulns) > _PAGER_THRESHOLD and sys.stdout.isatty():
+        click.echo_via_pager(out.getvalue())
+    else:
+        click.echo(out.getvalue())
 
     # Suggest fixes
     if apply_fix:
@@ -125,12 +152,7 @@ def security(
     task = _build_security_task(vulns, summary)
 
     cfg = load_config(config)
-    provider = cfg.get("underlying_provider", "openai")
-    provider_cfg = cfg.get("underlying_config", {})
-
-    if cfg.get("model") and "model" not in provider_cfg:
-        provider_cfg = dict(provider_cfg)
-        provider_cfg["model"] = cfg.get("model")
+    provider, provider_cfg = resolve_provider(cfg)
 
     click.echo("🤖 Consulting AI agents for impact analysis and remediation...")
     click.echo()
@@ -151,9 +173,9 @@ def security(
         click.echo(result.get("output", "Unknown error"))
         raise click.Abort()
 
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo(click.style("SECURITY ANALYSIS & REMEDIATION", fg="cyan", bold=True))
-    click.echo(click.style("=" * 70, fg="cyan"))
+    click.echo(_CYAN_RULE)
+    click.echo(_ANALYSIS_HEADING)
+    click.echo(_CYAN_RULE)
     click.echo()
     click.echo(result.get("selected_suggestion", "No analysis available"))
     click.echo()
@@ -163,9 +185,9 @@ def security(
 
     if show_all and "all_suggestions" in result:
         click.echo()
-        click.echo(click.style("=" * 70, fg="yellow"))
-        click.echo(click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True))
-        click.echo(click.style("=" * 70, fg="yellow"))
+        click.echo(_YELLOW_RULE)
+        click.echo(_ALL_SUGGESTIONS_HEADING)
+        click.echo(_YELLOW_RULE)
 
         for i, suggestion in enumerate(result["all_suggestions"], 1):
             click.echo()
@@ -177,24 +199,21 @@ def security(
 
 def _severity_color(severity: str) -> str:
     """Map severity to a click color."""
-    return {
-        "critical": "red",
-        "high": "red",
-        "medium": "yellow",
-        "low": "green",
-        "unknown": "white",
-    }.get(severity.lower(), "white")
+    return _SEVERITY_COLORS.get(severity.lower(), "white")
 
 
-def _build_security_task(vulns: list[dict], summary: dict) -> str:
-    """Build the task description for AI agents."""
-    vuln_text = "\n".join(
+def _format_vuln_line(v: dict) -> str:
+    """Format one vulnerability as a bullet line for the agent task."""
+    fixed = f" (fixed in {v['fixed_in']})" if v.get("fixed_in") else ""
+    return (
         f"- [{v['severity'].upper()}] {v['package']} ({v['installed_version']}): "
-        f"{v['vuln_id']} - {v['summary']}"
-        + (f" (fixed in {v['fixed_in']})" if v.get("fixed_in") else "")
-        for v in vulns
+        f"{v['vuln_id']} - {v['summary']}{fixed}"
     )
 
+
+def _build_security_task(vulns: list[dict], summary: dict) -> str:
+    """Build the task description for AI agents."""
+    vuln_text = "\n".join(map(_format_vuln_line, vulns))
     total = sum(summary.values())
 
     return f"""Analyze the following {total} security vulnerabilities found in project dependencies
@@ -1,15 +1,38 @@
 """CLI command for syncing dependencies and analyzing breaking changes."""
 
-import json
+import io
+import re
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 from typing import Any
 
 import click
 
 from hatch_agent.agent.core import Agent
+from hatch_agent.agent.plan import extract_plan
 from hatch_agent.analyzers.sync import DependencySync
 from hatch_agent.analyzers.updater import DependencyUpdater
-from hatch_agent.config import load_config
+from hatch_agent.cache.exact import DEFAULT_TTL, cached_run_task
+from hatch_agent.config import load_config, resolve_provider
+
+_CYAN_RULE = click.style("=" * 70, fg="cyan")
+_UPDATED_HEADING = click.style("UPDATED PACKAGES", fg="cyan", bold=True)
+_BREAKING_HEADING = click.style("BREAKING CHANGES ANALYSIS", fg="cyan", bold=True)
+# change_type -> (symbol, color) for the updated packages list
+_CHANGE_STYLES = {
+    "major": ("⚠️ ", "red"),
+    "minor": ("📦", "yellow"),
+    "patch": ("🔧", "green"),
+    "new": ("✨", "blue"),
+}
+_DEFAULT_ANALYSIS_WORKERS = 5
+# Packages analyzed per agent request; keeps batched prompts within context limits
+_DEFAULT_BATCH_SIZE = 10
+# Lines of surrounding code sent with a line-ranged change
+_CONTEXT_LINES = 5
+_LINE_RANGE_RE = re.compile(r"^\s*(\d+)\s*(?:-\s*(\d+))?\s*$")
 
 
 @click.command()
@@ -35,6 +58,28 @@ from hatch_agent.config import load_config
 )
 @click.option("--no-code-changes", is_flag=True, help="Skip code modification suggestions")
 @click.option("--major-only", is_flag=True, help="Only analyze packages with major version changes")
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=_DEFAULT_ANALYSIS_WORKERS,
+    show_default=True,
+    help="Number of analysis requests to run concurrently",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=_DEFAULT_BATCH_SIZE,
+    show_default=True,
+    help="Packages analyzed per AI request (1 sends one request per package)",
+)
+@click.option("--no-cache", is_flag=True, help="Always query the agents, ignoring cached results")
+@click.option(
+    "--cache-ttl",
+    type=click.IntRange(min=0),
+    default=DEFAULT_TTL,
+    show_default=True,
+    help="Seconds to reuse a cached result for identical inputs (0 disables caching)",
+)
 def sync(
     project_root: Path | None,
     config: Path | None,
@@ -44,6 +89,10 @@ def sync(
     show_all: bool,
     no_code_changes: bool,
     major_only: bool,
+    workers: int,
+    batch_size: int,
+    no_cache: bool,
+    cache_ttl: int,
 ):
     """Sync dependencies to latest compatible versions and analyze breaking changes.
 
@@ -135,49 +184,28 @@ def sync(
         click.echo(click.style("✅ All packages are already up to date!", fg="green"))
         return
 
-    # Display updates
-    click.echo()
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo(click.style("UPDATED PACKAGES", fg="cyan", bold=True))
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo()
+    # Display updates, written with a single echo
+    out = io.StringIO()
+    out.write(f"\n{_CYAN_RULE}\n{_UPDATED_HEADING}\n{_CYAN_RULE}\n\n")
 
-    major_updates = []
-    minor_updates = []
-    patch_updates = []
-    new_packages = []
+    # Anything that is not major, minor or new is displayed and counted as a patch
+    buckets: dict[str, list[dict[str, Any]]] = {kind: [] for kind in _CHANGE_STYLES}
 
     for update in updates:
         change_type = update["change_type"]
-        pkg = update["package"]
-        old_v = update["old_version"] or "N/A"
-        new_v = update["new_version"]
-
-        if change_type == "major":
-            color = "red"
-            symbol = "⚠️ "
-            major_updates.append(update)
-        elif change_type == "minor":
-            color = "yellow"
-            symbol = "📦"
-            minor_updates.append(update)
-        elif change_type == "new":
-            color = "blue"
-            symbol = "✨"
-            new_packages.append(update)
-        else:
-            color = "green"
-            symbol = "🔧"
-            patch_updates.append(update)
+        kind = change_type if change_type in _CHANGE_STYLES else "patch"
+        symbol, color = _CHANGE_STYLES[kind]
+        buckets[kind].append(update)
 
-        click.echo(f"  {symbol} {click.style(pkg, fg=color)}: {old_v} → {new_v} ({change_type})")
+        pkg = click.style(update["package"], fg=color)
+        old_v = update["old_version"] or "N/A"
+        out.write(f"  {symbol} {pkg}: {old_v} → {update['new_version']} ({change_type})\n")
 
-    click.echo()
-    click.echo(
-        f"Summary: {len(major_updates)} major, {len(minor_updates)} minor, "
-        f"{len(patch_updates)} patch, {len(new_packages)} new"
+    out.write(
+        f"\nSummary: {len(buckets['major'])} major, {len(buckets['minor'])} minor, "
+        f"{len(buckets['patch'])} patch, {len(buckets['new'])} new\n"
     )
-    click.echo()
+    click.echo(out.getvalue())
 
     # Step 5: Breaking changes analysis
     if skip_analysis:
@@ -188,11 +216,11 @@ def sync(
 
     # Determine which packages to analyze
     if major_only:
-        packages_to_analyze = major_updates
+        packages_to_analyze = buckets["major"]
         click.echo(click.style("📋 Analyzing major version changes only (--major-only)", fg="cyan"))
     else:
         # Analyze major and minor updates (patch updates rarely have breaking changes)
-        packages_to_analyze = major_updates + minor_updates
+        packages_to_analyze = buckets["major"] + buckets["minor"]
         click.echo(click.style("📋 Analyzing major and minor version changes", fg="cyan"))
 
     if not packages_to_analyze:
@@ -204,86 +232,54 @@ def sync(
 
     # Load agent configuration
     cfg = load_config(config)
-    provider = cfg.get("underlying_provider", "openai")
-    provider_cfg = cfg.get("underlying_config", {})
-
-    if cfg.get("model") and "model" not in provider_cfg:
-        provider_cfg = dict(provider_cfg)
-        provider_cfg["model"] = cfg.get("model")
+    provider, provider_cfg = resolve_provider(cfg)
 
     # Initialize updater for changelog URLs and project files
     updater = DependencyUpdater(project_root)
-    project_files = [str(f) for f in updater.get_project_files()[:50]]
+    project_files = [str(f) for f in updater.get_project_files(limit=50)]
 
     click.echo("🤖 Analyzing breaking changes with AI agents...")
     click.echo()
 
-    # Create agent with multi-agent orchestration
-    agent = Agent(
-        name="dependency-sync-analyzer",
-        use_multi_agent=True,
-        provider_name=provider,
-        provider_config=provider_cfg,
-    )
-
-    # Run analysis for each package
+    # Packages are analyzed in batches, each with its own agent, so batches
+    # can run concurrently
     all_breaking_changes = []
     all_code_changes = []
+    ttl = 0 if no_cache else cache_ttl
+    batches = [
+        packages_to_analyze[i : i + batch_size]
+        for i in range(0, len(packages_to_analyze), batch_size)
+    ]
 
-    for update in packages_to_analyze:
-        pkg = update["package"]
-        old_v = update["old_version"]
-        new_v = update["new_version"]
-
-        click.echo(f"  Analyzing {click.style(pkg, fg='cyan')} ({old_v} → {new_v})...")
-
-        # Try to get changelog URL
-        changelog_url = updater.get_changelog_url(pkg, new_v)
-
-        # Prepare context
-        context = {
-            "package": pkg,
-            "current_version": old_v,
-            "target_version": new_v,
-            "project_root": str(project_root),
-            "project_files": project_files,
-            "changelog_url": changelog_url,
-        }
-
-        # Build task
-        task = _build_update_task(pkg, old_v, new_v)
-
-        # Add context to agent
-        agent.prepare(context)
-
-        # Run the analysis
-        result = agent.run_task(task)
-
-        if result.get("success"):
-            # Extract update plan
-            plan = _extract_update_plan(result.get("selected_suggestion", ""))
-            if plan:
-                # Add package info to each breaking change
-                for bc in plan.get("breaking_changes", []):
-                    all_breaking_changes.append({"package": pkg, "change": bc})
-
-                # Add package info to each code change
-                for cc in plan.get("code_changes", []):
-                    cc["package"] = pkg
-                    all_code_changes.append(cc)
-        else:
+    with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+        results = chain.from_iterable(
+            pool.map(
+                lambda batch: _analyze_batch(
+                    batch, updater, project_root, project_files, provider, provider_cfg, ttl
+                ),
+                batches,
+            )
+        )
+        for update, (breaking_changes, code_changes, error) in zip(
+            packages_to_analyze, results, strict=True
+        ):
+            pkg = update["package"]
             click.echo(
-                click.style(
-                    f"    ⚠️  Analysis failed: {result.get('output', 'Unknown error')}", fg="yellow"
-                )
+                f"  Analyzing {click.style(pkg, fg='cyan')} "
+                f"({update['old_version']} → {update['new_version']})..."
             )
+            if error is not None:
+                click.echo(click.style(f"    ⚠️  Analysis failed: {error}", fg="yellow"))
+                continue
+            all_breaking_changes.extend({"package": pkg, "change": bc} for bc in breaking_changes)
+            all_code_changes.extend(code_changes)
 
     click.echo()
 
     # Display aggregated results
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo(click.style("BREAKING CHANGES ANALYSIS", fg="cyan", bold=True))
-    click.echo(click.style("=" * 70, fg="cyan"))
+    click.echo(_CYAN_RULE)
+    click.echo(_BREAKING_HEADING)
+    click.echo(_CYAN_RULE)
     click.echo()
 
     if all_breaking_changes:
@@ -327,7 +323,14 @@ def sync(
 
         # Ask for confirmation to apply
         if click.confirm("Apply these code changes?"):
-            applied = _apply_code_changes(all_code_changes, project_root, agent, cfg)
+            applied = _apply_code_changes(
+                all_code_changes,
+                project_root,
+                lambda: _new_agent(provider, provider_cfg),
+                cfg,
+                cache_ttl=ttl,
+                workers=workers,
+            )
             if applied:
                 click.echo(click.style(f"✅ Applied {applied} code change(s)", fg="green"))
             else:
@@ -344,6 +347,179 @@ def sync(
     click.echo("  3. Commit if everything looks good")
 
 
+def _new_agent(provider: str, provider_cfg: dict[str, Any]) -> Agent:
+    """Create the multi-agent analyzer used by sync."""
+    return Agent(
+        name="dependency-sync-analyzer",
+        use_multi_agent=True,
+        provider_name=provider,
+        provider_config=provider_cfg,
+    )
+
+
+def _analyze_batch(
+    updates: list[dict[str, Any]],
+    updater: DependencyUpdater,
+    project_root: Path,
+    project_files: list[str],
+    provider: str,
+    provider_cfg: dict[str, Any],
+    cache_ttl: float = 0,
+) -> list[tuple[list[Any], list[dict[str, Any]], str | None]]:
+    """Analyze several package updates with a single agent request.
+
+    Packages whose plan is missing or malformed in the combined answer, for
+    example because it was truncated, are analyzed again on their own.
+
+    Args:
+        updates: Update entries with package, old_version and new_version
+        updater: Dependency updater used to look up changelog URLs
+        project_root: Root directory of the project
+        project_files: Project file paths passed to the agents as context
+        provider: LLM provider name
+        provider_cfg: Provider configuration
+        cache_ttl: Seconds to reuse a cached result for identical inputs (0 disables)
+
+    Returns:
+        One ``_analyze_package`` style result per update, in input order
+    """
+    if len(updates) == 1:
+        return [
+            _analyze_package(
+                updates[0], updater, project_root, project_files, provider, provider_cfg, cache_ttl
+            )
+        ]
+
+    agent = _new_agent(provider, provider_cfg)
+    context = {
+        "packages": [
+            {
+                "package": update["package"],
+                "current_version": update["old_version"],
+                "target_version": update["new_version"],
+                "changelog_url": updater.get_changelog_url(
+                    update["package"], update["new_version"]
+                ),
+            }
+            for update in updates
+        ],
+        "project_root": str(project_root),
+        "project_files": project_files,
+    }
+    agent.prepare(context)
+
+    result = cached_run_task(
+        agent,
+        _build_batch_update_task(updates),
+        context,
+        provider=provider,
+        model=str(provider_cfg.get("model", "")),
+        ttl=cache_ttl,
+    )
+
+    plans: dict[str, dict[str, Any]] = {}
+    if result.get("success"):
+        batch_plan = extract_plan(result.get("selected_suggestion", ""), "UPDATE_PLANS:")
+        entries = batch_plan.get("plans") if batch_plan else None
+        if isinstance(entries, list):
+            for entry in entries:
+                if _is_valid_batch_entry(entry):
+                    plans[entry["package"].lower()] = entry
+
+    results = []
+    for update in updates:
+        plan = plans.get(update["package"].lower())
+        if plan is None:
+            results.append(
+                _analyze_package(
+                    update, updater, project_root, project_files, provider, provider_cfg, cache_ttl
+                )
+            )
+        else:
+            results.append(_plan_entries(update["package"], plan))
+    return results
+
+
+def _is_valid_batch_entry(entry: Any) -> bool:
+    """Return True if a batched plan entry has the expected shape."""
+    if not isinstance(entry, dict) or not isinstance(entry.get("package"), str):
+        return False
+    code_changes = entry.get("code_changes", [])
+    return (
+        isinstance(entry.get("breaking_changes", []), list)
+        and isinstance(code_changes, list)
+        and all(isinstance(cc, dict) for cc in code_changes)
+    )
+
+
+def _plan_entries(
+    package: str, plan: dict[str, Any]
+) -> tuple[list[Any], list[dict[str, Any]], None]:
+    """Return the breaking changes and package-tagged code changes of a plan."""
+    code_changes = [{**cc, "package": package} for cc in plan.get("code_changes", [])]
+    return list(plan.get("breaking_changes", [])), code_changes, None
+
+
+def _analyze_package(
+    update: dict[str, Any],
+    updater: DependencyUpdater,
+    project_root: Path,
+    project_files: list[str],
+    provider: str,
+    provider_cfg: dict[str, Any],
+    cache_ttl: float = 0,
+) -> tuple[list[Any], list[dict[str, Any]], str | None]:
+    """Analyze one package update for breaking changes.
+
+    A fresh agent is created per package because ``Agent.prepare`` stores the
+    context on the instance, so a shared agent cannot serve concurrent calls.
+
+    Args:
+        update: Update entry with package, old_version and new_version
+        updater: Dependency updater used to look up changelog URLs
+        project_root: Root directory of the project
+        project_files: Project file paths passed to the agents as context
+        provider: LLM provider name
+        provider_cfg: Provider configuration
+        cache_ttl: Seconds to reuse a cached result for identical inputs (0 disables)
+
+    Returns:
+        Tuple of (breaking_changes, code_changes, error); error is None on
+        success and each code change is tagged with its package
+    """
+    pkg = update["package"]
+    old_v = update["old_version"]
+    new_v = update["new_version"]
+
+    agent = _new_agent(provider, provider_cfg)
+    context = {
+        "package": pkg,
+        "current_version": old_v,
+        "target_version": new_v,
+        "project_root": str(project_root),
+        "project_files": project_files,
+        "changelog_url": updater.get_changelog_url(pkg, new_v),
+    }
+    agent.prepare(context)
+
+    result = cached_run_task(
+        agent,
+        _build_update_task(pkg, old_v, new_v),
+        context,
+        provider=provider,
+        model=str(provider_cfg.get("model", "")),
+        ttl=cache_ttl,
+    )
+    if not result.get("success"):
+        return [], [], result.get("output", "Unknown error")
+
+    plan = _extract_update_plan(result.get("selected_suggestion", ""))
+    if not plan:
+        return [], [], None
+
+    return _plan_entries(pkg, plan)
+
+
 def _build_update_task(package: str, current_version: str, target_version: str) -> str:
     """Build the task description for AI agents."""
     return f"""You are analyzing the dependency '{package}' update from {current_version} to {target_version}.
@@ -388,56 +564,184 @@ If NO breaking changes or code changes are needed, use empty arrays:
 Provide this JSON block AFTER your explanation."""
 
 
+def _build_batch_update_task(updates: list[dict[str, Any]]) -> str:
+    """Build the task description for analyzing several package updates at once."""
+    packages = "\n".join(
+        f"- '{u['package']}' from {u['old_version']} to {u['new_version']}" for u in updates
+    )
+    return f"""You are analyzing the following dependency updates:
+
+{packages}
+
+For EACH package, your task is to identify:
+
+1. Any breaking API changes between these versions
+2. ONLY the minimal code changes required for API compatibility
+3. Specific file paths and change descriptions
+
+CRITICAL REQUIREMENTS:
+- Identify ONLY changes required for API compatibility
+- Do NOT suggest refactoring or improvements
+- Do NOT suggest adding new features
+- Do NOT suggest style or formatting changes
+- Be extremely conservative with suggestions
+
+RESPONSE FORMAT (required):
+
+Your response MUST include this structured section at the END, with one
+entry per package listed above:
+
+UPDATE_PLANS:
+{{
+    "plans": [
+        {{
+            "package": "package-name",
+            "version_spec": ">=target_version",
+            "breaking_changes": [
+                "Description of breaking change 1"
+            ],
+            "code_changes": [
+                {{
+                    "file": "src/module/file.py",
+                    "line_range": "45-50",
+                    "description": "Replace deprecated method X with Y",
+                    "reason": "Method X was removed in the target version"
+                }}
+            ]
+        }}
+    ]
+}}
+
+If a package needs NO breaking changes or code changes, still include its
+entry with empty arrays: "breaking_changes": [], "code_changes": []
+
+Provide this JSON block AFTER your explanation."""
+
+
 def _extract_update_plan(suggestion: str) -> dict[str, Any] | None:
     """Extract structured update plan from agent suggestion."""
-    if "UPDATE_PLAN:" not in suggestion:
-        return None
+    return extract_plan(suggestion, "UPDATE_PLAN:")
 
-    try:
-        plan_part = suggestion.split("UPDATE_PLAN:")[1].strip()
-
-        # Find the JSON object
-        start = plan_part.find("{")
-        end = plan_part.rfind("}") + 1
 
-        if start == -1 or end == 0:
-            return None
+def _code_window(content: str, line_range: Any) -> tuple[int, int, str] | None:
+    """Return the lines around a ``"start-end"`` range, with some context.
 
-        json_str = plan_part[start:end]
-        plan_data = json.loads(json_str)
+    Returns:
+        Tuple of (first_line, last_line, text) using 1-based line numbers, or
+        None if the range is missing or cannot be parsed
+    """
+    match = _LINE_RANGE_RE.match(str(line_range or ""))
+    if not match:
+        return None
+    start = int(match.group(1))
+    end = int(match.group(2) or start)
+    if start < 1 or end < start:
+        return None
 
-        return plan_data
-    except (json.JSONDecodeError, IndexError):
+    lines = content.splitlines()
+    first = max(1, start - _CONTEXT_LINES)
+    last = min(len(lines), end + _CONTEXT_LINES)
+    if first > last:
         return None
+    return first, last, "\n".join(lines[first - 1 : last])
 
 
 def _apply_code_changes(
-    code_changes: list[dict[str, Any]], project_root: Path, agent: Agent, config: dict
+    code_changes: list[dict[str, Any]],
+    project_root: Path,
+    make_agent: Callable[[], Agent],
+    config: dict,
+    cache_ttl: float = 0,
+    workers: int = _DEFAULT_ANALYSIS_WORKERS,
 ) -> int:
     """Apply code changes with AI assistance.
 
+    Changes are grouped by file. Files are handled concurrently, each with
+    its own agent, while changes to the same file run one after another.
+
+    Args:
+        code_changes: Code changes from the update plans
+        project_root: Root directory of the project
+        make_agent: Factory returning the agent used for one file's changes
+        config: Loaded hatch-agent configuration
+        cache_ttl: Seconds to reuse a cached result for identical inputs (0 disables)
+        workers: Maximum number of files handled at once
+
     Returns:
         Number of changes applied
     """
     if not code_changes:
         return 0
 
-    applied = 0
+    provider, provider_cfg = resolve_provider(config)
+    model = str(provider_cfg.get("model", ""))
 
+    by_file: dict[Path, list[dict[str, Any]]] = {}
     for change in code_changes:
-        file_path = project_root / change.get("file", "")
+        by_file.setdefault(project_root / change.get("file", ""), []).append(change)
 
-        if not file_path.exists():
-            click.echo(click.style(f"⚠️  File not found: {file_path}", fg="yellow"))
-            continue
+    def apply_file(item: tuple[Path, list[dict[str, Any]]]) -> tuple[int, list[str]]:
+        file_path, changes = item
+        return _apply_file_changes(file_path, changes, make_agent, provider, model, cache_ttl)
 
-        # Read current file content
-        try:
-            with open(file_path, encoding="utf-8") as f:
-                original_content = f.read()
-        except Exception as e:
-            click.echo(click.style(f"⚠️  Could not read {file_path}: {e}", fg="yellow"))
-            continue
+    applied = 0
+    with ThreadPoolExecutor(max_workers=min(workers, len(by_file))) as pool:
+        # Messages are echoed here, in file order, so output stays deterministic
+        for file_applied, messages in pool.map(apply_file, by_file.items()):
+            for message in messages:
+                click.echo(message)
+            applied += file_applied
+
+    return applied
+
+
+def _apply_file_changes(
+    file_path: Path,
+    changes: list[dict[str, Any]],
+    make_agent: Callable[[], Agent],
+    provider: str,
+    model: str,
+    cache_ttl: float,
+) -> tuple[int, list[str]]:
+    """Generate every change planned for one file.
+
+    Args:
+        file_path: File the changes target
+        changes: Changes for this file, in plan order
+        make_agent: Factory returning the agent used for these changes
+        provider: LLM provider name
+        model: Model name
+        cache_ttl: Seconds to reuse a cached result for identical inputs (0 disables)
+
+    Returns:
+        Tuple of (number of changes generated, messages to display)
+    """
+    if not file_path.exists():
+        message = click.style(f"⚠️  File not found: {file_path}", fg="yellow")
+        return 0, [message] * len(changes)
+
+    try:
+        original_content = file_path.read_text(encoding="utf-8")
+    except Exception as e:
+        return 0, [click.style(f"⚠️  Could not read {file_path}: {e}", fg="yellow")]
+
+    agent = make_agent()
+    applied = 0
+    messages: list[str] = []
+
+    for change in changes:
+        # Only send the lines around the change when the plan names a range
+        window = _code_window(original_content, change.get("line_range"))
+        if window is None:
+            code_heading = "Original code:"
+            code = original_content
+            return_instruction = "Return the COMPLETE modified file content"
+            closing = "Return the full file content with only the necessary change applied."
+        else:
+            first, last, code = window
+            code_heading = f"Original code (lines {first}-{last}):"
+            return_instruction = f"Return ONLY the modified lines {first}-{last}"
+            closing = "Return just those lines with only the necessary change applied."
 
         # Ask AI to generate the specific change
         change_task = f"""Apply this specific code change:
@@ -448,9 +752,9 @@ Change needed: {change.get("description")}
 Reason: {change.get("reason")}
 Package: {change.get("package", "unknown")}
 
-Original code:
+{code_heading}
 ```
-{original_content}
+{code}
 ```
 
 STRICT REQUIREMENTS:
@@ -458,19 +762,23 @@ STRICT REQUIREMENTS:
 2. Do NOT modify any other code
 3. Do NOT refactor or improve code
 4. Preserve all formatting and style
-5. Return the COMPLETE modified file content
+5. {return_instruction}
 
-Return the full file content with only the necessary change applied."""
+{closing}"""
 
-        result = agent.run_task(change_task)
+        result = cached_run_task(
+            agent, change_task, None, provider=provider, model=model, ttl=cache_ttl
+        )
 
         if result.get("success"):
-            click.echo(click.style(f"📄 Generated changes for: {file_path}", fg="blue"))
+            messages.append(click.style(f"📄 Generated changes for: {file_path}", fg="blue"))
             applied += 1
         else:
-            click.echo(click.style(f"⚠️  Could not generate changes for: {file_path}", fg="yellow"))
+            messages.append(
+                click.style(f"⚠️  Could not generate changes for: {file_path}", fg="yellow")
+            )
 
-    return applied
+    return applied, messages
 
 
 if __name__ == "__main__":
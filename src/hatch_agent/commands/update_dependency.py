@@ -1,13 +1,28 @@
 """CLI command for updating dependencies and adapting code to API changes."""
 
-import json
+import io
 from pathlib import Path
 
 import click
 
 from hatch_agent.agent.core import Agent
+from hatch_agent.agent.plan import extract_plan
 from hatch_agent.analyzers.updater import DependencyUpdater
-from hatch_agent.config import load_config
+from hatch_agent.cache.exact import DEFAULT_TTL, cached_run_task
+from hatch_agent.config import load_config, resolve_provider
+
+_CYAN_RULE = click.style("=" * 70, fg="cyan")
+_YELLOW_RULE = click.style("=" * 70, fg="yellow")
+_STRATEGY_HEADING = click.style("UPDATE STRATEGY", fg="cyan", bold=True)
+_ALL_SUGGESTIONS_HEADING = click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True)
+_NEXT_STEPS = (
+    "\n"
+    + click.style("🎉 Dependency update complete!", fg="green", bold=True)
+    + "\n\nRecommended next steps:\n"
+    "  1. Run your tests: hatch run test\n"
+    "  2. Review the changes: git diff\n"
+    "  3. Commit if everything looks good"
+)
 
 
 @click.command()
@@ -35,6 +50,14 @@ from hatch_agent.config import load_config
 @click.option(
     "--no-code-changes", is_flag=True, help="Only update pyproject.toml, do not modify code"
 )
+@click.option("--no-cache", is_flag=True, help="Always query the agents, ignoring cached results")
+@click.option(
+    "--cache-ttl",
+    type=click.IntRange(min=0),
+    default=DEFAULT_TTL,
+    show_default=True,
+    help="Seconds to reuse a cached result for identical inputs (0 disables caching)",
+)
 def update_dep(
     package: str,
     version: str,
@@ -44,6 +67,8 @@ def update_dep(
     show_all: bool,
     skip_sync: bool,
     no_code_changes: bool,
+    no_cache: bool,
+    cache_ttl: int,
 ):
     """Update a dependency and adapt code to API changes.
 
@@ -59,6 +84,8 @@ def update_dep(
       hatch-agent update-dep pydantic --version ">=2.0.0"
 
       hatch-agent update-dep django --version 5.0.0 --dry-run
+
+      hatch-agent update-dep requests --no-cache
     """
     click.echo(f"📦 Updating package: {click.style(package, fg='cyan')}")
 
@@ -66,6 +93,7 @@ def update_dep(
     updater = DependencyUpdater(project_root)
 
     # If version is 'latest', fetch from PyPI
+    latest = None
     if version == "latest":
         click.echo("🔍 Fetching latest version from PyPI...")
         latest = updater.get_latest_version(package)
@@ -92,8 +120,11 @@ def update_dep(
             return
         current_version = "not installed"
 
-    # Try to get changelog URL
-    changelog_url = updater.get_changelog_url(package, version.lstrip(">="))
+    # Try to get changelog URL; for the latest release this reuses the PyPI
+    # metadata get_latest_version just cached instead of fetching it again
+    changelog_url = updater.get_changelog_url(
+        package, latest or version.lstrip(">="), latest=bool(latest)
+    )
     if changelog_url:
         click.echo(f"📝 Changelog: {click.style(changelog_url, fg='blue')}")
 
@@ -105,7 +136,7 @@ def update_dep(
         "current_version": current_version,
         "target_version": version,
         "project_root": str(project_root or Path.cwd()),
-        "project_files": [str(f) for f in updater.get_project_files()[:50]],  # Limit for context
+        "project_files": [str(f) for f in updater.get_project_files(limit=50)],  # Limit for context
     }
 
     # Build task for AI agents
@@ -113,13 +144,7 @@ def update_dep(
 
     # Load agent configuration
     cfg = load_config(config)
-    provider = cfg.get("underlying_provider", "openai")
-    provider_cfg = cfg.get("underlying_config", {})
-
-    # Ensure model is set
-    if cfg.get("model") and "model" not in provider_cfg:
-        provider_cfg = dict(provider_cfg)
-        provider_cfg["model"] = cfg.get("model")
+    provider, provider_cfg = resolve_provider(cfg)
 
     click.echo("🤖 Consulting AI agents for update strategy...")
     click.echo()
@@ -132,42 +157,48 @@ def update_dep(
         provider_config=provider_cfg,
     )
 
-    # Add context to agent
-    agent.prepare(context)
-
-    # Run the analysis
-    result = agent.run_task(task)
+    # Run the analysis; a dry run followed by the real run reuses the strategy,
+    # and the context is only handed to the agent when it actually runs
+    result = cached_run_task(
+        agent,
+        task,
+        context,
+        provider=provider,
+        model=str(provider_cfg.get("model", "")),
+        ttl=cache_ttl,
+        enabled=not no_cache,
+        prepare=lambda: agent.prepare(context),
+    )
 
     if not result.get("success"):
         click.echo(click.style("❌ Analysis failed:", fg="red"))
         click.echo(result.get("output", "Unknown error"))
         raise click.Abort()
 
-    # Display the recommendation
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo(click.style("UPDATE STRATEGY", fg="cyan", bold=True))
-    click.echo(click.style("=" * 70, fg="cyan"))
-    click.echo()
-    click.echo(result.get("selected_suggestion", ""))
-    click.echo()
-    click.echo(click.style(f"Selected from: {result.get('selected_agent', 'N/A')}", fg="blue"))
-    click.echo(click.style("Reasoning:", fg="blue"))
-    click.echo(result.get("reasoning", "N/A"))
+    if result.get("cached"):
+        click.echo(click.style("Using cached result (run with --no-cache to refresh)", fg="blue"))
+        click.echo()
+
+    # Display the recommendation, written with a single echo
+    out = io.StringIO()
+    out.write(f"{_CYAN_RULE}\n{_STRATEGY_HEADING}\n{_CYAN_RULE}\n\n")
+    out.write(f"{result.get('selected_suggestion', '')}\n\n")
+    out.write(
+        click.style(f"Selected from: {result.get('selected_agent', 'N/A')}", fg="blue") + "\n"
+    )
+    out.write(click.style("Reasoning:", fg="blue") + "\n")
+    out.write(f"{result.get('reasoning', 'N/A')}\n")
 
     # Show all suggestions if requested
     if show_all and "all_suggestions" in result:
-        click.echo()
-        click.echo(click.style("=" * 70, fg="yellow"))
-        click.echo(click.style("ALL AGENT SUGGESTIONS", fg="yellow", bold=True))
-        click.echo(click.style("=" * 70, fg="yellow"))
+        out.write(f"\n{_YELLOW_RULE}\n{_ALL_SUGGESTIONS_HEADING}\n{_YELLOW_RULE}\n")
 
         for i, sug in enumerate(result["all_suggestions"], 1):
-            click.echo()
-            click.echo(click.style(f"{i}. {sug['agent']}", fg="yellow", bold=True))
-            click.echo(click.style(f"   Confidence: {sug['confidence']:.2f}", fg="yellow"))
-            click.echo(f"   Suggestion: {sug['suggestion']}")
+            out.write("\n" + click.style(f"{i}. {sug['agent']}", fg="yellow", bold=True) + "\n")
+            out.write(click.style(f"   Confidence: {sug['confidence']:.2f}", fg="yellow") + "\n")
+            out.write(f"   Suggestion: {sug['suggestion']}\n")
 
-    click.echo()
+    click.echo(out.getvalue())
 
     # Parse structured update plan
     update_plan = _extract_update_plan(result.get("selected_suggestion", ""))
@@ -178,23 +209,26 @@ def update_dep(
         return
 
     # Show what will be done
-    click.echo(click.style("📝 Proposed changes:", fg="green", bold=True))
-    click.echo(f"  Package: {package}")
-    click.echo(f"  Version update: {update_plan.get('version_spec', version)}")
+    out = io.StringIO()
+    out.write(click.style("📝 Proposed changes:", fg="green", bold=True) + "\n")
+    out.write(f"  Package: {package}\n")
+    out.write(f"  Version update: {update_plan.get('version_spec', version)}\n")
 
     if update_plan.get("breaking_changes"):
-        click.echo(f"  Breaking changes detected: {click.style('Yes', fg='red')}")
+        out.write(f"  Breaking changes detected: {click.style('Yes', fg='red')}\n")
         for change in update_plan.get("breaking_changes", []):
-            click.echo(f"    - {change}")
+            out.write(f"    - {change}\n")
     else:
-        click.echo(f"  Breaking changes detected: {click.style('No', fg='green')}")
+        out.write(f"  Breaking changes detected: {click.style('No', fg='green')}\n")
 
     if update_plan.get("code_changes") and not no_code_changes:
-        click.echo(f"  Code changes required: {len(update_plan.get('code_changes', []))}")
+        out.write(f"  Code changes required: {len(update_plan.get('code_changes', []))}\n")
         for change in update_plan.get("code_changes", []):
-            click.echo(f"    - {change.get('file', 'unknown')}: {change.get('description', 'N/A')}")
+            out.write(
+                f"    - {change.get('file', 'unknown')}: {change.get('description', 'N/A')}\n"
+            )
 
-    click.echo()
+    click.echo(out.getvalue())
 
     if dry_run:
         click.echo(click.style("🔍 DRY RUN - No changes will be made", fg="yellow"))
@@ -234,7 +268,7 @@ def update_dep(
         click.echo()
         click.echo("🔄 Syncing Hatch environment...")
 
-        sync_result = updater.sync_environment()
+        sync_result = updater.sync_environment(changed_packages=[(package, version_spec)])
 
         if sync_result.get("success"):
             click.echo(click.style("✅ Environment synced successfully", fg="green"))
@@ -250,6 +284,10 @@ def update_dep(
         click.echo()
         click.echo("🔧 Applying code changes for API compatibility...")
 
+        # A cached strategy never ran the agent, so it has no context yet
+        if result.get("cached"):
+            agent.prepare(context)
+
         code_changes_applied = _apply_code_changes(
             update_plan.get("code_changes", []), project_root or Path.cwd(), agent, cfg
         )
@@ -259,13 +297,7 @@ def update_dep(
         else:
             click.echo(click.style("⚠️  No code changes were applied", fg="yellow"))
 
-    click.echo()
-    click.echo(click.style("🎉 Dependency update complete!", fg="green", bold=True))
-    click.echo()
-    click.echo("Recommended next steps:")
-    click.echo("  1. Run your tests: hatch run test")
-    click.echo("  2. Review the changes: git diff")
-    click.echo("  3. Commit if everything looks good")
+    click.echo(_NEXT_STEPS)
 
 
 def _build_update_task(package: str, current_version: str, target_version: str) -> str:
@@ -314,25 +346,7 @@ Provide this JSON block AFTER your explanation."""
 
 def _extract_update_plan(suggestion: str) -> dict:
     """Extract structured update plan from agent suggestion."""
-    if "UPDATE_PLAN:" not in suggestion:
-        return None
-
-    try:
-        plan_part = suggestion.split("UPDATE_PLAN:")[1].strip()
-
-        # Find the JSON object
-        start = plan_part.find("{")
-        end = plan_part.rfind("}") + 1
-
-        if start == -1 or end == 0:
-            return None
-
-        json_str = plan_part[start:end]
-        plan_data = json.loads(json_str)
-
-        return plan_data
-    except (json.JSONDecodeError, IndexError):
-        return None
+    return extract_plan(suggestion, "UPDATE_PLAN:")
 
 
 def _apply_code_changes(code_changes: list, project_root: Path, agent: Agent, config: dict) -> int:
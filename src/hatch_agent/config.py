@@ -7,10 +7,15 @@ The configuration is stored in TOML format and describes which provider
 and model to use for LLM calls as well as provider-specific credentials.
 """
 
+import copy
 import os
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
-# Prefer stdlib tomllib (py3.11+) then tomli; tomli_w for writing when available
+import tomli_w
+
+# Prefer stdlib tomllib (py3.11+) then tomli
 try:
     import tomllib as _toml_loader  # type: ignore
 except Exception:
@@ -19,11 +24,6 @@ except Exception:
     except Exception:  # pragma: no cover - runtime will surface missing dependency
         _toml_loader = None
 
-try:
-    import tomli_w as _toml_writer  # type: ignore
-except Exception:
-    _toml_writer = None
-
 
 DEFAULT_CONFIG = {
     "provider": "mock",
@@ -36,7 +36,7 @@ DEFAULT_CONFIG = {
 }
 
 # Provider-specific configuration templates for the config wizard
-PROVIDER_TEMPLATES: dict[str, Any] = {
+_TEMPLATES: dict[str, dict[str, Any]] = {
     "openai": {
         "underlying_provider": "openai",
         "model": "gpt-4",
@@ -86,6 +86,30 @@ PROVIDER_TEMPLATES: dict[str, Any] = {
     },
 }
 
+# Read-only views so callers cannot mutate the shared templates; use
+# materialize_template() to get an editable copy
+PROVIDER_TEMPLATES: Mapping[str, Mapping[str, Any]] = MappingProxyType(
+    {
+        name: MappingProxyType(
+            {**template, "underlying_config": MappingProxyType(template["underlying_config"])}
+        )
+        for name, template in _TEMPLATES.items()
+    }
+)
+
+
+def materialize_template(name: str) -> dict[str, Any]:
+    """Return an editable copy of a provider template.
+
+    Args:
+        name: Provider name, a key of ``PROVIDER_TEMPLATES``
+
+    Returns:
+        Config dict whose ``underlying_config`` is independent of the template
+    """
+    template = PROVIDER_TEMPLATES[name]
+    return {**template, "underlying_config": dict(template["underlying_config"])}
+
 
 def get_config_dir() -> str:
     xdg = os.environ.get("XDG_CONFIG_HOME")
@@ -94,84 +118,94 @@ def get_config_dir() -> str:
     return os.path.join(os.path.expanduser("~"), ".config", "hatch-agent")
 
 
+def get_cache_dir() -> str:
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    if xdg:
+        return os.path.join(xdg, "hatch-agent")
+    return os.path.join(os.path.expanduser("~"), ".cache", "hatch-agent")
+
+
 def get_config_path() -> str:
     return os.path.join(get_config_dir(), "config.toml")
 
 
+# Parsed config files keyed on path -> ((mtime_ns, size), parsed dict)
+_config_cache: dict[str, tuple[tuple[int, int], dict[str, Any]]] = {}
+_CONFIG_CACHE_SIZE = 4
+
+
+def _normalize_provider_config(cfg: dict[str, Any]) -> dict[str, Any]:
+    """Give ``cfg`` an ``underlying_config`` table that includes the model.
+
+    A top-level ``model`` is copied into ``underlying_config`` unless that
+    table already names one, so callers can read provider settings directly.
+    """
+    provider_cfg = dict(cfg.get("underlying_config") or {})
+    if cfg.get("model") and "model" not in provider_cfg:
+        provider_cfg["model"] = cfg["model"]
+    cfg["underlying_config"] = provider_cfg
+    return cfg
+
+
 def load_config(path: str | None = None) -> dict[str, Any]:
-    path = path or get_config_path()
+    """Load the TOML configuration, re-parsing only when the file changes.
+
+    The result is normalized so ``underlying_config`` always exists and
+    carries the model. Each call returns a fresh copy, so callers may mutate
+    the result freely.
+    """
+    path = os.fspath(path or get_config_path())
     try:
-        with open(path, "rb") as f:
-            if _toml_loader is None:
-                raise RuntimeError("tomllib (stdlib) or tomli is required to read TOML config")
-            return _toml_loader.load(f)
+        st = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+        cached = _config_cache.get(path)
+        if cached is None or cached[0] != key:
+            with open(path, "rb") as f:
+                if _toml_loader is None:
+                    raise RuntimeError("tomllib (stdlib) or tomli is required to read TOML config")
+                cached = (key, _normalize_provider_config(_toml_loader.load(f)))
+            if path not in _config_cache and len(_config_cache) >= _CONFIG_CACHE_SIZE:
+                del _config_cache[next(iter(_config_cache))]
+            _config_cache[path] = cached
+        return copy.deepcopy(cached[1])
     except FileNotFoundError:
-        return DEFAULT_CONFIG.copy()
+        return _normalize_provider_config(copy.deepcopy(DEFAULT_CONFIG))
 
 
-def _simple_toml_dumps(obj: dict[str, Any]) -> str:
-    """A tiny TOML serializer sufficient for DEFAULT_CONFIG-like dicts.
+def resolve_provider(cfg: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    """Return the underlying provider name and its config from a config dict.
 
-    This is intentionally minimal and not a full TOML implementation.
+    Configs from ``load_config`` are already normalized and are returned
+    as-is; for dicts built elsewhere a top-level ``model`` is folded into the
+    provider config unless it already names one. The input is never modified.
     """
-    lines = []
-
-    def emit_section(prefix: str, mapping: dict[str, Any]):
-        for k, v in mapping.items():
-            if isinstance(v, dict):
-                # nested table
-                section = f"[{prefix}.{k}]" if prefix else f"[{k}]"
-                lines.append(section)
-                for kk, vv in v.items():
-                    if isinstance(vv, str):
-                        lines.append(f'{kk} = "{vv}"')
-                    elif isinstance(vv, bool):
-                        lines.append(f"{kk} = {str(vv).lower()}")
-                    else:
-                        lines.append(f"{kk} = {vv}")
-                lines.append("")
-            else:
-                if isinstance(v, str):
-                    lines.append(f'{k} = "{v}"')
-                elif isinstance(v, bool):
-                    lines.append(f"{k} = {str(v).lower()}")
-                elif isinstance(v, list):
-                    items = ", ".join(f'"{x}"' for x in v)
-                    lines.append(f"{k} = [{items}]")
-                else:
-                    lines.append(f"{k} = {v}")
-
-    # top-level simple keys
-    top = {k: v for k, v in obj.items() if not isinstance(v, dict)}
-    emit_section("", top)
-    # nested tables
-    for k, v in obj.items():
-        if isinstance(v, dict):
-            lines.append(f"[{k}]")
-            for kk, vv in v.items():
-                if isinstance(vv, str):
-                    lines.append(f'{kk} = "{vv}"')
-                elif isinstance(vv, bool):
-                    lines.append(f"{kk} = {str(vv).lower()}")
-                else:
-                    lines.append(f"{kk} = {vv}")
-            lines.append("")
-
-    return "\n".join(lines)
+    provider = cfg.get("underlying_provider", "openai")
+    provider_cfg = cfg.get("underlying_config", {})
+    if cfg.get("model") and "model" not in provider_cfg:
+        provider_cfg = {**provider_cfg, "model": cfg["model"]}
+    return provider, provider_cfg
 
 
 def write_config(config: dict[str, Any], path: str | None = None) -> bool:
-    path = path or get_config_path()
+    path = os.fspath(path or get_config_path())
+    _config_cache.pop(path, None)
     d = os.path.dirname(path)
     os.makedirs(d, exist_ok=True)
     try:
-        if _toml_writer is not None:
-            with open(path, "wb") as f:
-                f.write(_toml_writer.dumps(config).encode("utf-8"))
-            return True
-        # Fallback to simple serializer
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(_simple_toml_dumps(config))
+        with open(path, "wb") as f:
+            tomli_w.dump(config, f)
         return True
     except Exception:
         return False
+
+
+def generate_default_config(path: str | None = None) -> bool:
+    """Write the default configuration to disk.
+
+    Args:
+        path: Destination file (defaults to the XDG config path)
+
+    Returns:
+        True if the file was written, False otherwise
+    """
+    return write_config(copy.deepcopy(DEFAULT_CONFIG), path or get_config_path())
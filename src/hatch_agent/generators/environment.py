@@ -3,6 +3,30 @@
 import json
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
+
+
+def _encode(data: Any) -> bytes:
+    """Serialize ``data`` exactly as ``json.dumps(data, indent=2)`` would.
+
+    orjson is used when it is installed and its output is the same: data
+    with non-str keys, integers wider than 64 bits or non-ASCII text (which
+    the stdlib escapes) goes through the stdlib encoder instead. Floats in
+    exponent notation are the one difference left (``1e20`` vs ``1e+20``).
+    """
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+        else:
+            if encoded.isascii():
+                return encoded
+    return json.dumps(data, indent=2).encode("utf-8")
+
 
 def generate_environment(metadata: dict[str, Any], out_path: str) -> bool:
     """Generate a small environment JSON file from project metadata.
@@ -10,8 +34,8 @@ def generate_environment(metadata: dict[str, Any], out_path: str) -> bool:
     Returns True on success.
     """
     try:
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump({"generated_from": metadata}, f, indent=2)
+        with open(out_path, "wb") as f:
+            f.write(_encode({"generated_from": metadata}))
         return True
     except Exception:
         return False
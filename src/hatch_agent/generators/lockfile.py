@@ -3,19 +3,44 @@
 import json
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
+
+
+def _encode(data: Any) -> bytes:
+    """Serialize ``data`` exactly as ``json.dumps(data, indent=2)`` would.
+
+    orjson is used when it is installed and its output is the same: data
+    with non-str keys, integers wider than 64 bits or non-ASCII text (which
+    the stdlib escapes) goes through the stdlib encoder instead. Floats in
+    exponent notation are the one difference left (``1e20`` vs ``1e+20``).
+    """
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+        else:
+            if encoded.isascii():
+                return encoded
+    return json.dumps(data, indent=2).encode("utf-8")
+
 
 def read_lockfile(path: str) -> dict[str, Any]:
     try:
-        with open(path, encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            content = f.read()
     except FileNotFoundError:
         return {}
+    return orjson.loads(content) if orjson is not None else json.loads(content)
 
 
 def write_lockfile(path: str, data: dict[str, Any]) -> bool:
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        with open(path, "wb") as f:
+            f.write(_encode(data))
         return True
     except Exception:
         return False
@@ -1,5 +1,6 @@
 """Tests for core agent functionality."""
 
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -141,6 +142,25 @@ class TestAgentRunTask:
         assert "Execute test" in result["output"]
 
 
+class TestAgentArunTask:
+    """Test Agent.arun_task."""
+
+    def test_arun_task_matches_run_task(self):
+        """Test that the async wrapper returns the synchronous result."""
+        agent = Agent(name="test")
+        assert asyncio.run(agent.arun_task("build")) == agent.run_task("build")
+
+    def test_arun_task_gathers_agents(self):
+        """Test that several agents can be awaited together."""
+        agents = [Agent(name=f"agent-{i}") for i in range(3)]
+
+        async def run_all():
+            return await asyncio.gather(*(a.arun_task("lint") for a in agents))
+
+        results = asyncio.run(run_all())
+        assert [r["success"] for r in results] == [True, True, True]
+
+
 class TestAgentChat:
     """Test Agent chat method."""
 
@@ -164,6 +184,24 @@ class TestAgentChat:
         assert "Test message" in result
 
 
+class TestAgentChatStream:
+    """Test Agent.chat_stream."""
+
+    def test_chat_stream_uses_llm_stream(self):
+        """Test chunks come from the LLM client's stream."""
+        mock_llm = MagicMock()
+        mock_llm.chat_stream.return_value = iter(["Hel", "lo"])
+        agent = Agent(llm_client=mock_llm)
+
+        assert list(agent.chat_stream("Hi")) == ["Hel", "lo"]
+        mock_llm.chat_stream.assert_called_once_with("Hi")
+
+    def test_chat_stream_without_llm(self):
+        """Test the echo response arrives as a single chunk."""
+        agent = Agent(name="test")
+        assert list(agent.chat_stream("Hi")) == [agent.chat("Hi")]
+
+
 class TestAgent:
     """Additional Agent tests for compatibility."""
 
@@ -38,19 +38,21 @@ class TestStrandsProvider:
             assert "Use requests library" in result
             assert "ConfigSpecialist" in result
 
-    @patch("hatch_agent.agent.llm.StrandsAgent")
-    def test_complete_single_mode(self, mock_strands_agent):
+    @patch("hatch_agent.agent.llm.create_model")
+    @patch("strands.Agent")
+    def test_complete_single_mode(self, mock_strands_agent, mock_create_model):
         """Test complete in single agent mode."""
         mock_agent_instance = MagicMock()
         mock_agent_instance.return_value = "Single agent response"
         mock_strands_agent.return_value = mock_agent_instance
 
-        config = {"mode": "single"}
+        config = {"mode": "single", "model": "gpt-4"}
         provider = StrandsProvider(config)
         result = provider.complete("Test prompt")
 
         assert "Single agent response" in result
-        mock_strands_agent.assert_called_once()
+        mock_create_model.assert_called_once_with("openai", {"model": "gpt-4"})
+        assert mock_strands_agent.call_args.kwargs["model"] is mock_create_model.return_value
 
     def test_complete_default_mode_is_multi_agent(self):
         """Test that default mode is multi-agent."""
@@ -93,6 +95,54 @@ class TestStrandsProvider:
             # Verify orchestrator was called
             mock_module.MultiAgentOrchestrator.assert_called()
 
+    @patch("hatch_agent.agent.llm.create_model")
+    @patch("strands.Agent")
+    def test_stream_single_mode_yields_text_events(self, mock_strands_agent, mock_create_model):
+        """Test single mode yields the text of each streamed event."""
+
+        async def events(prompt):
+            yield {"data": "Use "}
+            yield {"current_tool_use": {}}
+            yield {"data": "hatch"}
+
+        mock_strands_agent.return_value.stream_async.side_effect = events
+
+        provider = StrandsProvider({"mode": "single"})
+
+        assert list(provider.stream("How do I build?")) == ["Use ", "hatch"]
+
+    @patch("hatch_agent.agent.llm.create_model")
+    @patch("strands.Agent")
+    def test_stream_single_mode_uses_configured_model(self, mock_strands_agent, mock_create_model):
+        """Test that streaming talks to the configured provider and model."""
+
+        async def events(prompt):
+            yield {"data": "ok"}
+
+        mock_strands_agent.return_value.stream_async.side_effect = events
+        provider = StrandsProvider(
+            {
+                "mode": "single",
+                "underlying_provider": "anthropic",
+                "model": "claude-3-sonnet-20240229",
+                "underlying_config": {"api_key": "sk-test"},
+            }
+        )
+
+        assert list(provider.stream("hi")) == ["ok"]
+        mock_create_model.assert_called_once_with(
+            "anthropic", {"api_key": "sk-test", "model": "claude-3-sonnet-20240229"}
+        )
+        assert mock_strands_agent.call_args.kwargs["model"] is mock_create_model.return_value
+
+    def test_stream_multi_agent_mode_yields_complete_response(self):
+        """Test multi-agent mode yields the judged response in one chunk."""
+        provider = StrandsProvider({"mode": "multi-agent"})
+
+        with patch.object(StrandsProvider, "complete", return_value="judged") as mock:
+            assert list(provider.stream("prompt")) == ["judged"]
+            mock.assert_called_once_with("prompt")
+
     def test_chat_routes_to_complete(self):
         """Test that chat routes to complete."""
         config = {}
@@ -165,6 +215,14 @@ class TestLLMClient:
             mock.assert_called_once_with("test prompt")
             assert result == "response"
 
+    def test_chat_stream_calls_provider(self):
+        """Test chat_stream yields chunks from the provider stream."""
+        client = LLMClient(provider_config={})
+
+        with patch.object(StrandsProvider, "stream", return_value=iter(["a", "b"])) as mock:
+            assert list(client.chat_stream("test message")) == ["a", "b"]
+            mock.assert_called_once_with("test message")
+
     def test_chat_calls_provider(self):
         """Test chat calls through to provider."""
         client = LLMClient(provider_config={})
@@ -0,0 +1,77 @@
+"""Tests for building strands models from provider settings."""
+
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from hatch_agent.agent.models import create_model
+
+
+class TestCreateModel:
+    """Test create_model."""
+
+    def test_openai(self):
+        """Test that OpenAI settings become client args and the model id."""
+        module = MagicMock()
+        with patch.dict(sys.modules, {"strands.models.openai": module}):
+            model = create_model("openai", {"model": "gpt-4", "api_key": "sk", "organization": ""})
+
+        assert model is module.OpenAIModel.return_value
+        module.OpenAIModel.assert_called_once_with(client_args={"api_key": "sk"}, model_id="gpt-4")
+
+    def test_anthropic(self):
+        """Test that Anthropic models get the API key and an output budget."""
+        module = MagicMock()
+        with patch.dict(sys.modules, {"strands.models.anthropic": module}):
+            create_model("anthropic", {"model": "claude-3", "api_key": "sk"})
+
+        kwargs = module.AnthropicModel.call_args.kwargs
+        assert kwargs["client_args"] == {"api_key": "sk"}
+        assert kwargs["model_id"] == "claude-3"
+        assert kwargs["max_tokens"] > 0
+
+    def test_bedrock(self):
+        """Test that Bedrock models use the configured region and model id."""
+        model = create_model(
+            "bedrock", {"model": "anthropic.claude-3-sonnet-20240229-v1:0", "region": "eu-west-1"}
+        )
+
+        assert model.config["model_id"] == "anthropic.claude-3-sonnet-20240229-v1:0"
+        assert model.client.meta.region_name == "eu-west-1"
+
+    def test_azure_uses_litellm_deployment(self):
+        """Test that Azure goes through LiteLLM with the deployment name."""
+        module = MagicMock()
+        with patch.dict(sys.modules, {"strands.models.litellm": module}):
+            create_model(
+                "azure",
+                {
+                    "model": "gpt-4",
+                    "deployment": "prod-gpt4",
+                    "api_key": "k",
+                    "api_base": "https://x",
+                },
+            )
+
+        module.LiteLLMModel.assert_called_once_with(
+            client_args={"api_key": "k", "api_base": "https://x"}, model_id="azure/prod-gpt4"
+        )
+
+    def test_missing_sdk(self):
+        """Test that a missing provider SDK gives an actionable error."""
+        with (
+            patch.dict(sys.modules, {"strands.models.openai": None}),
+            pytest.raises(RuntimeError, match="openai"),
+        ):
+            create_model("openai", {"model": "gpt-4"})
+
+    def test_unsupported_provider(self):
+        """Test that unknown providers are rejected rather than silently defaulted."""
+        with pytest.raises(ValueError, match="Unsupported provider"):
+            create_model("mystery", {"model": "m"})
+
+    def test_missing_model(self):
+        """Test that a provider without a model is rejected."""
+        with pytest.raises(ValueError, match="No model configured"):
+            create_model("openai", {})
@@ -1,5 +1,6 @@
 """Tests for multi-agent coordination."""
 
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -58,7 +59,7 @@ class TestMultiAgentOrchestratorInit:
 class TestMultiAgentOrchestratorCreateAgent:
     """Test _create_agent method."""
 
-    @patch("hatch_agent.agent.multi_agent.StrandsAgent")
+    @patch("strands.Agent")
     def test_create_agent_returns_agent(self, mock_strands):
         """Test _create_agent returns a StrandsAgent."""
         mock_agent = MagicMock()
@@ -72,7 +73,7 @@ class TestMultiAgentOrchestratorCreateAgent:
         assert agent is mock_agent
         mock_strands.assert_called_once()
 
-    @patch("hatch_agent.agent.multi_agent.StrandsAgent")
+    @patch("strands.Agent")
     def test_create_agent_uses_system_prompt(self, mock_strands):
         """Test _create_agent passes correct system prompt."""
         orchestrator = MultiAgentOrchestrator()
@@ -85,6 +86,113 @@ class TestMultiAgentOrchestratorCreateAgent:
         assert "Configuration expert" in call_kwargs["system_prompt"]
         assert "Analyze configs" in call_kwargs["system_prompt"]
 
+    @patch("strands.Agent")
+    def test_create_agent_adds_cache_point_for_anthropic(self, mock_strands):
+        """Test that caching providers get a cache point after the instructions."""
+        orchestrator = MultiAgentOrchestrator(provider_name="anthropic")
+        orchestrator._create_agent(
+            name="ConfigAgent", role="Configuration expert", instructions="Analyze configs"
+        )
+
+        blocks = mock_strands.call_args[1]["system_prompt"]
+        assert "Analyze configs" in blocks[0]["text"]
+        assert blocks[1] == {"cachePoint": {"type": "default"}}
+
+    def test_create_agent_plain_prompt_without_block_support(self):
+        """Test that strands releases without content-block prompts get a string."""
+
+        class LegacyAgent:
+            def __init__(self, system_prompt):
+                self.system_prompt = system_prompt
+
+        orchestrator = MultiAgentOrchestrator(provider_name="anthropic")
+        with patch("strands.Agent", LegacyAgent):
+            agent = orchestrator._create_agent(
+                name="ConfigAgent", role="Configuration expert", instructions="Analyze configs"
+            )
+
+        assert isinstance(agent.system_prompt, str)
+        assert "Analyze configs" in agent.system_prompt
+
+    @patch("strands.Agent")
+    def test_create_agent_falls_back_when_blocks_rejected(self, mock_strands):
+        """Test that a rejected block prompt is retried as a plain string."""
+        mock_agent = MagicMock()
+        mock_strands.side_effect = [TypeError("system_prompt must be str"), mock_agent]
+
+        orchestrator = MultiAgentOrchestrator(provider_name="bedrock")
+        agent = orchestrator._create_agent(
+            name="ConfigAgent", role="Configuration expert", instructions="Analyze configs"
+        )
+
+        assert agent is mock_agent
+        assert isinstance(mock_strands.call_args[1]["system_prompt"], str)
+
+
+class TestMultiAgentOrchestratorCollectSuggestions:
+    """Test concurrent specialist queries."""
+
+    def test_specialists_run_concurrently_in_order(self):
+        """Test that specialists overlap and results keep the agent order."""
+        orchestrator = MultiAgentOrchestrator()
+        barrier = threading.Barrier(2, timeout=5)
+
+        def respond(agent, task, context):
+            # Both calls must be in flight at once for the barrier to release
+            barrier.wait()
+            return AgentResponse(agent, f"from {agent}", "", 0.5)
+
+        with patch.object(orchestrator, "_get_agent_response", side_effect=respond):
+            responses = orchestrator._collect_suggestions(["first", "second"], "task", {})
+
+        assert [r.agent_name for r in responses] == ["first", "second"]
+
+    def test_max_concurrent_agents_caps_pool(self):
+        """Test that max_concurrent_agents limits overlapping specialist calls."""
+        orchestrator = MultiAgentOrchestrator(provider_config={"max_concurrent_agents": 1})
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def respond(agent, task, context):
+            with lock:
+                active.append(agent)
+                peak.append(len(active))
+            with lock:
+                active.remove(agent)
+            return AgentResponse(agent, f"from {agent}", "", 0.5)
+
+        with patch.object(orchestrator, "_get_agent_response", side_effect=respond):
+            responses = orchestrator._collect_suggestions(["a", "b", "c"], "task", {})
+
+        assert [r.agent_name for r in responses] == ["a", "b", "c"]
+        assert max(peak) == 1
+
+
+class TestMultiAgentOrchestratorUsage:
+    """Test token usage collection."""
+
+    def test_record_usage_accumulates(self):
+        """Test that usage from several results is summed."""
+        orchestrator = MultiAgentOrchestrator()
+        result = MagicMock()
+        result.metrics.accumulated_usage = {"inputTokens": 100, "cacheReadInputTokens": 80}
+
+        orchestrator._record_usage(result)
+        orchestrator._record_usage(result)
+
+        assert orchestrator._with_usage({})["usage"] == {
+            "inputTokens": 200,
+            "cacheReadInputTokens": 160,
+        }
+
+    def test_record_usage_ignores_results_without_metrics(self):
+        """Test that plain string results add no usage."""
+        orchestrator = MultiAgentOrchestrator()
+        orchestrator._record_usage("plain text")
+
+        assert "usage" not in orchestrator._with_usage({})
+
 
 class TestMultiAgentOrchestratorRun:
     """Test run method."""
@@ -0,0 +1,41 @@
+"""Tests for structured plan extraction."""
+
+from hatch_agent.agent.plan import extract_plan
+
+
+class TestExtractPlan:
+    """Test extract_plan function."""
+
+    def test_extracts_object_after_marker(self):
+        """Test the JSON object following the marker is returned."""
+        suggestion = 'Analysis first.\n\nFIX_PLAN:\n{"fixes": [{"file": "a.py"}]}'
+        assert extract_plan(suggestion, "FIX_PLAN:") == {"fixes": [{"file": "a.py"}]}
+
+    def test_ignores_trailing_prose_with_braces(self):
+        """Test text after the object, even with braces, does not break parsing."""
+        suggestion = 'PLAN:\n{"a": 1}\n\nNote: keep {this} in mind.'
+        assert extract_plan(suggestion, "PLAN:") == {"a": 1}
+
+    def test_ignores_braces_before_marker(self):
+        """Test objects before the marker are not picked up."""
+        suggestion = 'Example: {"b": 2}\nPLAN:\n```json\n{"a": 1}\n```'
+        assert extract_plan(suggestion, "PLAN:") == {"a": 1}
+
+    def test_uses_last_marker(self):
+        """Test a plan after echoed instructions wins over the template."""
+        suggestion = (
+            'You asked for PLAN:\n{"a": "template"}\n\nHere is my answer.\n\nPLAN:\n{"a": 1}'
+        )
+        assert extract_plan(suggestion, "PLAN:") == {"a": 1}
+
+    def test_missing_marker(self):
+        """Test None is returned when the marker is absent."""
+        assert extract_plan('{"a": 1}', "PLAN:") is None
+
+    def test_missing_object(self):
+        """Test None is returned when no object follows the marker."""
+        assert extract_plan("PLAN:\nnothing structured", "PLAN:") is None
+
+    def test_invalid_json(self):
+        """Test None is returned for malformed JSON."""
+        assert extract_plan("PLAN:\n{not json}", "PLAN:") is None
@@ -1,9 +1,10 @@
 """Tests for build system analysis."""
 
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from hatch_agent.analyzers.build import BuildAnalyzer
+from hatch_agent.analyzers.build import _MAX_OUTPUT_LINES, BuildAnalyzer
 
 
 class TestBuildAnalyzerInit:
@@ -62,6 +63,32 @@ class TestBuildAnalyzerAnalyze:
         assert "type_result" in result
         assert result["pyproject_exists"] is True
 
+    def test_checks_run_one_at_a_time(self, temp_project_dir):
+        """Test that checks sharing the hatch app run in order on the calling thread."""
+        order = []
+
+        def step(name):
+            def run(app):
+                order.append((name, threading.get_ident()))
+                return {"success": True, "step": name}
+
+            return run
+
+        analyzer = BuildAnalyzer(project_root=temp_project_dir, app=MagicMock())
+        with (
+            patch.object(analyzer, "_run_tests", side_effect=step("tests")),
+            patch.object(analyzer, "_check_formatting", side_effect=step("format")),
+            patch.object(analyzer, "_check_types", side_effect=step("types")),
+            patch.object(analyzer, "_get_env_info", side_effect=step("env")),
+        ):
+            result = analyzer.analyze_build_failure()
+
+        caller = threading.get_ident()
+        assert order == [(name, caller) for name in ("tests", "format", "types", "env")]
+        assert result["test_result"]["step"] == "tests"
+        assert result["format_result"]["step"] == "format"
+        assert result["type_result"]["step"] == "types"
+
 
 class TestBuildAnalyzerHelpers:
     """Test helper methods."""
@@ -368,6 +395,60 @@ class TestRunTestsExtended:
         assert "Env not found" in result["error"]
 
 
+class TestOutputCap:
+    """Test how much command output is kept for the agents."""
+
+    @patch.object(BuildAnalyzer, "_find_test_env")
+    def test_run_tests_keeps_full_output(self, mock_find_env):
+        """Ordinary test output is kept in full."""
+        mock_find_env.return_value = "test"
+        mock_app = MagicMock()
+        mock_env = MagicMock()
+        mock_env.run_shell_command.return_value = iter(["x" * 300] * 1000)
+        mock_app.get_environment.return_value = mock_env
+
+        result = BuildAnalyzer(app=mock_app)._run_tests(mock_app)
+
+        assert result["success"] is True
+        assert result["stdout"] == "\n".join(["x" * 300] * 1000)
+
+    @patch.object(BuildAnalyzer, "_find_test_env")
+    def test_run_tests_keeps_tail_of_long_output(self, mock_find_env):
+        """Very long output keeps its last lines, where the summary is."""
+        mock_find_env.return_value = "test"
+        mock_app = MagicMock()
+        mock_env = MagicMock()
+        lines = [f"line {i}" for i in range(_MAX_OUTPUT_LINES + 500)] + ["1 failed"]
+        mock_env.run_shell_command.return_value = iter(lines)
+        mock_app.get_environment.return_value = mock_env
+
+        result = BuildAnalyzer(app=mock_app)._run_tests(mock_app)
+
+        kept = result["stdout"].split("\n")
+        assert len(kept) == _MAX_OUTPUT_LINES
+        assert kept == lines[-_MAX_OUTPUT_LINES:]
+
+    @patch.object(BuildAnalyzer, "_find_type_env")
+    def test_check_types_keeps_partial_output_and_error(self, mock_find_env):
+        """Output captured before a failure and the error text are both kept."""
+        mock_find_env.return_value = "type"
+
+        def failing_output(_command):
+            yield from ["error: " + "y" * 100] * 50
+            raise RuntimeError("z" * 10_000)
+
+        mock_app = MagicMock()
+        mock_env = MagicMock()
+        mock_env.run_shell_command.side_effect = failing_output
+        mock_app.get_environment.return_value = mock_env
+
+        result = BuildAnalyzer(app=mock_app)._check_types(mock_app)
+
+        assert result["success"] is False
+        assert result["stdout"] == "\n".join(["error: " + "y" * 100] * 50)
+        assert result["stderr"] == "z" * 10_000
+
+
 class TestFindEnvFallbacks:
     """Test environment finding fallbacks."""
 
@@ -49,7 +49,7 @@ class TestDependencySync:
     def test_get_app_creates_application(self, temp_project_dir):
         """Test that _get_app creates Application when not provided."""
         sync = DependencySync(project_root=temp_project_dir)
-        with patch("hatch_agent.analyzers.sync.Application") as mock_app_class:
+        with patch("hatch.cli.application.Application") as mock_app_class:
             mock_app_class.return_value = MagicMock()
             app = sync._get_app()
             mock_app_class.assert_called_once_with(temp_project_dir)
@@ -335,3 +335,56 @@ class TestEnvironmentCaching:
         assert env1.name == "default"
         assert env2.name == "dev"
         assert env1 is not env2
+
+
+class TestInstalledVersions:
+    """Test installed version snapshots."""
+
+    @staticmethod
+    def _write_dist(site: Path, name: str, version: str) -> None:
+        dist_info = site / f"{name}-{version}.dist-info"
+        dist_info.mkdir(parents=True)
+        (dist_info / "METADATA").write_text(
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+        )
+
+    @pytest.fixture
+    def mock_hatch_app(self):
+        """Create a mock Hatch Application."""
+        app = MagicMock()
+        app.project.config.envs.keys.return_value = ["default"]
+        return app
+
+    def test_reads_metadata_from_virtual_env(self, temp_project_dir, mock_hatch_app, tmp_path):
+        """Test that virtual environments are read without running pip."""
+        site = tmp_path / "site-packages"
+        shadowed = tmp_path / "shadowed"
+        self._write_dist(site, "Requests", "2.31.0")
+        self._write_dist(site, "click", "8.1.7")
+        self._write_dist(shadowed, "click", "7.0")
+
+        env = MagicMock()
+        env.virtual_env.sys_path = [str(site), str(shadowed)]
+        mock_hatch_app.get_environment.return_value = env
+        sync_manager = DependencySync(project_root=temp_project_dir, app=mock_hatch_app)
+
+        versions = sync_manager.get_installed_versions()
+
+        assert versions == {"requests": "2.31.0", "click": "8.1.7"}
+        env.platform.run_command.assert_not_called()
+
+    def test_falls_back_to_pip_list(self, temp_project_dir, mock_hatch_app):
+        """Test that environments without readable metadata use pip list."""
+        env = MagicMock()
+        env.use_uv = False
+        env.virtual_env.sys_path = []
+        env.platform.run_command.return_value = MagicMock(
+            returncode=0, stdout=b'[{"name": "Requests", "version": "2.31.0"}]'
+        )
+        mock_hatch_app.get_environment.return_value = env
+        sync_manager = DependencySync(project_root=temp_project_dir, app=mock_hatch_app)
+
+        assert sync_manager.get_installed_versions() == {"requests": "2.31.0"}
+        env.platform.run_command.assert_called_once_with(
+            ["pip", "list", "--format", "json"], capture_output=True
+        )
@@ -1,9 +1,21 @@
 """Tests for dependency updater."""
 
+import os
+import sqlite3
+import sys
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from hatch_agent.analyzers.updater import DependencyUpdater
+import pytest
+
+from hatch_agent.analyzers.dependency import DependencyManager
+from hatch_agent.analyzers.updater import PYPI_CACHE_TTL, DependencyUpdater, PyProjectIO
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
 
 
 class TestDependencyUpdaterInit:
@@ -30,13 +42,35 @@ class TestDependencyUpdaterLatestVersion:
         with patch("requests.get") as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
-            mock_response.json.return_value = {"info": {"version": "2.31.0"}}
+            mock_response.iter_content.return_value = [b'{"info": {"version": "2.31.0"}}']
+            mock_get.return_value = mock_response
+
+            updater = DependencyUpdater()
+            version = updater.get_latest_version("requests")
+
+            assert version == "2.31.0"
+
+    def test_get_latest_version_stops_after_info(self):
+        """Test that the release history after info is never read."""
+        with patch("requests.get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            consumed = []
+
+            def chunks(chunk_size):
+                for chunk in (b'{"in', b'fo": {"version": "2.3', b'1.0"}, "releases": {', b"}}"):
+                    consumed.append(chunk)
+                    yield chunk
+
+            mock_response.iter_content.side_effect = chunks
             mock_get.return_value = mock_response
 
             updater = DependencyUpdater()
             version = updater.get_latest_version("requests")
 
             assert version == "2.31.0"
+            assert len(consumed) == 3
+            mock_response.close.assert_called_once()
 
     def test_get_latest_version_not_found(self):
         """Test get_latest_version when package not found."""
@@ -61,6 +95,69 @@ class TestDependencyUpdaterLatestVersion:
             assert version is None
 
 
+class TestDependencyUpdaterPyPICache:
+    """Test on-disk caching of PyPI metadata."""
+
+    @staticmethod
+    def _response(version: str) -> MagicMock:
+        response = MagicMock()
+        response.status_code = 200
+        response.iter_content.return_value = [f'{{"info": {{"version": "{version}"}}}}'.encode()]
+        return response
+
+    def test_repeat_lookup_uses_cache(self):
+        """Test that a second updater reuses the cached metadata."""
+        with patch("requests.get", return_value=self._response("2.31.0")) as mock_get:
+            assert DependencyUpdater().get_latest_version("requests") == "2.31.0"
+            assert DependencyUpdater().get_latest_version("requests") == "2.31.0"
+
+        mock_get.assert_called_once()
+
+    def test_zero_ttl_disables_cache(self):
+        """Test that a zero TTL always queries PyPI."""
+        with patch("requests.get", return_value=self._response("2.31.0")) as mock_get:
+            updater = DependencyUpdater(pypi_cache_ttl=0)
+            updater.get_latest_version("requests")
+            updater.get_latest_version("requests")
+
+        assert mock_get.call_count == 2
+
+    def test_unwritable_cache_dir_still_queries_pypi(self, unwritable_cache_dir):
+        """Test that an unusable cache dir is bypassed instead of failing the lookup."""
+        with patch("requests.get", return_value=self._response("2.31.0")) as mock_get:
+            updater = DependencyUpdater()
+            assert updater.get_latest_version("requests") == "2.31.0"
+            assert updater.get_latest_version("requests") == "2.31.0"
+
+        assert mock_get.call_count == 2
+
+    def test_cache_open_failure_still_queries_pypi(self):
+        """Test that an error opening the cache does not read as a fetch failure."""
+        with (
+            patch("requests.get", return_value=self._response("2.31.0")),
+            patch(
+                "hatch_agent.analyzers.updater.ResponseCache",
+                side_effect=sqlite3.OperationalError("unable to open database file"),
+            ),
+        ):
+            assert DependencyUpdater().get_latest_version("requests") == "2.31.0"
+
+    def test_offline_falls_back_to_expired_entry(self):
+        """Test that an unreachable PyPI serves the last cached answer."""
+        import requests
+
+        with patch("requests.get", return_value=self._response("2.31.0")):
+            DependencyUpdater().get_latest_version("requests")
+
+        later = time.time() + 2 * PYPI_CACHE_TTL
+        with (
+            patch("requests.get", side_effect=requests.ConnectionError("offline")),
+            patch("hatch_agent.cache.exact.time.time", return_value=later),
+        ):
+            assert DependencyUpdater().get_latest_version("requests") == "2.31.0"
+            assert DependencyUpdater().get_latest_version("httpx") is None
+
+
 class TestDependencyUpdaterChangelogUrl:
     """Test get_changelog_url method."""
 
@@ -69,9 +166,9 @@ class TestDependencyUpdaterChangelogUrl:
         with patch("requests.get") as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
-            mock_response.json.return_value = {
-                "info": {"project_urls": {"Changelog": "https://example.com/changelog"}}
-            }
+            mock_response.iter_content.return_value = [
+                b'{"info": {"project_urls": {"Changelog": "https://example.com/changelog"}}}'
+            ]
             mock_get.return_value = mock_response
 
             updater = DependencyUpdater()
@@ -84,9 +181,9 @@ class TestDependencyUpdaterChangelogUrl:
         with patch("requests.get") as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
-            mock_response.json.return_value = {
-                "info": {"home_page": "https://github.com/user/repo", "project_urls": {}}
-            }
+            mock_response.iter_content.return_value = [
+                b'{"info": {"home_page": "https://github.com/user/repo", "project_urls": {}}}'
+            ]
             mock_get.return_value = mock_response
 
             updater = DependencyUpdater()
@@ -94,6 +191,72 @@ class TestDependencyUpdaterChangelogUrl:
 
             assert url == "https://github.com/user/repo/releases"
 
+    def test_get_changelog_url_label_case_insensitive(self):
+        """Test that changelog labels match regardless of case and spacing."""
+        with patch("requests.get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.iter_content.return_value = [
+                b'{"info": {"project_urls": {"Releases": "https://example.com/releases", '
+                b'" change LOG ": "https://example.com/changes"}}}'
+            ]
+            mock_get.return_value = mock_response
+
+            updater = DependencyUpdater()
+            url = updater.get_changelog_url("some-package")
+
+            assert url == "https://example.com/changes"
+
+    def test_get_changelog_url_source_fallback(self):
+        """Test that a GitHub source URL is used when the homepage is elsewhere."""
+        with patch("requests.get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.iter_content.return_value = [
+                b'{"info": {"home_page": "https://docs.example.com", '
+                b'"project_urls": {"Source": "https://github.com/user/repo/"}}}'
+            ]
+            mock_get.return_value = mock_response
+
+            updater = DependencyUpdater()
+            url = updater.get_changelog_url("some-package")
+
+            assert url == "https://github.com/user/repo/releases"
+
+    def test_get_changelog_url_prefers_release_document(self):
+        """Test that a known version requests the per-release document."""
+        with patch("requests.get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.iter_content.return_value = [
+                b'{"info": {"project_urls": {"Changes": "https://example.com/changes"}}}'
+            ]
+            mock_get.return_value = mock_response
+
+            updater = DependencyUpdater()
+            url = updater.get_changelog_url("some-package", "1.2.0")
+
+            assert url == "https://example.com/changes"
+            assert mock_get.call_args[0][0] == "https://pypi.org/pypi/some-package/1.2.0/json"
+
+    def test_get_changelog_url_latest_release(self):
+        """Test that the latest release reuses cached metadata but keeps its tag URL."""
+        with patch("requests.get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.iter_content.return_value = [
+                b'{"info": {"version": "2.31.0", "home_page": "https://github.com/user/repo"}}'
+            ]
+            mock_get.return_value = mock_response
+
+            updater = DependencyUpdater()
+            latest = updater.get_latest_version("some-package")
+            url = updater.get_changelog_url("some-package", latest, latest=True)
+
+            assert url == "https://github.com/user/repo/releases/tag/v2.31.0"
+            mock_get.assert_called_once()
+            assert mock_get.call_args[0][0] == "https://pypi.org/pypi/some-package/json"
+
 
 class TestDependencyUpdaterUpdateDep:
     """Test update_dependency method."""
@@ -140,6 +303,105 @@ dev = ["pytest>=7.0"]
         assert result["success"] is False
         assert "not found" in result["error"]
 
+    def test_update_dependency_prefers_main_over_optional(self, temp_project_dir):
+        """Test that main dependencies are updated before optional groups."""
+        pyproject = temp_project_dir / "pyproject.toml"
+        pyproject.write_text("""
+[project]
+name = "test"
+dependencies = ["requests>=2.0.0"]
+
+[project.optional-dependencies]
+dev = ["requests>=1.0", "pytest>=7.0"]
+""")
+        updater = DependencyUpdater(project_root=temp_project_dir)
+        result = updater.update_dependency("requests", ">=2.31.0", optional_group="dev")
+
+        assert result["target"] == "project.dependencies"
+        config = updater.read_pyproject()
+        assert config["project"]["dependencies"] == ["requests>=2.31.0"]
+        assert config["project"]["optional-dependencies"]["dev"][0] == "requests>=1.0"
+
+    def test_update_dependency_preserves_formatting(self, temp_project_dir):
+        """Test that only the dependency literal is rewritten."""
+        pyproject = temp_project_dir / "pyproject.toml"
+        original = """# project metadata
+[project]
+name = "test"
+dependencies = [
+    "requests>=2.0.0",  # http
+    'click>=8.0',
+]
+"""
+        pyproject.write_text(original)
+
+        updater = DependencyUpdater(project_root=temp_project_dir)
+        updater.update_dependency("requests", ">=2.31.0")
+        updater.update_dependency("click", ">=8.1")
+
+        assert pyproject.read_text() == original.replace(
+            '"requests>=2.0.0"', '"requests>=2.31.0"'
+        ).replace("'click>=8.0'", "'click>=8.1'")
+
+    def test_update_dependency_ambiguous_literal_rewrites(self, temp_project_dir):
+        """Test that a literal present twice falls back to a full rewrite."""
+        pyproject = temp_project_dir / "pyproject.toml"
+        pyproject.write_text("""
+[project]
+name = "test"
+dependencies = ["requests>=2.0"]
+
+[tool.hatch.envs.default]
+dependencies = ["requests>=2.0"]
+""")
+        updater = DependencyUpdater(project_root=temp_project_dir)
+        result = updater.update_dependency("requests", ">=2.31.0")
+
+        assert result["success"] is True
+        config = updater.read_pyproject()
+        assert config["project"]["dependencies"] == ["requests>=2.31.0"]
+        assert config["tool"]["hatch"]["envs"]["default"]["dependencies"] == ["requests>=2.0"]
+
+
+class TestDependencyUpdaterParseCache:
+    """Test pyproject.toml parse caching."""
+
+    def test_read_pyproject_reuses_parse(self, temp_project_dir):
+        """Test that an unchanged file is parsed once."""
+        pyproject = temp_project_dir / "pyproject.toml"
+        pyproject.write_text('[project]\ndependencies = ["requests>=2.0"]\n')
+
+        updater = DependencyUpdater(project_root=temp_project_dir)
+
+        assert updater.read_pyproject() is updater.read_pyproject()
+
+    def test_read_pyproject_sees_external_edits(self, temp_project_dir):
+        """Test that a changed file is re-parsed."""
+        pyproject = temp_project_dir / "pyproject.toml"
+        pyproject.write_text('[project]\ndependencies = ["requests>=2.0"]\n')
+
+        updater = DependencyUpdater(project_root=temp_project_dir)
+        assert updater.get_current_version("requests") == ">=2.0"
+
+        pyproject.write_text('[project]\ndependencies = ["requests>=2.31.0", "click"]\n')
+
+        assert updater.get_current_version("requests") == ">=2.31.0"
+        assert updater.get_current_version("click") is None
+
+    def test_successive_updates(self, temp_project_dir):
+        """Test that each update sees the previous write."""
+        pyproject = temp_project_dir / "pyproject.toml"
+        pyproject.write_text('[project]\ndependencies = ["requests>=2.0", "click>=7.0"]\n')
+
+        updater = DependencyUpdater(project_root=temp_project_dir)
+        updater.update_dependency("requests", ">=2.31.0")
+        updater.update_dependency("click", ">=8.0")
+
+        assert updater.read_pyproject()["project"]["dependencies"] == [
+            "requests>=2.31.0",
+            "click>=8.0",
+        ]
+
 
 class TestDependencyUpdaterHelpers:
     """Test helper methods."""
@@ -160,6 +422,13 @@ class TestDependencyUpdaterHelpers:
         assert updater._extract_package_name("requests>=2.0") == "requests"
         assert updater._extract_package_name("requests[socks]>=2.0") == "requests"
         assert updater._extract_package_name("click") == "click"
+        assert updater._extract_package_name("  click ") == "click"
+        assert (
+            updater._extract_package_name('requests[socks]>=2.30; python_version >= "3.9"')
+            == "requests"
+        )
+        assert updater._extract_package_name("tomli; python_version < '3.11'") == "tomli"
+        assert updater._extract_package_name("pytest (>=7.0)") == "pytest"
 
     def test_extract_version(self, temp_project_dir):
         """Test extracting version from dep string."""
@@ -199,6 +468,17 @@ dev = ["pytest>=7.0"]
 
         assert version == ">=7.0"
 
+    def test_get_current_version_normalized_name(self, temp_project_dir):
+        """Test that lookups ignore case and separator differences."""
+        pyproject = temp_project_dir / "pyproject.toml"
+        pyproject.write_text("""
+[project]
+dependencies = ["Requests_OAuthlib>=1.3"]
+""")
+        updater = DependencyUpdater(project_root=temp_project_dir)
+
+        assert updater.get_current_version("requests-oauthlib") == ">=1.3"
+
 
 class TestDependencyUpdaterProjectFiles:
     """Test get_project_files method."""
@@ -230,6 +510,203 @@ class TestDependencyUpdaterProjectFiles:
 
         assert not any("__pycache__" in str(f) for f in files)
 
+    @pytest.mark.parametrize("limit", [None, 10])
+    def test_get_project_files_skips_tool_directories(self, temp_project_dir, limit):
+        """Test that dependency and tool cache directories are never entered."""
+        (temp_project_dir / "app.py").write_text("")
+        for name in ("node_modules", ".nox", ".mypy_cache"):
+            tool_dir = temp_project_dir / name / "pkg"
+            tool_dir.mkdir(parents=True)
+            (tool_dir / "vendored.py").write_text("")
+
+        updater = DependencyUpdater(project_root=temp_project_dir)
+
+        assert updater.get_project_files(limit=limit) == [temp_project_dir / "app.py"]
+
+    def test_get_project_files_no_duplicates(self, temp_project_dir):
+        """Test that files under src are reported once across all extensions."""
+        src = temp_project_dir / "src"
+        src.mkdir()
+        (src / "app.py").write_text("# app")
+        (src / "app.pyi").write_text("# stub")
+        (temp_project_dir / "setup.py").write_text("# setup")
+        venv = temp_project_dir / ".venv"
+        venv.mkdir()
+        (venv / "site.py").write_text("# site")
+
+        updater = DependencyUpdater(project_root=temp_project_dir)
+        files = updater.get_project_files([".py", ".pyi"])
+
+        names = sorted(f.name for f in files)
+        assert names == ["app.py", "app.pyi", "setup.py"]
+
+    def test_get_project_files_parallel_matches_serial(self, temp_project_dir):
+        """Test that the threaded scan finds the same files as the serial one."""
+        for pkg in range(5):
+            pkg_dir = temp_project_dir / "src" / f"pkg{pkg}" / "sub"
+            pkg_dir.mkdir(parents=True)
+            (pkg_dir / "mod.py").write_text("")
+            (pkg_dir.parent / "__init__.py").write_text("")
+            (pkg_dir.parent / "README.md").write_text("")
+        (temp_project_dir / "build").mkdir()
+        (temp_project_dir / "build" / "generated.py").write_text("")
+
+        updater = DependencyUpdater(project_root=temp_project_dir)
+        serial = updater.get_project_files()
+        with patch("hatch_agent.analyzers.updater._PARALLEL_SCAN_THRESHOLD", 1):
+            parallel = updater.get_project_files(max_workers=4)
+
+        assert parallel == serial
+        assert len(serial) == 10
+
+    def test_get_project_files_limit_matches_sorted_prefix(self, temp_project_dir):
+        """Test that a limited walk returns the head of the source-first listing."""
+        for name in ("b", "a", "a_b", "c"):
+            pkg = temp_project_dir / "src" / name
+            pkg.mkdir(parents=True)
+            (pkg / "mod.py").write_text("")
+            (pkg / "__init__.py").write_text("")
+        (temp_project_dir / "src" / "a.py").write_text("")
+        (temp_project_dir / "lib").mkdir()
+        (temp_project_dir / "lib" / "util.py").write_text("")
+        (temp_project_dir / "setup.py").write_text("")
+
+        updater = DependencyUpdater(project_root=temp_project_dir)
+        full = updater.get_project_files()
+        src = temp_project_dir / "src"
+        source_first = [
+            *(f for f in full if src in f.parents),
+            temp_project_dir / "lib" / "util.py",
+            temp_project_dir / "setup.py",
+        ]
+        assert sorted(source_first) == full
+
+        for limit in range(len(full) + 2):
+            assert updater.get_project_files(limit=limit) == source_first[:limit]
+
+    def test_get_project_files_limit_prefers_source_dirs(self, temp_project_dir):
+        """Test that a large docs tree cannot crowd src out of a limited listing."""
+        docs = temp_project_dir / "docs"
+        docs.mkdir()
+        for i in range(60):
+            (docs / f"conf{i:02}.py").write_text("")
+        pkg = temp_project_dir / "src" / "pkg"
+        pkg.mkdir(parents=True)
+        (pkg / "__init__.py").write_text("")
+        (pkg / "core.py").write_text("")
+
+        updater = DependencyUpdater(project_root=temp_project_dir)
+        files = updater.get_project_files(limit=50)
+
+        assert len(files) == 50
+        assert files[:2] == [pkg / "__init__.py", pkg / "core.py"]
+        assert all(f.parent == docs for f in files[2:])
+
+    def test_get_project_files_limit_stops_walk(self, temp_project_dir):
+        """Test that a limited walk does not list directories it does not need."""
+        for pkg in range(5):
+            pkg_dir = temp_project_dir / "src" / f"pkg{pkg}"
+            pkg_dir.mkdir(parents=True)
+            (pkg_dir / "mod.py").write_text("")
+
+        updater = DependencyUpdater(project_root=temp_project_dir)
+        with patch("hatch_agent.analyzers.updater.os.scandir", wraps=os.scandir) as scandir:
+            files = updater.get_project_files(limit=1)
+
+        assert files == [temp_project_dir / "src" / "pkg0" / "mod.py"]
+        # src and src/pkg0 only
+        assert scandir.call_count == 2
+
+
+class TestPyProjectIO:
+    """Test the shared pyproject.toml reader/writer."""
+
+    def test_shared_instance_parses_once(self, temp_project_dir):
+        """Test that a manager and an updater sharing one instance parse once."""
+        pyproject = temp_project_dir / "pyproject.toml"
+        pyproject.write_text('[project]\nname = "test"\ndependencies = ["requests>=2.0"]\n')
+        pyproject_io = PyProjectIO(pyproject)
+
+        manager = DependencyManager(temp_project_dir, pyproject_io=pyproject_io)
+        updater = DependencyUpdater(temp_project_dir, pyproject_io=pyproject_io)
+
+        with patch("hatch_agent.analyzers.updater.tomllib.load", wraps=tomllib.load) as mock_load:
+            manager.get_current_dependencies()
+            updater.get_current_version("requests")
+            manager.read_pyproject()
+
+        assert mock_load.call_count == 1
+
+    def test_save_forces_reload(self, temp_project_dir):
+        """Test that saving invalidates the cached parse."""
+        pyproject = temp_project_dir / "pyproject.toml"
+        pyproject.write_text('[project]\nname = "test"\ndependencies = []\n')
+        pyproject_io = PyProjectIO(pyproject)
+
+        manager = DependencyManager(temp_project_dir, pyproject_io=pyproject_io)
+        updater = DependencyUpdater(temp_project_dir, pyproject_io=pyproject_io)
+        manager.add_dependency("click", ">=8.0")
+
+        assert updater.get_current_version("click") == ">=8.0"
+
+    def test_missing_file(self, temp_project_dir):
+        """Test that a missing file raises FileNotFoundError."""
+        pyproject_io = PyProjectIO(temp_project_dir / "missing" / "pyproject.toml")
+
+        with pytest.raises(FileNotFoundError, match="pyproject.toml not found"):
+            pyproject_io.load()
+
+
+class TestDependencyUpdaterInstalledVersions:
+    """Test get_installed_versions method."""
+
+    def _updater_with_output(self, lines):
+        mock_app = MagicMock()
+        mock_env = MagicMock()
+        mock_env.run_shell_command.return_value = iter(lines)
+        mock_app.get_environment.return_value = mock_env
+        mock_app.project.config.envs = {"default": {}}
+        return DependencyUpdater(app=mock_app), mock_env
+
+    def test_get_installed_versions_single_call(self):
+        """Test that all packages are resolved from one pip show run."""
+        updater, env = self._updater_with_output(
+            [
+                "Name: requests",
+                "Version: 2.31.0",
+                "Summary: HTTP for Humans.",
+                "---",
+                "Name: typing_extensions",
+                "Version: 4.9.0",
+            ]
+        )
+
+        versions = updater.get_installed_versions(["requests", "typing-extensions", "missing"])
+
+        assert versions == {
+            "requests": "2.31.0",
+            "typing-extensions": "4.9.0",
+            "missing": None,
+        }
+        env.run_shell_command.assert_called_once_with(
+            ["pip", "show", "requests", "typing-extensions", "missing"]
+        )
+
+    def test_get_installed_version_uses_batch(self):
+        """Test that the single-package lookup is backed by the batch call."""
+        updater, _ = self._updater_with_output(["Name: Click", "Version: 8.1.7"])
+
+        assert updater.get_installed_version("click") == "8.1.7"
+
+    def test_get_installed_versions_no_envs(self):
+        """Test that missing environments yield no versions."""
+        mock_app = MagicMock()
+        mock_app.project.config.envs = {}
+
+        updater = DependencyUpdater(app=mock_app)
+
+        assert updater.get_installed_versions(["requests"]) == {"requests": None}
+
 
 class TestDependencyUpdaterSync:
     """Test sync_environment method."""
@@ -248,3 +725,102 @@ class TestDependencyUpdaterSync:
         assert result["success"] is True
         mock_env.remove.assert_called_once()
         mock_env.create.assert_called_once()
+
+    def test_sync_environment_upgrades_changed_packages(self):
+        """Test that known changes are upgraded without recreating the env."""
+        mock_app = MagicMock()
+        mock_env = MagicMock()
+        mock_env.exists.return_value = True
+        mock_env.dependencies = ("requests>=2.0", "pytest")
+        mock_env.construct_pip_install_command.side_effect = lambda args: ["pip", "install", *args]
+        mock_env.platform.run_command.return_value = MagicMock(returncode=0)
+        mock_app.get_environment.return_value = mock_env
+        mock_app.project.config.envs = {"default": {}}
+
+        updater = DependencyUpdater(app=mock_app)
+        result = updater.sync_environment(changed_packages=[("requests", ">=2.31.0")])
+
+        assert result["success"] is True
+        mock_env.platform.run_command.assert_called_once_with(
+            ["pip", "install", "--upgrade", "requests>=2.31.0"], capture_output=True
+        )
+        mock_env.remove.assert_not_called()
+        mock_env.create.assert_not_called()
+
+    def test_sync_environment_recreates_when_upgrade_fails(self):
+        """Test falling back to a full recreate when the upgrade fails."""
+        mock_app = MagicMock()
+        mock_env = MagicMock()
+        mock_env.exists.return_value = True
+        mock_env.dependencies = ("requests>=2.0",)
+        mock_env.platform.run_command.return_value = MagicMock(returncode=1)
+        mock_app.get_environment.return_value = mock_env
+        mock_app.project.config.envs = {"default": {}}
+
+        updater = DependencyUpdater(app=mock_app)
+        result = updater.sync_environment(changed_packages=[("requests", ">=2.31.0")])
+
+        assert result["success"] is True
+        mock_env.remove.assert_called_once()
+        mock_env.create.assert_called_once()
+
+    def test_sync_environment_recreates_non_virtual_env(self):
+        """Test that env types without pip support fall back to a full recreate."""
+        mock_app = MagicMock()
+        mock_env = MagicMock(spec=["exists", "remove", "create", "dependencies"])
+        mock_env.exists.return_value = True
+        mock_env.dependencies = ("requests>=2.0",)
+        mock_app.get_environment.return_value = mock_env
+        mock_app.project.config.envs = {"default": {}}
+
+        updater = DependencyUpdater(app=mock_app)
+        result = updater.sync_environment(changed_packages=[("requests", ">=2.31.0")])
+
+        assert result["success"] is True
+        mock_env.remove.assert_called_once()
+        mock_env.create.assert_called_once()
+
+    def test_sync_environment_skips_packages_outside_env(self):
+        """Test that optional-group packages the env does not use are not installed."""
+        mock_app = MagicMock()
+        mock_env = MagicMock()
+        mock_env.exists.return_value = True
+        mock_env.dependencies = ("Requests_Toolbelt>=1.0",)
+        mock_env.project_dependencies = ("requests[socks]>=2.0",)
+        mock_env.construct_pip_install_command.side_effect = lambda args: ["pip", "install", *args]
+        mock_env.platform.run_command.return_value = MagicMock(returncode=0)
+        mock_app.get_environment.return_value = mock_env
+        mock_app.project.config.envs = {"default": {}}
+
+        updater = DependencyUpdater(app=mock_app)
+        result = updater.sync_environment(
+            changed_packages=[
+                ("requests", ">=2.31.0"),
+                ("sphinx", ">=7.0"),
+                ("requests-toolbelt", ">=1.0.0"),
+            ]
+        )
+
+        assert result["success"] is True
+        mock_env.platform.run_command.assert_called_once_with(
+            ["pip", "install", "--upgrade", "requests>=2.31.0", "requests-toolbelt>=1.0.0"],
+            capture_output=True,
+        )
+        mock_env.create.assert_not_called()
+
+    def test_sync_environment_recreates_when_no_change_applies(self):
+        """Test that a full sync runs when none of the changes are env dependencies."""
+        mock_app = MagicMock()
+        mock_env = MagicMock()
+        mock_env.exists.return_value = True
+        mock_env.dependencies = ("requests>=2.0",)
+        mock_app.get_environment.return_value = mock_env
+        mock_app.project.config.envs = {"default": {}}
+
+        updater = DependencyUpdater(app=mock_app)
+        result = updater.sync_environment(changed_packages=[("sphinx", ">=7.0")])
+
+        assert result["success"] is True
+        mock_env.platform.run_command.assert_not_called()
+        mock_env.remove.assert_called_once()
+        mock_env.create.assert_called_once()
@@ -0,0 +1,11 @@
+"""Tests for cache module initialization."""
+
+
+class TestCacheInit:
+    """Test the cache module exports."""
+
+    def test_cache_module_importable(self):
+        """Test that cache module can be imported."""
+        import hatch_agent.cache
+
+        assert hatch_agent.cache is not None
@@ -0,0 +1,35 @@
+"""Tests for the shared SQLite cache base."""
+
+from hatch_agent.cache.base import SQLiteCache
+
+
+class _NotesCache(SQLiteCache):
+    _FILENAME = "notes.sqlite"
+    _SCHEMA = "CREATE TABLE IF NOT EXISTS notes (body TEXT NOT NULL)"
+
+
+class TestSQLiteCache:
+    """Test the connection lifecycle shared by all caches."""
+
+    def test_default_path_uses_filename(self, isolated_cache_dir):
+        """Test that subclasses only choose the file name under the cache dir."""
+        with _NotesCache(None, ttl=60) as cache:
+            assert cache._connect() is not None
+
+        assert (isolated_cache_dir / "notes.sqlite").exists()
+
+    def test_close_drops_connection(self, tmp_path):
+        """Test that leaving the context closes the connection and reopening works."""
+        cache = _NotesCache(str(tmp_path / "notes.sqlite"), ttl=60)
+        with cache:
+            conn = cache._connect()
+            assert cache._connect() is conn
+
+        assert cache._conn is None
+        assert cache._connect() is not None
+        cache.close()
+
+    def test_unusable_cache_dir_returns_none(self, unwritable_cache_dir):
+        """Test that a cache dir that cannot be created yields no connection."""
+        with _NotesCache(None, ttl=60) as cache:
+            assert cache._connect() is None
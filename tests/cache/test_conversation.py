@@ -0,0 +1,76 @@
+"""Tests for the conversation response cache."""
+
+import time
+from unittest.mock import patch
+
+from hatch_agent.cache.conversation import ConversationCache, make_key
+
+
+class TestMakeKey:
+    """Test conversation cache key derivation."""
+
+    def test_case_and_whitespace_are_ignored(self):
+        """Test that prompts differing only in case and spacing share a key."""
+        assert make_key("How do I add pytest?") == make_key("  how do i  add PYTEST? ")
+
+    def test_wording_changes_key(self):
+        """Test that negations and direction words are never treated as equal."""
+        assert make_key("add pytest") != make_key("remove pytest")
+        assert make_key("should I pin requests") != make_key("should I not pin requests")
+        assert make_key("upgrade django") != make_key("downgrade django")
+
+    def test_history_changes_key(self):
+        """Test that the same prompt after a different conversation misses."""
+        assert make_key("and then?") != make_key("and then?", [("add pytest", "done")])
+        assert make_key("and then?", [("add pytest", "done")]) != make_key(
+            "and then?", [("add ruff", "done")]
+        )
+
+
+class TestConversationCache:
+    """Test ConversationCache lookups."""
+
+    def test_repeated_prompt_hits(self, tmp_path):
+        """Test that the same prompt and history return the stored reply."""
+        history = [("hi", "hello")]
+        with ConversationCache(str(tmp_path / "cache.sqlite")) as cache:
+            cache.set("How do I add pytest?", "Run add-dep pytest", history)
+
+            assert cache.get("how do I add pytest?", history) == "Run add-dep pytest"
+            assert cache.get("How do I add pytest?") is None
+
+    def test_different_prompt_misses(self, tmp_path):
+        """Test that prompts sharing most of their words miss."""
+        with ConversationCache(str(tmp_path / "cache.sqlite")) as cache:
+            cache.set("add pytest", "answer")
+
+            assert cache.get("remove pytest") is None
+
+    def test_namespaces_are_isolated(self, tmp_path):
+        """Test that entries do not leak across sessions or namespaces."""
+        with ConversationCache(str(tmp_path / "cache.sqlite")) as cache:
+            cache.set("question", "answer", session_id="a", namespace="openai:gpt-4")
+
+            assert cache.get("question", session_id="b", namespace="openai:gpt-4") is None
+            assert cache.get("question", session_id="a", namespace="anthropic:x") is None
+            assert cache.get("question", session_id="a", namespace="openai:gpt-4") == "answer"
+
+    def test_expired_entries_miss(self, tmp_path):
+        """Test that entries older than the TTL are ignored."""
+        with ConversationCache(str(tmp_path / "cache.sqlite"), ttl=60) as cache:
+            cache.set("question", "answer")
+            with patch("hatch_agent.cache.conversation.time.time", return_value=time.time() + 120):
+                assert cache.get("question") is None
+
+    def test_default_path_uses_cache_dir(self, isolated_cache_dir):
+        """Test that the database lives under the hatch-agent cache dir."""
+        with ConversationCache() as cache:
+            cache.set("question", "answer")
+
+        assert (isolated_cache_dir / "conversation.sqlite").exists()
+
+    def test_unwritable_cache_dir_is_a_miss(self, unwritable_cache_dir):
+        """Test that a cache dir that cannot be created never raises."""
+        with ConversationCache() as cache:
+            cache.set("question", "answer")
+            assert cache.get("question") is None
@@ -0,0 +1,123 @@
+"""Tests for the exact-match response cache."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+from hatch_agent.cache.exact import ResponseCache, cached_run_task, make_key
+
+
+class TestMakeKey:
+    """Test cache key derivation."""
+
+    def test_context_key_order_is_irrelevant(self):
+        """Test that dict ordering does not change the key."""
+        assert make_key("openai", "gpt-4", "task", {"a": 1, "b": 2}) == make_key(
+            "openai", "gpt-4", "task", {"b": 2, "a": 1}
+        )
+
+    def test_inputs_change_key(self):
+        """Test that provider, model, task and context all feed the key."""
+        base = make_key("openai", "gpt-4", "task", {"a": 1})
+        assert make_key("anthropic", "gpt-4", "task", {"a": 1}) != base
+        assert make_key("openai", "gpt-4o", "task", {"a": 1}) != base
+        assert make_key("openai", "gpt-4", "other", {"a": 1}) != base
+        assert make_key("openai", "gpt-4", "task", {"a": 2}) != base
+
+
+class TestResponseCache:
+    """Test ResponseCache storage."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a stored result is returned."""
+        with ResponseCache(str(tmp_path / "cache.sqlite")) as cache:
+            cache.set("k", {"success": True, "selected_suggestion": "x"})
+            assert cache.get("k") == {"success": True, "selected_suggestion": "x"}
+            assert cache.get("missing") is None
+
+    def test_expired_entry_misses(self, tmp_path):
+        """Test that entries older than the TTL are ignored."""
+        with ResponseCache(str(tmp_path / "cache.sqlite"), ttl=60) as cache:
+            cache.set("k", {"success": True})
+            with patch("hatch_agent.cache.exact.time.time", return_value=time.time() + 120):
+                assert cache.get("k") is None
+
+    def test_stale_lookup_returns_expired_entry(self, tmp_path):
+        """Test that stale=True ignores the TTL."""
+        with ResponseCache(str(tmp_path / "cache.sqlite"), ttl=60) as cache:
+            cache.set("k", {"success": True})
+            with patch("hatch_agent.cache.exact.time.time", return_value=time.time() + 120):
+                assert cache.get("k", stale=True) == {"success": True}
+
+    def test_unserializable_result_is_skipped(self, tmp_path):
+        """Test that results that are not JSON are not stored."""
+        with ResponseCache(str(tmp_path / "cache.sqlite")) as cache:
+            cache.set("k", {"success": True, "obj": object()})
+            assert cache.get("k") is None
+
+    def test_unwritable_cache_dir_is_a_miss(self, unwritable_cache_dir):
+        """Test that a cache dir that cannot be created never raises."""
+        with ResponseCache() as cache:
+            cache.set("k", {"success": True})
+            assert cache.get("k") is None
+
+
+class TestCachedRunTask:
+    """Test cached_run_task."""
+
+    def _agent(self, result):
+        agent = MagicMock()
+        agent.run_task.return_value = result
+        return agent
+
+    def test_second_call_hits(self):
+        """Test that an identical call is served from the cache."""
+        agent = self._agent({"success": True, "selected_suggestion": "fix it"})
+
+        first = cached_run_task(agent, "task", {"a": 1}, "openai", "gpt-4")
+        second = cached_run_task(agent, "task", {"a": 1}, "openai", "gpt-4")
+
+        assert agent.run_task.call_count == 1
+        assert "cached" not in first
+        assert second["cached"] is True
+        assert second["selected_suggestion"] == "fix it"
+
+    def test_prepare_runs_only_on_miss(self):
+        """Test that the prepare callback is skipped when the cache answers."""
+        agent = self._agent({"success": True})
+        prepare = MagicMock()
+
+        cached_run_task(agent, "task", {}, "openai", "gpt-4", prepare=prepare)
+        cached_run_task(agent, "task", {}, "openai", "gpt-4", prepare=prepare)
+        cached_run_task(agent, "task", {}, "openai", "gpt-4", enabled=False, prepare=prepare)
+
+        assert prepare.call_count == 2
+        assert agent.run_task.call_count == 2
+
+    def test_failures_are_not_cached(self):
+        """Test that failed runs are retried."""
+        agent = self._agent({"success": False, "output": "error"})
+
+        cached_run_task(agent, "task", {}, "openai", "gpt-4")
+        cached_run_task(agent, "task", {}, "openai", "gpt-4")
+
+        assert agent.run_task.call_count == 2
+
+    def test_disabled(self, isolated_cache_dir):
+        """Test that a disabled cache neither reads nor writes."""
+        agent = self._agent({"success": True})
+
+        cached_run_task(agent, "task", {}, "openai", "gpt-4", enabled=False)
+        cached_run_task(agent, "task", {}, "openai", "gpt-4", ttl=0)
+
+        assert agent.run_task.call_count == 2
+        assert not (isolated_cache_dir / "responses.sqlite").exists()
+
+    def test_unwritable_cache_dir_runs_agent(self, unwritable_cache_dir):
+        """Test that an unusable cache falls back to running the agent."""
+        agent = self._agent({"success": True, "selected_suggestion": "fix it"})
+
+        first = cached_run_task(agent, "task", {}, "openai", "gpt-4")
+        second = cached_run_task(agent, "task", {}, "openai", "gpt-4")
+
+        assert agent.run_task.call_count == 2
+        assert first == second == {"success": True, "selected_suggestion": "fix it"}
@@ -124,6 +124,16 @@ class TestExtractDependencyInfo:
 
         assert info is None
 
+    def test_extract_ignores_trailing_text(self):
+        """Test that text after the JSON object is not parsed."""
+        suggestion = (
+            'ACTION:\n```json\n{"package": "requests", "extras": {"socks": true}}\n```\n'
+            "Let me know if you need {anything} else."
+        )
+        info = _extract_dependency_info(suggestion)
+
+        assert info == {"package": "requests", "extras": {"socks": True}}
+
 
 class TestAddDependencyCommand:
     """Test add dependency command."""
@@ -91,13 +91,15 @@ class TestChatCLI:
         ):
             mock_load_config.return_value = {}
             mock_agent = MagicMock()
-            mock_agent.chat.return_value = "Response"
+            mock_agent.chat_stream.return_value = iter(["Res", "ponse"])
             mock_agent_class.return_value = mock_agent
 
-            cli_runner.invoke(chat, ["--single-agent"], input="test\nexit\n")
+            result = cli_runner.invoke(chat, ["--single-agent"], input="test\nexit\n")
 
             call_kwargs = mock_agent_class.call_args[1]
             assert call_kwargs["use_multi_agent"] is False
+            assert "Agent> Response" in result.output
+            assert "Thinking" not in result.output
 
     def test_chat_displays_welcome(self, cli_runner):
         """Test chat displays welcome message."""
@@ -115,6 +117,78 @@ class TestChatCLI:
             assert "Interactive Chat" in result.output
 
 
+class TestChatCache:
+    """Test chat response caching."""
+
+    _INPUT = "How do I add pytest?\nAnd ruff?\nexit\n"
+
+    def _invoke(self, args, agent):
+        with (
+            patch.object(chat_module, "load_config", return_value={}),
+            patch.object(chat_module, "Agent", return_value=agent),
+        ):
+            return CliRunner().invoke(chat, args, input=self._INPUT)
+
+    def test_cache_is_off_by_default(self):
+        """Test that repeated sessions call the agent unless --cache is given."""
+        agent = MagicMock()
+        agent.run_task.return_value = {"success": True, "selected_suggestion": "Use add-dep"}
+
+        self._invoke([], agent)
+        result = self._invoke([], agent)
+
+        assert agent.run_task.call_count == 4
+        assert "[cached]" not in result.output
+
+    def test_repeated_conversation_served_from_cache(self):
+        """Test that replaying the same conversation does not call the agent again."""
+        agent = MagicMock()
+        agent.run_task.return_value = {"success": True, "selected_suggestion": "Use add-dep"}
+
+        self._invoke(["--cache"], agent)
+        result = self._invoke(["--cache"], agent)
+
+        assert agent.run_task.call_count == 2
+        assert result.output.count("[cached]") == 2
+
+    def test_repeated_question_in_new_context_misses(self):
+        """Test that the same question after a different history reaches the agent."""
+        agent = MagicMock()
+        agent.run_task.return_value = {"success": True, "selected_suggestion": "Use add-dep"}
+
+        self._invoke(["--cache"], agent)
+        with (
+            patch.object(chat_module, "load_config", return_value={}),
+            patch.object(chat_module, "Agent", return_value=agent),
+        ):
+            result = CliRunner().invoke(chat, ["--cache"], input="And ruff?\nexit\n")
+
+        assert agent.run_task.call_count == 3
+        assert "[cached]" not in result.output
+
+    def test_unwritable_cache_dir(self, unwritable_cache_dir):
+        """Test that --cache with an unusable cache dir still answers."""
+        agent = MagicMock()
+        agent.run_task.return_value = {"success": True, "selected_suggestion": "Use add-dep"}
+
+        result = self._invoke(["--cache"], agent)
+
+        assert result.exit_code == 0
+        assert agent.run_task.call_count == 2
+
+    def test_streamed_reply_is_cached(self):
+        """Test that a streamed single-agent reply is cached once complete."""
+        agent = MagicMock()
+        agent.chat_stream.side_effect = lambda msg: iter(["Use ", "add-dep"])
+
+        self._invoke(["--single-agent", "--cache"], agent)
+        result = self._invoke(["--single-agent", "--cache"], agent)
+
+        assert agent.chat_stream.call_count == 2
+        assert result.output.count("Use add-dep") == 2
+        assert result.output.count("[cached]") == 2
+
+
 class TestChatCommand:
     """Test interactive chat command."""
 
@@ -160,3 +234,67 @@ class TestChatWithLLM:
         """Test chat using Google AI."""
         response = mock_google_client.generate_content("Hello")
         assert response.text
+
+
+class TestChatInput:
+    """Test chat input reader selection."""
+
+    def test_prompt_toolkit_used_on_tty(self, tmp_path, monkeypatch):
+        """Test that interactive terminals get a prompt_toolkit session."""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        with (
+            patch.object(chat_module.sys.stdin, "isatty", return_value=True),
+            patch("prompt_toolkit.PromptSession") as mock_session_class,
+            patch("prompt_toolkit.history.FileHistory") as mock_history,
+        ):
+            mock_session_class.return_value.prompt.return_value = "hello"
+            read_input = chat_module._input_reader()
+
+            assert read_input() == "hello"
+
+        mock_history.assert_called_once_with(
+            str(tmp_path / "hatch-agent" / chat_module.PROMPT_HISTORY_FILE)
+        )
+
+    def test_falls_back_without_prompt_toolkit(self):
+        """Test that readline history is used when prompt_toolkit is missing."""
+        with (
+            patch.object(chat_module.sys.stdin, "isatty", return_value=True),
+            patch.dict("sys.modules", {"prompt_toolkit": None}),
+            patch.object(chat_module, "_enable_history") as mock_enable,
+        ):
+            chat_module._input_reader()
+
+        mock_enable.assert_called_once()
+
+
+class TestChatHistory:
+    """Test readline history handling."""
+
+    def test_history_skipped_without_tty(self):
+        """Test that non-interactive input never touches readline."""
+        with (
+            patch.object(chat_module.sys.stdin, "isatty", return_value=False),
+            patch.object(chat_module.atexit, "register") as mock_register,
+        ):
+            chat_module._enable_history()
+
+        mock_register.assert_not_called()
+
+    def test_history_loaded_and_saved(self, tmp_path, monkeypatch):
+        """Test that history is read from and written to the config dir."""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        mock_readline = MagicMock()
+        with (
+            patch.object(chat_module.sys.stdin, "isatty", return_value=True),
+            patch.dict("sys.modules", {"readline": mock_readline}),
+            patch.object(chat_module.atexit, "register") as mock_register,
+        ):
+            chat_module._enable_history()
+
+        history_path = str(tmp_path / "hatch-agent" / "chat_history")
+        mock_readline.read_history_file.assert_called_once_with(history_path)
+
+        save, *args = mock_register.call_args[0]
+        save(*args)
+        mock_readline.write_history_file.assert_called_once_with(history_path)
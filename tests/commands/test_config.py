@@ -16,17 +16,26 @@ class TestGenerateConfigCLI:
         """Create a Click CLI runner."""
         return CliRunner()
 
-    @patch("hatch_agent.commands.config.write_config")
-    def test_generate_config_default(self, mock_write, cli_runner, temp_project_dir):
+    @patch("hatch_agent.commands.config.generate_default_config")
+    def test_generate_config_default(self, mock_generate, cli_runner, temp_project_dir):
         """Test generating default config."""
-        mock_write.return_value = True
+        mock_generate.return_value = True
         config_file = temp_project_dir / "config.toml"
 
         result = cli_runner.invoke(generate_config, ["--path", str(config_file)])
 
         assert result.exit_code == 0
         assert "Configuration written" in result.output
-        mock_write.assert_called_once()
+        mock_generate.assert_called_once_with(str(config_file))
+
+    def test_generate_config_default_writes_file(self, cli_runner, temp_project_dir):
+        """Test that the default config is written to disk."""
+        config_file = temp_project_dir / "config.toml"
+
+        result = cli_runner.invoke(generate_config, ["--path", str(config_file)])
+
+        assert result.exit_code == 0
+        assert 'provider = "mock"' in config_file.read_text()
 
     @patch("hatch_agent.commands.config.write_config")
     def test_generate_config_with_provider(self, mock_write, cli_runner, temp_project_dir):
@@ -54,7 +63,7 @@ class TestGenerateConfigCLI:
         assert result.exit_code == 0
         mock_write.assert_called_once()
 
-    @patch("hatch_agent.commands.config.write_config")
+    @patch("hatch_agent.commands.config.generate_default_config")
     def test_generate_config_write_failure(self, mock_write, cli_runner, temp_project_dir):
         """Test handling write failure."""
         mock_write.return_value = False
@@ -1,6 +1,7 @@
 """Tests for doctor command."""
 
 import importlib
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -144,6 +145,127 @@ class TestDoctorCLI:
 
             assert result.exit_code != 0 or "failed" in result.output.lower()
 
+    def _run_twice(self, cli_runner, temp_project_dir, *args):
+        with (
+            patch.object(doctor_module, "ProjectDoctor") as mock_doctor_class,
+            patch.object(doctor_module, "load_config") as mock_load_config,
+            patch.object(doctor_module, "Agent") as mock_agent_class,
+        ):
+            mock_doc = MagicMock()
+            mock_doc.run_all_checks.return_value = {
+                "checks": [],
+                "summary": {"passed": 0, "warned": 0, "failed": 0},
+            }
+            mock_doctor_class.return_value = mock_doc
+            mock_load_config.return_value = {"model": "gpt-4"}
+
+            mock_agent = MagicMock()
+            mock_agent.run_task.return_value = {
+                "success": True,
+                "selected_suggestion": "Keep going",
+                "selected_agent": "ConfigSpecialist",
+                "reasoning": "All good",
+            }
+            mock_agent_class.return_value = mock_agent
+
+            argv = ["--project-root", str(temp_project_dir), *args]
+            first = cli_runner.invoke(doctor, argv)
+            second = cli_runner.invoke(doctor, argv)
+        return mock_agent, first, second
+
+    def test_doctor_reuses_cached_result(self, cli_runner, temp_project_dir):
+        """Test that an identical second run is answered from the cache."""
+        mock_agent, first, second = self._run_twice(cli_runner, temp_project_dir)
+
+        assert first.exit_code == 0
+        assert second.exit_code == 0
+        assert mock_agent.run_task.call_count == 1
+        assert "Keep going" in second.output
+        assert "cached result" in second.output
+
+    def test_doctor_no_cache(self, cli_runner, temp_project_dir):
+        """Test that --no-cache always consults the agents."""
+        mock_agent, _, second = self._run_twice(cli_runner, temp_project_dir, "--no-cache")
+
+        assert second.exit_code == 0
+        assert mock_agent.run_task.call_count == 2
+        assert "cached result" not in second.output
+
+    def test_doctor_verbose_shows_prompt_cache_usage(self, cli_runner, temp_project_dir):
+        """Test that --verbose reports prompt cache token counts."""
+        with (
+            patch.object(doctor_module, "ProjectDoctor") as mock_doctor_class,
+            patch.object(doctor_module, "load_config") as mock_load_config,
+            patch.object(doctor_module, "Agent") as mock_agent_class,
+        ):
+            mock_doctor_class.return_value.run_all_checks.return_value = {
+                "checks": [],
+                "summary": {"passed": 0, "warned": 0, "failed": 0},
+            }
+            mock_load_config.return_value = {}
+            mock_agent_class.return_value.run_task.return_value = {
+                "success": True,
+                "selected_suggestion": "Keep going",
+                "usage": {"inputTokens": 1200, "cacheReadInputTokens": 900},
+            }
+
+            result = cli_runner.invoke(
+                doctor, ["--project-root", str(temp_project_dir), "--verbose", "--no-cache"]
+            )
+
+        assert result.exit_code == 0
+        assert "900 read from prompt cache" in result.output
+
+
+class TestDoctorAgentSetup:
+    """Test that agent setup overlaps the checks."""
+
+    def test_config_loads_while_checks_run(self, temp_project_dir):
+        """Test that load_config runs concurrently with run_all_checks."""
+        config_loaded = threading.Event()
+
+        def run_all_checks():
+            # Only returns promptly if the config is loaded in the background
+            assert config_loaded.wait(timeout=5)
+            return {"checks": [], "summary": {"passed": 0, "warned": 0, "failed": 0}}
+
+        def load(config):
+            config_loaded.set()
+            return {}
+
+        with (
+            patch.object(doctor_module, "ProjectDoctor") as mock_doctor_class,
+            patch.object(doctor_module, "load_config", side_effect=load),
+            patch.object(doctor_module, "Agent") as mock_agent_class,
+        ):
+            mock_doctor_class.return_value.run_all_checks.side_effect = run_all_checks
+            mock_agent_class.return_value.run_task.return_value = {"success": True}
+
+            result = CliRunner().invoke(
+                doctor, ["--project-root", str(temp_project_dir), "--no-cache"]
+            )
+
+        assert result.exit_code == 0
+        assert "RECOMMENDATIONS" in result.output
+
+    def test_no_ai_skips_config(self, temp_project_dir):
+        """Test that --no-ai never loads the agent configuration."""
+        with (
+            patch.object(doctor_module, "ProjectDoctor") as mock_doctor_class,
+            patch.object(doctor_module, "load_config") as mock_load_config,
+        ):
+            mock_doctor_class.return_value.run_all_checks.return_value = {
+                "checks": [],
+                "summary": {"passed": 0, "warned": 0, "failed": 0},
+            }
+
+            result = CliRunner().invoke(
+                doctor, ["--project-root", str(temp_project_dir), "--no-ai"]
+            )
+
+        assert result.exit_code == 0
+        mock_load_config.assert_not_called()
+
 
 class TestBuildDoctorTask:
     """Test _build_doctor_task helper."""
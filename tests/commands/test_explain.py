@@ -143,6 +143,17 @@ class TestBuildExplanationTask:
         task = _build_explanation_task(context)
         assert "Type checking errors" in task
 
+    def test_build_task_bounds_long_output(self):
+        """Test that only the start of long output is quoted in the task."""
+        context = {
+            "test_result": {"success": False, "exit_code": 1, "stderr": "E" * 10_000},
+            "format_result": {"success": True},
+            "type_result": {"success": True},
+        }
+        task = _build_explanation_task(context)
+        assert "E" * 500 in task
+        assert "E" * 501 not in task
+
 
 class TestExplainCommand:
     """Test explain command."""
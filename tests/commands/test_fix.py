@@ -1,6 +1,8 @@
 """Tests for fix command."""
 
 import importlib
+import json
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -10,6 +12,10 @@ fix_module = importlib.import_module("hatch_agent.commands.fix")
 fix = fix_module.fix
 _build_fix_task = fix_module._build_fix_task
 _extract_fix_plan = fix_module._extract_fix_plan
+_read_sources = fix_module._read_sources
+_splice_fixes = fix_module._splice_fixes
+_planned_fixes = fix_module._planned_fixes
+PlannedFix = fix_module.PlannedFix
 
 
 class TestFixCLI:
@@ -135,6 +141,49 @@ class TestFixCLI:
             assert result.exit_code == 0
             assert "PROPOSED FIXES" in result.output
 
+    def test_fix_writes_each_file_once(self, cli_runner, temp_project_dir):
+        """Test all fixes to one file are applied with a single write."""
+        src_dir = temp_project_dir / "src"
+        src_dir.mkdir()
+        (src_dir / "test.py").write_text("a = 1\nb = 2\n")
+
+        plan = {
+            "fixes": [
+                {"file": "src/test.py", "line": 1, "original": "a = 1", "fixed": "a = 10"},
+                {"file": "src/test.py", "line": 2, "original": "b = 2", "fixed": "b = 20"},
+            ]
+        }
+
+        with (
+            patch.object(fix_module, "BuildFixer") as mock_fixer_class,
+            patch.object(fix_module, "load_config") as mock_load_config,
+            patch.object(fix_module, "Agent") as mock_agent_class,
+        ):
+            mock_fixer = MagicMock()
+            mock_fixer.run_autofix.return_value = {"success": True, "files_fixed": 0}
+            mock_fixer.get_remaining_errors.return_value = [
+                {"file": "src/test.py", "line": "1", "code": "X1", "message": "m", "tool": "ruff"}
+            ]
+            mock_fixer.apply_fix.return_value = {"success": True}
+            mock_fixer.run_tests.return_value = {"success": True}
+            mock_fixer_class.return_value = mock_fixer
+            mock_load_config.return_value = {}
+
+            mock_agent = MagicMock()
+            mock_agent.run_task.return_value = {
+                "success": True,
+                "selected_suggestion": f"FIX_PLAN:\n{json.dumps(plan)}",
+                "selected_agent": "WorkflowSpecialist",
+            }
+            mock_agent_class.return_value = mock_agent
+
+            result = cli_runner.invoke(fix, ["--project-root", str(temp_project_dir)], input="y\n")
+
+        assert result.exit_code == 0
+        assert "Applied 2 fix(es)" in result.output
+        mock_fixer.apply_fix.assert_called_once()
+        assert mock_fixer.apply_fix.call_args.args[1:] == ("a = 1\nb = 2\n", "a = 10\nb = 20\n")
+
 
 class TestExtractFixPlan:
     """Test _extract_fix_plan helper."""
@@ -168,6 +217,132 @@ class TestExtractFixPlan:
         assert _extract_fix_plan("FIX_PLAN:\n{invalid json}") is None
 
 
+class TestFixAgentSetup:
+    """Test that agent setup overlaps the ruff and mypy runs."""
+
+    def test_config_loads_while_errors_are_collected(self, temp_project_dir):
+        """Test that load_config runs concurrently with get_remaining_errors."""
+        config_loaded = threading.Event()
+
+        def get_remaining_errors():
+            # Only returns promptly if the config is loaded in the background
+            assert config_loaded.wait(timeout=5)
+            return [{"file": "a.py", "line": "1", "code": "X1", "message": "m", "tool": "ruff"}]
+
+        def load(config):
+            config_loaded.set()
+            return {}
+
+        with (
+            patch.object(fix_module, "BuildFixer") as mock_fixer_class,
+            patch.object(fix_module, "load_config", side_effect=load),
+            patch.object(fix_module, "Agent") as mock_agent_class,
+        ):
+            mock_fixer = mock_fixer_class.return_value
+            mock_fixer.get_remaining_errors.side_effect = get_remaining_errors
+            mock_agent_class.return_value.run_task.return_value = {
+                "success": True,
+                "selected_suggestion": "Manual fix needed",
+            }
+
+            result = CliRunner().invoke(
+                fix, ["--project-root", str(temp_project_dir), "--no-autofix"]
+            )
+
+        assert result.exit_code == 0
+        assert "PROPOSED FIXES" in result.output
+
+    def test_dry_run_skips_config(self, temp_project_dir):
+        """Test that --dry-run never loads the agent configuration."""
+        with (
+            patch.object(fix_module, "BuildFixer") as mock_fixer_class,
+            patch.object(fix_module, "load_config") as mock_load_config,
+        ):
+            mock_fixer_class.return_value.get_remaining_errors.return_value = [
+                {"file": "a.py", "line": "1", "code": "X1", "message": "m", "tool": "ruff"}
+            ]
+
+            result = CliRunner().invoke(
+                fix, ["--project-root", str(temp_project_dir), "--no-autofix", "--dry-run"]
+            )
+
+        assert result.exit_code == 0
+        assert "DRY RUN" in result.output
+        mock_load_config.assert_not_called()
+
+
+class TestPlannedFixes:
+    """Test _planned_fixes helper."""
+
+    def test_defaults_missing_fields(self):
+        fixes = _planned_fixes({"fixes": [{"file": "a.py", "original": "x", "fixed": "y"}]})
+        assert fixes == [
+            PlannedFix(file="a.py", line="?", description="N/A", original="x", fixed="y")
+        ]
+
+    def test_drops_malformed_entries(self):
+        fixes = _planned_fixes({"fixes": ["not a fix", {"line": 3}]})
+        assert fixes == [PlannedFix(file="", line=3, description="N/A", original="", fixed="")]
+
+    def test_no_plan(self):
+        assert _planned_fixes(None) == []
+        assert _planned_fixes({"fixes": "nope"}) == []
+
+
+class TestSpliceFixes:
+    """Test _splice_fixes helper."""
+
+    def test_applies_independent_fixes(self):
+        content, matched = _splice_fixes("a = 1\nb = 2\n", [("b = 2", "b = 20"), ("a = 1", "a=1")])
+        assert content == "a=1\nb = 20\n"
+        assert matched == [True, True]
+
+    def test_repeated_original_replaces_successive_occurrences(self):
+        content, matched = _splice_fixes("x\nx\nx\n", [("x", "y"), ("x", "z")])
+        assert content == "y\nz\nx\n"
+        assert matched == [True, True]
+
+    def test_applies_dependent_fixes_in_order(self):
+        content, matched = _splice_fixes(
+            "import os\nx = 1\n", [("x = 1", "x = 2"), ("x = 2\n", "x = 2\ny = x\n")]
+        )
+        assert content == "import os\nx = 2\ny = x\n"
+        assert matched == [True, True]
+
+    def test_reports_missing_and_overlapping_originals(self):
+        content, matched = _splice_fixes(
+            "abc def", [("abc", "ABC"), ("bc d", "BCD"), ("missing", "m")]
+        )
+        assert content == "ABC def"
+        assert matched == [True, False, False]
+
+
+class TestReadSources:
+    """Test _read_sources helper."""
+
+    def test_reads_each_file_once_in_order(self, tmp_path):
+        (tmp_path / "b.py").write_text("b = 1\n")
+        (tmp_path / "a.py").write_text("a = 1\n")
+        paths = [tmp_path / "b.py", tmp_path / "a.py", tmp_path / "b.py"]
+
+        with patch.object(fix_module, "_read_source", wraps=fix_module._read_source) as mock_read:
+            files = _read_sources(paths)
+
+        assert list(files) == [str(tmp_path / "b.py"), str(tmp_path / "a.py")]
+        assert files[str(tmp_path / "a.py")] == "a = 1\n"
+        assert mock_read.call_count == 2
+
+    def test_skips_missing_files(self, tmp_path):
+        (tmp_path / "a.py").write_text("a = 1\n")
+
+        files = _read_sources([tmp_path / "missing.py", tmp_path / "a.py"])
+
+        assert list(files) == [str(tmp_path / "a.py")]
+
+    def test_no_paths(self):
+        assert _read_sources([]) == {}
+
+
 class TestBuildFixTask:
     """Test _build_fix_task helper."""
 
@@ -188,6 +363,17 @@ class TestBuildFixTask:
         assert "src/a.py" in task
         assert "FIX_PLAN:" in task
 
+    def test_limits_file_snippets(self):
+        files = {f"src/m{i}.py": f"# m{i}\n" + "x" * 2000 for i in range(7)}
+        task = _build_fix_task([], files)
+
+        assert task.count("\n\n--- src/m") == 5
+        assert "src/m5.py" not in task
+        assert "x" * 1500 not in task
+        assert task.endswith(
+            '5. The "fixed" field must contain ONLY the corrected version of that text'
+        )
+
 
 class TestBuildFixer:
     """Test BuildFixer analyzer methods directly."""
@@ -1,6 +1,8 @@
 """Tests for migrate command."""
 
 import importlib
+import json
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -9,6 +11,9 @@ from click.testing import CliRunner
 migrate_module = importlib.import_module("hatch_agent.commands.migrate")
 migrate = migrate_module.migrate
 _extract_migration_plan = migrate_module._extract_migration_plan
+_dump_bounded = migrate_module._dump_bounded
+_backup_file = migrate_module._backup_file
+_parse_source = migrate_module._parse_source
 
 
 class TestMigrateCLI:
@@ -122,6 +127,128 @@ MIGRATION_PLAN:
         assert _extract_migration_plan("MIGRATION_PLAN:\n{bad json}") is None
 
 
+class TestDumpBounded:
+    """Test _dump_bounded helper."""
+
+    def test_matches_truncated_json_dumps(self):
+        data = {"deps": [f"pkg{i}>=1.{i}" for i in range(500)], "path": Path("/x"), "n": None}
+        for limit in (0, 10, 2000, 10**6):
+            assert _dump_bounded(data, limit) == json.dumps(data, indent=2, default=str)[:limit]
+
+    def test_handles_wide_ints_and_non_str_keys(self):
+        data = {"big": 2**70, 1: "non-str key"}
+        assert _dump_bounded(data, 10**6) == json.dumps(data, indent=2, default=str)
+
+    def test_stops_encoding_at_limit(self):
+        data = {"deps": [f"pkg{i}" for i in range(10_000)]}
+        encoder = json.JSONEncoder(indent=2, default=str)
+        consumed = []
+
+        def tracking_iterencode(obj):
+            for chunk in encoder.iterencode(obj):
+                consumed.append(chunk)
+                yield chunk
+
+        with patch.object(migrate_module, "_PROMPT_ENCODER") as mock_encoder:
+            mock_encoder.iterencode.side_effect = tracking_iterencode
+            assert len(_dump_bounded(data, 100)) == 100
+
+        assert len(consumed) < 100
+
+
+class TestParseSource:
+    """Test _parse_source helper."""
+
+    def test_setuptools_prefers_setup_cfg(self):
+        migrator = MagicMock()
+        migrator.parse_setup_py.return_value = {"name": "py", "version": "1.0"}
+        migrator.parse_setup_cfg.return_value = {"name": "cfg"}
+
+        assert _parse_source(migrator, "setuptools") == {"name": "cfg", "version": "1.0"}
+
+    def test_setuptools_ignores_setup_cfg_error(self):
+        migrator = MagicMock()
+        migrator.parse_setup_py.return_value = {"name": "py"}
+        migrator.parse_setup_cfg.return_value = {"error": "setup.cfg not found"}
+
+        assert _parse_source(migrator, "setuptools") == {"name": "py"}
+
+
+class TestBackupFile:
+    """Test _backup_file helper."""
+
+    def test_backup_survives_rewrite(self, tmp_path):
+        from hatch_agent.analyzers.migrate import ProjectMigrator
+
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text('[project]\nname = "old"\n')
+        backup = tmp_path / "pyproject.toml.bak"
+        backup.write_text("stale")
+
+        _backup_file(pyproject, backup)
+        ProjectMigrator(tmp_path).write_pyproject({"project": {"name": "new"}})
+
+        assert backup.read_text() == '[project]\nname = "old"\n'
+        assert 'name = "new"' in pyproject.read_text()
+        assert not (tmp_path / "pyproject.toml.tmp").exists()
+
+    def test_falls_back_to_copy(self, tmp_path):
+        source = tmp_path / "pyproject.toml"
+        source.write_text("content")
+        backup = tmp_path / "pyproject.toml.bak"
+
+        with patch.object(migrate_module.os, "link", side_effect=OSError("no links")):
+            _backup_file(source, backup)
+
+        assert backup.read_text() == "content"
+        assert backup.stat().st_ino != source.stat().st_ino
+
+
+class TestWritePyproject:
+    """Test ProjectMigrator.write_pyproject."""
+
+    def test_preserves_file_mode(self, tmp_path):
+        from hatch_agent.analyzers.migrate import ProjectMigrator
+
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text('[project]\nname = "old"\n')
+        pyproject.chmod(0o640)
+
+        ProjectMigrator(tmp_path).write_pyproject({"project": {"name": "new"}})
+
+        assert pyproject.stat().st_mode & 0o777 == 0o640
+        assert 'name = "new"' in pyproject.read_text()
+
+    def test_keeps_symlink(self, tmp_path):
+        from hatch_agent.analyzers.migrate import ProjectMigrator
+
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        target = shared / "pyproject.toml"
+        target.write_text('[project]\nname = "old"\n')
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "pyproject.toml").symlink_to(target)
+
+        ProjectMigrator(project).write_pyproject({"project": {"name": "new"}})
+
+        assert (project / "pyproject.toml").is_symlink()
+        assert 'name = "new"' in target.read_text()
+        assert not (shared / "pyproject.toml.tmp").exists()
+
+    def test_removes_temp_file_on_failure(self, tmp_path):
+        from hatch_agent.analyzers.migrate import ProjectMigrator
+
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text('[project]\nname = "old"\n')
+
+        with pytest.raises(TypeError):
+            ProjectMigrator(tmp_path).write_pyproject({"project": {"name": object()}})
+
+        assert pyproject.read_text() == '[project]\nname = "old"\n'
+        assert not (tmp_path / "pyproject.toml.tmp").exists()
+
+
 class TestProjectMigrator:
     """Test ProjectMigrator analyzer directly."""
 
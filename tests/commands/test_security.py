@@ -1,6 +1,7 @@
 """Tests for security command."""
 
 import importlib
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -35,6 +36,17 @@ class TestSecurityCLI:
             assert result.exit_code == 0
             assert "No known vulnerabilities" in result.output
 
+    def test_security_closes_auditor_when_audit_fails(self, cli_runner, temp_project_dir):
+        """Test that the auditor's HTTP session is closed even if the audit raises."""
+        with patch.object(security_module, "SecurityAuditor") as mock_auditor_class:
+            mock_auditor = mock_auditor_class.return_value
+            mock_auditor.run_audit.side_effect = RuntimeError("boom")
+
+            result = cli_runner.invoke(security, ["--project-root", str(temp_project_dir)])
+
+            assert isinstance(result.exception, RuntimeError)
+            mock_auditor.close.assert_called_once_with()
+
     def test_security_with_vulns(self, cli_runner, temp_project_dir):
         """Test security command with vulnerabilities found."""
         with (
@@ -108,6 +120,67 @@ class TestSecurityCLI:
             assert "SECURITY ANALYSIS" not in result.output
             assert "urllib3" in result.output
 
+    def test_security_no_cache(self, cli_runner, temp_project_dir):
+        """Test --no-cache disables the OSV cache."""
+        with patch.object(security_module, "SecurityAuditor") as mock_auditor_class:
+            mock_auditor_class.return_value.run_audit.return_value = {
+                "vulnerabilities": [],
+                "summary": {"critical": 0, "high": 0, "medium": 0, "low": 0, "unknown": 0},
+                "packages_checked": 0,
+            }
+
+            result = cli_runner.invoke(
+                security, ["--project-root", str(temp_project_dir), "--no-cache"]
+            )
+
+        assert result.exit_code == 0
+        assert mock_auditor_class.call_args.kwargs["cache_ttl"] == 0
+
+    @pytest.mark.parametrize(
+        ("count", "isatty", "paged"), [(25, True, True), (25, False, False), (3, True, False)]
+    )
+    def test_security_pages_long_reports_on_tty(
+        self, cli_runner, temp_project_dir, count, isatty, paged
+    ):
+        """Test that only long reports on a terminal go through the pager."""
+        vulns = [
+            {
+                "package": f"pkg{i}",
+                "installed_version": "1.0",
+                "vuln_id": f"GHSA-{i}",
+                "severity": "low",
+                "summary": "Issue",
+                "fixed_in": None,
+                "url": None,
+                "source": "osv",
+            }
+            for i in range(count)
+        ]
+        mock_sys = MagicMock()
+        mock_sys.stdout.isatty.return_value = isatty
+        with (
+            patch.object(security_module, "SecurityAuditor") as mock_auditor_class,
+            patch.object(security_module, "sys", mock_sys),
+            patch.object(security_module.click, "echo_via_pager") as mock_pager,
+        ):
+            mock_auditor_class.return_value.run_audit.return_value = {
+                "vulnerabilities": vulns,
+                "summary": {"critical": 0, "high": 0, "medium": 0, "low": count, "unknown": 0},
+                "packages_checked": count,
+            }
+
+            result = cli_runner.invoke(
+                security, ["--project-root", str(temp_project_dir), "--no-ai"]
+            )
+
+        assert result.exit_code == 0
+        assert mock_pager.called is paged
+        if paged:
+            assert "GHSA-24" in mock_pager.call_args.args[0]
+            assert "GHSA-24" not in result.output
+        else:
+            assert f"GHSA-{count - 1}" in result.output
+
     def test_security_fix_flag(self, cli_runner, temp_project_dir):
         """Test security command with --fix flag shows suggestions."""
         with patch.object(security_module, "SecurityAuditor") as mock_auditor_class:
@@ -168,6 +241,33 @@ class TestBuildSecurityTask:
         assert "GHSA-1234" in task
         assert "1 security" in task or "remediation" in task.lower()
 
+    def test_vuln_lines(self):
+        vulns = [
+            {
+                "package": "requests",
+                "installed_version": "2.25.0",
+                "vuln_id": "GHSA-1",
+                "severity": "high",
+                "summary": "SSRF",
+                "fixed_in": "2.31.0",
+            },
+            {
+                "package": "click",
+                "installed_version": "8.0",
+                "vuln_id": "PYSEC-2",
+                "severity": "low",
+                "summary": "Minor",
+                "fixed_in": None,
+            },
+        ]
+        task = _build_security_task(vulns, {"high": 1, "low": 1})
+
+        assert (
+            "- [HIGH] requests (2.25.0): GHSA-1 - SSRF (fixed in 2.31.0)\n"
+            "- [LOW] click (8.0): PYSEC-2 - Minor\n"
+        ) in task
+        assert task.startswith("Analyze the following 2 security vulnerabilities")
+
 
 class TestSeverityColor:
     def test_critical(self):
@@ -179,6 +279,10 @@ class TestSeverityColor:
     def test_unknown(self):
         assert _severity_color("unknown") == "white"
 
+    def test_case_insensitive_and_unrecognized(self):
+        assert _severity_color("HIGH") == "red"
+        assert _severity_color("moderate") == "white"
+
 
 class TestSecurityAuditor:
     """Test SecurityAuditor analyzer directly."""
@@ -247,3 +351,180 @@ dev = ["pytest>=7.0"]
 
         result = SecurityAuditor._parse_dep_string('tomli>=2.0; python_version < "3.11"')
         assert result["name"] == "tomli"
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_query_osv_batch(self, use_orjson):
+        import requests
+
+        from hatch_agent.analyzers import security as security_analyzer
+        from hatch_agent.analyzers.security import SecurityAuditor
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(
+            {"results": [{"vulns": [{"id": "GHSA-1", "modified": "x"}]}, {}]}
+        ).encode()
+        orjson = security_analyzer.orjson if use_orjson else None
+        with (
+            patch.object(security_analyzer, "orjson", orjson),
+            patch("requests.Session.post", return_value=response) as post,
+        ):
+            ids = SecurityAuditor().query_osv_batch([("requests", "2.0"), ("click", None)])
+
+        assert ids == [["GHSA-1"], []]
+        post.assert_called_once()
+        assert post.call_args.kwargs["json"] == {
+            "queries": [
+                {"package": {"name": "requests", "ecosystem": "PyPI"}, "version": "2.0"},
+                {"package": {"name": "click", "ecosystem": "PyPI"}},
+            ]
+        }
+
+    def test_query_osv_batch_failure(self):
+        from hatch_agent.analyzers.security import SecurityAuditor
+
+        with patch("requests.Session.post", side_effect=OSError):
+            ids = SecurityAuditor().query_osv_batch([("requests", "2.0"), ("click", None)])
+
+        assert ids == [None, None]
+
+    def test_requests_share_one_session(self):
+        from hatch_agent.analyzers.security import SecurityAuditor
+
+        auditor = SecurityAuditor()
+        with patch("requests.Session") as mock_session_class:
+            mock_session_class.return_value.get.return_value = MagicMock(status_code=404)
+            auditor.fetch_osv_vuln("GHSA-1")
+            auditor.query_pypi_advisory("requests")
+            auditor.close()
+
+        mock_session_class.assert_called_once_with()
+        session = mock_session_class.return_value
+        assert session.get.call_count == 2
+        assert session.headers.__setitem__.call_args.args == ("User-Agent", "hatch-agent")
+        session.close.assert_called_once_with()
+
+    def test_run_audit_batches_and_dedupes_hydration(self, tmp_path):
+        from hatch_agent.analyzers.security import SecurityAuditor
+
+        (tmp_path / "pyproject.toml").write_text(
+            '[project]\nname = "t"\nversion = "1"\n'
+            'dependencies = ["requests==2.0", "urllib3==1.0"]\n'
+        )
+        auditor = SecurityAuditor(tmp_path)
+        records = {
+            "GHSA-1": {
+                "id": "GHSA-1",
+                "summary": "shared",
+                "database_specific": {"severity": "HIGH"},
+            },
+            "GHSA-2": {"id": "GHSA-2", "summary": "only urllib3"},
+        }
+
+        with (
+            patch.object(
+                auditor, "query_osv_batch", return_value=[["GHSA-1"], ["GHSA-1", "GHSA-2"]]
+            ) as batch,
+            patch.object(auditor, "fetch_osv_vuln", side_effect=records.get) as fetch,
+            patch.object(auditor, "query_pypi_advisory", return_value=[]),
+            patch.object(auditor, "query_osv") as single,
+        ):
+            result = auditor.run_audit()
+
+        batch.assert_called_once_with([("requests", "2.0"), ("urllib3", "1.0")])
+        assert sorted(call.args[0] for call in fetch.call_args_list) == ["GHSA-1", "GHSA-2"]
+        single.assert_not_called()
+        assert [(v["package"], v["vuln_id"]) for v in result["vulnerabilities"]] == [
+            ("requests", "GHSA-1"),
+            ("urllib3", "GHSA-2"),
+        ]
+        assert result["summary"]["high"] == 1
+        assert result["summary"]["unknown"] == 1
+
+    def _audited_project(self, tmp_path):
+        (tmp_path / "pyproject.toml").write_text(
+            '[project]\nname = "t"\nversion = "1"\ndependencies = ["requests==2.0", "click==8.0"]\n'
+        )
+        return tmp_path
+
+    def test_run_audit_reuses_cached_osv_results(self, tmp_path):
+        from hatch_agent.analyzers.security import SecurityAuditor
+
+        project = self._audited_project(tmp_path)
+        calls = {"batch": 0, "fetch": 0}
+
+        def run():
+            auditor = SecurityAuditor(project)
+
+            def batch(queries):
+                calls["batch"] += 1
+                return [["GHSA-1"] if name == "requests" else [] for name, _ in queries]
+
+            def fetch(vuln_id):
+                calls["fetch"] += 1
+                return {"id": vuln_id, "summary": "bad"}
+
+            with (
+                patch.object(auditor, "query_osv_batch", side_effect=batch),
+                patch.object(auditor, "fetch_osv_vuln", side_effect=fetch),
+                patch.object(auditor, "query_pypi_advisory", return_value=[]),
+            ):
+                return auditor.run_audit()
+
+        first = run()
+        second = run()
+
+        assert calls == {"batch": 1, "fetch": 1}
+        assert first["vulnerabilities"] == second["vulnerabilities"]
+        assert [v["vuln_id"] for v in second["vulnerabilities"]] == ["GHSA-1"]
+
+    def test_run_audit_does_not_cache_failed_lookups(self, tmp_path):
+        from hatch_agent.analyzers.security import SecurityAuditor
+
+        project = self._audited_project(tmp_path)
+        auditor = SecurityAuditor(project)
+
+        with (
+            patch.object(auditor, "query_osv_batch", return_value=[None, None]) as batch,
+            patch.object(auditor, "query_pypi_advisory", return_value=[]),
+        ):
+            auditor.run_audit()
+            auditor.run_audit()
+
+        assert batch.call_count == 2
+        assert batch.call_args.args[0] == [("requests", "2.0"), ("click", "8.0")]
+
+    def test_run_audit_cache_disabled(self, tmp_path, isolated_cache_dir):
+        from hatch_agent.analyzers.security import SecurityAuditor
+
+        project = self._audited_project(tmp_path)
+        auditor = SecurityAuditor(project, cache_ttl=0)
+
+        with (
+            patch.object(auditor, "query_osv_batch", return_value=[[], []]) as batch,
+            patch.object(auditor, "query_pypi_advisory", return_value=[]),
+        ):
+            auditor.run_audit()
+            auditor.run_audit()
+
+        assert batch.call_count == 2
+        assert not (isolated_cache_dir / "osv.sqlite").exists()
+
+    def test_run_audit_unwritable_cache_dir(self, tmp_path, unwritable_cache_dir):
+        from hatch_agent.analyzers.security import SecurityAuditor
+
+        project = self._audited_project(tmp_path)
+        auditor = SecurityAuditor(project)
+
+        with (
+            patch.object(auditor, "query_osv_batch", return_value=[["GHSA-1"], []]) as batch,
+            patch.object(auditor, "fetch_osv_vuln", return_value={"id": "GHSA-1"}),
+            patch.object(auditor, "query_pypi_advisory", return_value=[]),
+        ):
+            first = auditor.run_audit()
+            second = auditor.run_audit()
+
+        assert batch.call_count == 2
+        assert [v["vuln_id"] for v in first["vulnerabilities"]] == ["GHSA-1"]
+        assert first["vulnerabilities"] == second["vulnerabilities"]
+        assert not unwritable_cache_dir.exists()
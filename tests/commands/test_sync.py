@@ -1,13 +1,20 @@
 """Tests for sync command."""
 
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
 from click.testing import CliRunner
 
 from hatch_agent.commands.sync import (
+    _analyze_batch,
+    _analyze_package,
     _apply_code_changes,
+    _build_batch_update_task,
     _build_update_task,
+    _code_window,
     _extract_update_plan,
     sync,
 )
@@ -298,7 +305,7 @@ class TestApplyCodeChanges:
 
     def test_apply_code_changes_empty_list(self, mock_agent, tmp_path):
         """Test with empty code changes list."""
-        result = _apply_code_changes([], tmp_path, mock_agent, {})
+        result = _apply_code_changes([], tmp_path, lambda: mock_agent, {})
         assert result == 0
 
     def test_apply_code_changes_file_not_found(self, mock_agent, tmp_path):
@@ -311,7 +318,7 @@ class TestApplyCodeChanges:
             }
         ]
 
-        result = _apply_code_changes(changes, tmp_path, mock_agent, {})
+        result = _apply_code_changes(changes, tmp_path, lambda: mock_agent, {})
         assert result == 0
         mock_agent.run_task.assert_not_called()
 
@@ -327,7 +334,7 @@ class TestApplyCodeChanges:
             }
         ]
 
-        result = _apply_code_changes(changes, tmp_path, mock_agent, {})
+        result = _apply_code_changes(changes, tmp_path, lambda: mock_agent, {})
 
         assert result == 1
         mock_agent.run_task.assert_called_once()
@@ -344,11 +351,93 @@ class TestApplyCodeChanges:
             }
         ]
 
-        result = _apply_code_changes(changes, tmp_path, mock_agent, {})
+        result = _apply_code_changes(changes, tmp_path, lambda: mock_agent, {})
 
         # Still returns 0 because change was not applied successfully
         assert result == 0
 
+    def test_apply_code_changes_sends_line_window(self, mock_agent, tmp_path):
+        """Test that a line-ranged change only sends nearby lines."""
+        source = tmp_path / "big.py"
+        source.write_text("".join(f"line {n}\n" for n in range(1, 101)))
+        changes = [{"file": "big.py", "line_range": "50-51", "description": "Update"}]
+
+        _apply_code_changes(changes, tmp_path, lambda: mock_agent, {})
+
+        task = mock_agent.run_task.call_args[0][0]
+        assert "Original code (lines 45-56):" in task
+        assert "line 45\n" in task and "line 56\n" in task
+        assert "line 44\n" not in task and "line 57\n" not in task
+        assert "Return ONLY the modified lines 45-56" in task
+
+    def test_apply_code_changes_without_range_sends_file(
+        self, mock_agent, tmp_path, temp_source_file
+    ):
+        """Test that changes without a usable range fall back to the whole file."""
+        changes = [{"file": "src/app.py", "line_range": "N/A", "description": "Update"}]
+
+        _apply_code_changes(changes, tmp_path, lambda: mock_agent, {})
+
+        task = mock_agent.run_task.call_args[0][0]
+        assert "import requests\n\ndef main():\n    pass\n" in task
+        assert "Return the COMPLETE modified file content" in task
+
+    def test_apply_code_changes_reads_each_file_once(self, mock_agent, tmp_path, temp_source_file):
+        """Test that several changes to one file share a single read."""
+        changes = [
+            {"file": "src/app.py", "line_range": "1", "description": "First"},
+            {"file": "src/app.py", "line_range": "3-4", "description": "Second"},
+        ]
+
+        with patch("pathlib.Path.read_text", autospec=True, return_value="a\nb\nc\nd\n") as read:
+            result = _apply_code_changes(changes, tmp_path, lambda: mock_agent, {})
+
+        assert result == 2
+        read.assert_called_once()
+
+    def test_apply_code_changes_runs_files_concurrently(self, tmp_path):
+        """Test that different files are handled at once, each with its own agent."""
+        for name in ("a.py", "b.py"):
+            (tmp_path / name).write_text("x = 1\n")
+        changes = [
+            {"file": "a.py", "description": "First"},
+            {"file": "b.py", "description": "Second"},
+            {"file": "a.py", "description": "Third"},
+        ]
+        # Both files must be in flight at once to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        agents = []
+
+        def make_agent():
+            agent = MagicMock()
+
+            def run_task(task):
+                if "Change needed: Third" not in task:
+                    barrier.wait()
+                return {"success": True, "output": "ok"}
+
+            agent.run_task.side_effect = run_task
+            agents.append(agent)
+            return agent
+
+        result = _apply_code_changes(changes, tmp_path, make_agent, {})
+
+        assert result == 3
+        assert sorted(agent.run_task.call_count for agent in agents) == [1, 2]
+
+
+class TestCodeWindow:
+    """Test _code_window function."""
+
+    def test_clamps_to_file_bounds(self):
+        """Test that the context window stays inside the file."""
+        assert _code_window("a\nb\nc", "2") == (1, 3, "a\nb\nc")
+
+    @pytest.mark.parametrize("line_range", [None, "", "N/A", "10-5", "0-3"])
+    def test_unusable_ranges(self, line_range):
+        """Test that missing or malformed ranges return None."""
+        assert _code_window("a\nb\nc", line_range) is None
+
 
 class TestUpdateClassification:
     """Test update classification in sync output."""
@@ -689,3 +778,234 @@ class TestSyncCodeChanges:
 
         assert result.exit_code == 0
         assert "Analysis failed" in result.output
+
+
+def _plan_result(breaking_change: str) -> dict:
+    return {
+        "success": True,
+        "selected_suggestion": "UPDATE_PLAN:\n"
+        + json.dumps({"breaking_changes": [breaking_change], "code_changes": []}),
+    }
+
+
+class TestAnalyzePackage:
+    """Test per-package breaking change analysis."""
+
+    @patch("hatch_agent.commands.sync.Agent")
+    def test_returns_plan_entries_tagged_with_package(self, mock_agent_class, tmp_path):
+        """Test breaking and code changes are returned, code changes tagged."""
+        mock_agent_class.return_value.run_task.return_value = {
+            "success": True,
+            "selected_suggestion": (
+                'UPDATE_PLAN:\n{"breaking_changes": ["API changed"], '
+                '"code_changes": [{"file": "app.py", "description": "Update"}]}'
+            ),
+        }
+        updater = MagicMock()
+        updater.get_changelog_url.return_value = None
+        update = {"package": "pkg", "old_version": "1.0", "new_version": "2.0"}
+
+        breaking, code, error = _analyze_package(update, updater, tmp_path, [], "openai", {})
+
+        assert breaking == ["API changed"]
+        assert code == [{"file": "app.py", "description": "Update", "package": "pkg"}]
+        assert error is None
+        mock_agent_class.return_value.prepare.assert_called_once()
+        assert mock_agent_class.return_value.prepare.call_args[0][0]["package"] == "pkg"
+
+    @patch("hatch_agent.commands.sync.Agent")
+    def test_failure_returns_error(self, mock_agent_class, tmp_path):
+        """Test a failed run is reported through the error slot."""
+        mock_agent_class.return_value.run_task.return_value = {"success": False, "output": "boom"}
+        updater = MagicMock()
+        update = {"package": "pkg", "old_version": "1.0", "new_version": "2.0"}
+
+        assert _analyze_package(update, updater, tmp_path, [], "openai", {}) == ([], [], "boom")
+
+    @patch("hatch_agent.commands.sync.Agent")
+    def test_identical_analysis_is_cached(self, mock_agent_class, tmp_path):
+        """Test that re-analyzing the same update reuses the cached result."""
+        mock_agent_class.return_value.run_task.return_value = _plan_result("API changed")
+        updater = MagicMock()
+        updater.get_changelog_url.return_value = None
+        update = {"package": "pkg", "old_version": "1.0", "new_version": "2.0"}
+
+        first = _analyze_package(update, updater, tmp_path, [], "openai", {}, cache_ttl=60)
+        second = _analyze_package(update, updater, tmp_path, [], "openai", {}, cache_ttl=60)
+
+        assert first == second == (["API changed"], [], None)
+        mock_agent_class.return_value.run_task.assert_called_once()
+
+    @patch("hatch_agent.commands.sync.Agent")
+    def test_zero_ttl_skips_cache(self, mock_agent_class, tmp_path):
+        """Test that a zero TTL always queries the agents."""
+        mock_agent_class.return_value.run_task.return_value = _plan_result("API changed")
+        updater = MagicMock()
+        updater.get_changelog_url.return_value = None
+        update = {"package": "pkg", "old_version": "1.0", "new_version": "2.0"}
+
+        _analyze_package(update, updater, tmp_path, [], "openai", {}, cache_ttl=0)
+        _analyze_package(update, updater, tmp_path, [], "openai", {}, cache_ttl=0)
+
+        assert mock_agent_class.return_value.run_task.call_count == 2
+
+
+def _batch_result(*plans: dict) -> dict:
+    return {
+        "success": True,
+        "selected_suggestion": "UPDATE_PLANS:\n" + json.dumps({"plans": list(plans)}),
+    }
+
+
+class TestAnalyzeBatch:
+    """Test batched breaking change analysis."""
+
+    UPDATES = [
+        {"package": "alpha", "old_version": "1.0", "new_version": "2.0"},
+        {"package": "Beta", "old_version": "3.0", "new_version": "4.0"},
+    ]
+
+    @patch("hatch_agent.commands.sync.Agent")
+    def test_one_request_for_all_packages(self, mock_agent_class, tmp_path):
+        """Test a batch is analyzed in one request and results follow input order."""
+        mock_agent_class.return_value.run_task.return_value = _batch_result(
+            {"package": "beta", "breaking_changes": ["b"], "code_changes": []},
+            {
+                "package": "alpha",
+                "breaking_changes": ["a"],
+                "code_changes": [{"file": "app.py", "description": "Update"}],
+            },
+        )
+        updater = MagicMock()
+        updater.get_changelog_url.return_value = None
+
+        results = _analyze_batch(self.UPDATES, updater, tmp_path, [], "openai", {})
+
+        assert results == [
+            (["a"], [{"file": "app.py", "description": "Update", "package": "alpha"}], None),
+            (["b"], [], None),
+        ]
+        mock_agent_class.return_value.run_task.assert_called_once()
+        context = mock_agent_class.return_value.prepare.call_args[0][0]
+        assert [p["package"] for p in context["packages"]] == ["alpha", "Beta"]
+
+    @patch("hatch_agent.commands.sync.Agent")
+    def test_missing_or_malformed_entries_fall_back(self, mock_agent_class, tmp_path):
+        """Test packages without a usable batched plan are analyzed on their own."""
+        mock_agent_class.return_value.run_task.side_effect = [
+            _batch_result({"package": "alpha", "breaking_changes": ["a"], "code_changes": "x"}),
+            _plan_result("a alone"),
+            _plan_result("b alone"),
+        ]
+        updater = MagicMock()
+        updater.get_changelog_url.return_value = None
+
+        results = _analyze_batch(self.UPDATES, updater, tmp_path, [], "openai", {})
+
+        assert results == [(["a alone"], [], None), (["b alone"], [], None)]
+        assert mock_agent_class.return_value.run_task.call_count == 3
+
+    @patch("hatch_agent.commands.sync.Agent")
+    def test_single_update_uses_package_prompt(self, mock_agent_class, tmp_path):
+        """Test a one-package batch sends the regular per-package task."""
+        mock_agent_class.return_value.run_task.return_value = _plan_result("API changed")
+        updater = MagicMock()
+        updater.get_changelog_url.return_value = None
+
+        results = _analyze_batch(self.UPDATES[:1], updater, tmp_path, [], "openai", {})
+
+        assert results == [(["API changed"], [], None)]
+        task = mock_agent_class.return_value.run_task.call_args[0][0]
+        assert "UPDATE_PLAN:" in task and "UPDATE_PLANS:" not in task
+
+    def test_batch_task_lists_packages(self):
+        """Test the batched task names every package and the plans marker."""
+        task = _build_batch_update_task(self.UPDATES)
+
+        assert "'alpha' from 1.0 to 2.0" in task
+        assert "'Beta' from 3.0 to 4.0" in task
+        assert "UPDATE_PLANS:" in task
+
+
+class TestConcurrentAnalysis:
+    """Test packages are analyzed concurrently with their own agents."""
+
+    @patch("hatch_agent.commands.sync.Agent")
+    @patch("hatch_agent.commands.sync.DependencyUpdater")
+    @patch("hatch_agent.commands.sync.DependencySync")
+    @patch("hatch_agent.commands.sync.load_config")
+    def test_packages_run_concurrently_in_order(
+        self, mock_load_config, mock_sync_class, mock_updater_class, mock_agent_class
+    ):
+        """Test analyses overlap, use separate agents and report in input order."""
+        names = ["alpha", "beta", "gamma"]
+        manager = MagicMock()
+        manager.ensure_environment_exists.return_value = {"success": True, "action": "exists"}
+        manager.run_upgrade.return_value = {"success": True, "action": "upgraded"}
+        manager.compare_versions.return_value = [
+            {"package": n, "old_version": "1.0", "new_version": "2.0", "change_type": "major"}
+            for n in names
+        ]
+        manager.get_installed_versions.side_effect = [{}, {}]
+        mock_sync_class.return_value = manager
+        mock_updater_class.return_value.get_project_files.return_value = []
+        mock_load_config.return_value = {}
+
+        # All three runs must be in flight at once to pass the barrier
+        barrier = threading.Barrier(len(names), timeout=5)
+        agents = []
+
+        def make_agent(**kwargs):
+            agent = MagicMock()
+            state = {}
+            agent.prepare.side_effect = state.update
+
+            def run_task(task):
+                barrier.wait()
+                return _plan_result(f"{state['package']} changed")
+
+            agent.run_task.side_effect = run_task
+            agents.append(agent)
+            return agent
+
+        mock_agent_class.side_effect = make_agent
+
+        result = CliRunner().invoke(sync, ["--no-code-changes", "--batch-size", "1"])
+
+        assert result.exit_code == 0, result.output
+        assert len(agents) == len(names)
+        positions = [result.output.index(f"[{n}] {n} changed") for n in names]
+        assert positions == sorted(positions)
+
+    @patch("hatch_agent.commands.sync.Agent")
+    @patch("hatch_agent.commands.sync.DependencyUpdater")
+    @patch("hatch_agent.commands.sync.DependencySync")
+    @patch("hatch_agent.commands.sync.load_config")
+    def test_workers_option_bounds_pool(
+        self, mock_load_config, mock_sync_class, mock_updater_class, mock_agent_class
+    ):
+        """Test --workers caps the analysis pool size."""
+        manager = MagicMock()
+        manager.ensure_environment_exists.return_value = {"success": True, "action": "exists"}
+        manager.run_upgrade.return_value = {"success": True, "action": "upgraded"}
+        manager.compare_versions.return_value = [
+            {"package": n, "old_version": "1.0", "new_version": "2.0", "change_type": "major"}
+            for n in ("alpha", "beta")
+        ]
+        manager.get_installed_versions.side_effect = [{}, {}]
+        mock_sync_class.return_value = manager
+        mock_updater_class.return_value.get_project_files.return_value = []
+        mock_load_config.return_value = {}
+
+        mock_agent_class.return_value.run_task.return_value = {
+            "success": True,
+            "selected_suggestion": "",
+        }
+
+        with patch(
+            "hatch_agent.commands.sync.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+        ) as mock_pool:
+            result = CliRunner().invoke(sync, ["--no-code-changes", "--workers", "1"])
+
+        assert result.exit_code == 0, result.output
+        mock_pool.assert_called_once_with(max_workers=1)
@@ -1,6 +1,7 @@
 """Tests for update dependency command."""
 
 import importlib
+import json
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
@@ -54,6 +55,127 @@ class TestUpdateDepCLI:
             # Dry run output contains the package info
             assert "requests" in result.output
 
+    @pytest.mark.parametrize(
+        ("args", "changelog_version", "latest"),
+        [([], "2.31.0", True), (["--version", ">=2.0.0"], "2.0.0", False)],
+    )
+    def test_update_dep_changelog_version(self, cli_runner, args, changelog_version, latest):
+        """Test the latest release's changelog reuses the cached latest metadata."""
+        import hatch_agent.commands.update_dependency as update_module
+
+        with (
+            patch.object(update_module, "DependencyUpdater") as mock_updater_class,
+            patch.object(update_module, "load_config", return_value={}),
+            patch.object(update_module, "Agent") as mock_agent_class,
+        ):
+            mock_updater = mock_updater_class.return_value
+            mock_updater.get_latest_version.return_value = "2.31.0"
+            mock_updater.get_current_version.return_value = ">=1.0"
+            mock_updater.get_project_files.return_value = []
+            mock_agent_class.return_value.run_task.return_value = {
+                "success": True,
+                "selected_suggestion": "",
+            }
+
+            result = cli_runner.invoke(update_dep, ["requests", "--dry-run", *args])
+
+            assert result.exit_code == 0, result.output
+            mock_updater.get_changelog_url.assert_called_once_with(
+                "requests", changelog_version, latest=latest
+            )
+
+    @pytest.mark.parametrize(("args", "runs"), [([], 1), (["--no-cache"], 2)])
+    def test_update_dep_reuses_cached_strategy(self, cli_runner, args, runs):
+        """Test that a repeated identical run is answered from the cache."""
+        import hatch_agent.commands.update_dependency as update_module
+
+        with (
+            patch.object(update_module, "DependencyUpdater") as mock_updater_class,
+            patch.object(update_module, "load_config", return_value={}),
+            patch.object(update_module, "Agent") as mock_agent_class,
+        ):
+            mock_updater = mock_updater_class.return_value
+            mock_updater.get_latest_version.return_value = "2.31.0"
+            mock_updater.get_current_version.return_value = ">=1.0"
+            mock_updater.get_project_files.return_value = []
+            mock_agent = mock_agent_class.return_value
+            mock_agent.run_task.return_value = {
+                "success": True,
+                "selected_suggestion": "Bump it",
+            }
+
+            argv = ["requests", "--dry-run", *args]
+            first = cli_runner.invoke(update_dep, argv)
+            second = cli_runner.invoke(update_dep, argv)
+
+        assert first.exit_code == second.exit_code == 0
+        assert mock_agent.run_task.call_count == runs
+        assert mock_agent.prepare.call_count == runs
+        assert "Bump it" in second.output
+        assert ("cached result" in second.output) is (runs == 1)
+
+    def test_update_dep_cached_strategy_prepares_code_changes(self, cli_runner, temp_project_dir):
+        """Test that code changes after a cached strategy still get the context."""
+        import hatch_agent.commands.update_dependency as update_module
+
+        (temp_project_dir / "main.py").write_text("import requests\n")
+        plan = {
+            "version_spec": ">=2.31.0",
+            "code_changes": [{"file": "main.py", "description": "Use new API"}],
+        }
+        with (
+            patch.object(update_module, "DependencyUpdater") as mock_updater_class,
+            patch.object(update_module, "load_config", return_value={}),
+            patch.object(update_module, "Agent") as mock_agent_class,
+        ):
+            mock_updater = mock_updater_class.return_value
+            mock_updater.get_latest_version.return_value = "2.31.0"
+            mock_updater.get_current_version.return_value = ">=1.0"
+            mock_updater.get_project_files.return_value = []
+            mock_updater.update_dependency.return_value = {
+                "success": True,
+                "old_version": ">=1.0",
+                "new_version": ">=2.31.0",
+                "target": "project.dependencies",
+            }
+            mock_agent = mock_agent_class.return_value
+            mock_agent.run_task.return_value = {
+                "success": True,
+                "selected_suggestion": f"UPDATE_PLAN:\n{json.dumps(plan)}",
+            }
+
+            root = ["--project-root", str(temp_project_dir)]
+            cli_runner.invoke(update_dep, ["requests", "--dry-run", *root])
+            mock_agent.prepare.reset_mock()
+            result = cli_runner.invoke(update_dep, ["requests", "--skip-sync", *root], input="y\n")
+
+        assert result.exit_code == 0, result.output
+        assert "cached result" in result.output
+        mock_agent.prepare.assert_called_once()
+        assert mock_agent.prepare.call_args.args[0]["package"] == "requests"
+
+    def test_update_dep_unwritable_cache_dir(self, cli_runner, unwritable_cache_dir):
+        """Test that an unusable cache dir falls back to running the agents."""
+        import hatch_agent.commands.update_dependency as update_module
+
+        with (
+            patch.object(update_module, "DependencyUpdater") as mock_updater_class,
+            patch.object(update_module, "load_config", return_value={}),
+            patch.object(update_module, "Agent") as mock_agent_class,
+        ):
+            mock_updater = mock_updater_class.return_value
+            mock_updater.get_latest_version.return_value = "2.31.0"
+            mock_updater.get_current_version.return_value = ">=1.0"
+            mock_updater.get_project_files.return_value = []
+            mock_agent = mock_agent_class.return_value
+            mock_agent.run_task.return_value = {"success": True, "selected_suggestion": "Bump it"}
+
+            result = cli_runner.invoke(update_dep, ["requests", "--dry-run"])
+
+        assert result.exit_code == 0, result.output
+        assert "Bump it" in result.output
+        mock_agent.run_task.assert_called_once()
+
     def test_update_dep_specific_version(self, cli_runner):
         """Test update to specific version."""
         import hatch_agent.commands.update_dependency as update_module
@@ -190,6 +190,23 @@ def reset_environment():
     os.environ.update(original_env)
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep response caches out of the real user cache directory."""
+    cache_home = tmp_path / "xdg-cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home / "hatch-agent"
+
+
+@pytest.fixture
+def unwritable_cache_dir(tmp_path, monkeypatch):
+    """Point the cache directory below a regular file so it cannot be created."""
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(blocker))
+    return blocker / "hatch-agent"
+
+
 @pytest.fixture
 def mock_llm_provider():
     """Generic mock LLM provider."""
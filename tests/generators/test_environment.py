@@ -54,6 +54,19 @@ class TestGenerateEnvironment:
         )
         assert result is False
 
+    def test_generate_environment_matches_stdlib(self, temp_project_dir):
+        """Test the output is json.dumps(indent=2) even for non-ASCII metadata."""
+        import json
+
+        from hatch_agent.generators.environment import generate_environment
+
+        metadata = {"name": "café", "authors": ["Zoë"], "version": "0.1.0"}
+        out_path = temp_project_dir / "env.json"
+
+        assert generate_environment(metadata, str(out_path)) is True
+        expected = json.dumps({"generated_from": metadata}, indent=2).encode("utf-8")
+        assert out_path.read_bytes() == expected
+
     def test_generate_environment_creates_file(self, temp_project_dir):
         """Test that generate_environment creates the output file."""
         from hatch_agent.generators.environment import generate_environment
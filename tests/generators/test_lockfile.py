@@ -1,6 +1,7 @@
 """Tests for lockfile operations."""
 
 import json
+from unittest.mock import patch
 
 import pytest
 
@@ -142,6 +143,29 @@ class TestWriteLockfile:
         result = write_lockfile("/invalid/path/that/does/not/exist/lock.json", {})
         assert result is False
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"packages": {"zlib": "1.0", "attrs": "2.0"}, "name": "demo", "count": 3},
+            {"name": "café", "big": 2**70},
+            {"packages": {1: "one", "two": 2}, "ok": None},
+        ],
+    )
+    def test_write_lockfile_matches_stdlib(self, temp_project_dir, use_orjson, data):
+        """Test the output is json.dumps(indent=2) with or without orjson."""
+        import hatch_agent.generators.lockfile as lockfile_module
+
+        lockfile_path = temp_project_dir / "hatch.lock"
+        if not use_orjson:
+            with patch.object(lockfile_module, "orjson", None):
+                assert lockfile_module.write_lockfile(str(lockfile_path), data) is True
+        else:
+            assert lockfile_module.write_lockfile(str(lockfile_path), data) is True
+
+        assert lockfile_path.read_bytes() == json.dumps(data, indent=2).encode("utf-8")
+        assert lockfile_module.read_lockfile(str(lockfile_path)) == json.loads(json.dumps(data))
+
 
 class TestLockfileRoundTrip:
     """Test reading and writing lockfiles together."""
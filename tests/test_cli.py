@@ -0,0 +1,68 @@
+"""Tests for the unified CLI entry point."""
+
+import subprocess
+import sys
+
+import click
+from click.testing import CliRunner
+
+from hatch_agent.cli import cli
+from hatch_agent.commands import COMMANDS, load_command
+
+
+class TestCliRegistry:
+    """Test lazy subcommand registration."""
+
+    def test_all_commands_listed(self):
+        """Test that every registered subcommand appears in help."""
+        result = CliRunner().invoke(cli, ["--help"])
+
+        assert result.exit_code == 0
+        for name in COMMANDS:
+            assert name in result.output
+
+    def test_load_command(self):
+        """Test resolving a subcommand by its CLI name."""
+        command = load_command("add-dep")
+
+        assert isinstance(command, click.Command)
+        assert load_command("add-dep") is command
+
+    def test_load_unknown_command(self):
+        """Test that unknown names resolve to None."""
+        assert load_command("does-not-exist") is None
+
+    def test_package_reexports_commands(self):
+        """Test that package attributes are commands, not submodules."""
+        import hatch_agent.commands.doctor  # noqa: F401
+        from hatch_agent.commands import doctor
+
+        assert isinstance(doctor, click.Command)
+
+    def test_import_does_not_load_commands(self):
+        """Test that importing the CLI does not import command modules."""
+        code = (
+            "import sys, hatch_agent.cli; "
+            "print(any(m.startswith('hatch_agent.commands.') for m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "False"
+
+    def test_command_import_defers_heavy_dependencies(self):
+        """Test that loading a command does not import strands or hatch."""
+        code = (
+            "import sys, hatch_agent.commands.chat, hatch_agent.commands.doctor, "
+            "hatch_agent.commands.explain, hatch_agent.commands.fix, "
+            "hatch_agent.commands.migrate, hatch_agent.commands.multi_task, "
+            "hatch_agent.commands.security, hatch_agent.commands.sync, "
+            "hatch_agent.commands.add_dependency, hatch_agent.commands.update_dependency; "
+            "print(sorted(m for m in ('strands', 'hatch.cli', 'requests') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "[]"
@@ -1,17 +1,28 @@
 """Tests for configuration system."""
 
+import sys
 from unittest.mock import patch
 
+import pytest
+
 from hatch_agent.config import (
     DEFAULT_CONFIG,
     PROVIDER_TEMPLATES,
-    _simple_toml_dumps,
+    generate_default_config,
+    get_cache_dir,
     get_config_dir,
     get_config_path,
     load_config,
+    materialize_template,
+    resolve_provider,
     write_config,
 )
 
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
 
 class TestGetConfigDir:
     """Test get_config_dir function."""
@@ -33,6 +44,24 @@ class TestGetConfigDir:
         assert ".config" in result
 
 
+class TestGetCacheDir:
+    """Test get_cache_dir function."""
+
+    def test_with_xdg_cache_home(self, monkeypatch):
+        """Test get_cache_dir when XDG_CACHE_HOME is set."""
+        monkeypatch.setenv("XDG_CACHE_HOME", "/custom/cache")
+        result = get_cache_dir()
+        assert result.endswith("hatch-agent")
+        assert "custom" in result and "cache" in result
+
+    def test_without_xdg_cache_home(self, monkeypatch):
+        """Test get_cache_dir when XDG_CACHE_HOME is not set."""
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+        result = get_cache_dir()
+        assert result.endswith("hatch-agent")
+        assert ".cache" in result
+
+
 class TestGetConfigPath:
     """Test get_config_path function."""
 
@@ -63,9 +92,12 @@ api_key = "test-key"
         assert result["model"] == "gpt-4"
 
     def test_load_config_file_not_found(self, temp_project_dir):
-        """Test load_config returns DEFAULT_CONFIG when file not found."""
+        """Test load_config returns the normalized DEFAULT_CONFIG when file not found."""
         result = load_config(str(temp_project_dir / "nonexistent.toml"))
-        assert result == DEFAULT_CONFIG
+        assert result == {
+            **DEFAULT_CONFIG,
+            "underlying_config": {"model": DEFAULT_CONFIG["model"]},
+        }
 
     def test_load_config_default_path(self, monkeypatch, temp_project_dir):
         """Test load_config uses default path when none provided."""
@@ -79,6 +111,95 @@ api_key = "test-key"
         result = load_config()
         assert result["provider"] == "test"
 
+    def test_load_config_returns_independent_copies(self, temp_project_dir):
+        """Test that mutating a loaded config does not leak into later loads."""
+        config_file = temp_project_dir / "config.toml"
+        config_file.write_text('provider = "openai"\n[underlying_config]\nmodel = "gpt-4"\n')
+
+        first = load_config(str(config_file))
+        first["underlying_config"]["model"] = "changed"
+
+        assert load_config(str(config_file))["underlying_config"]["model"] == "gpt-4"
+
+    def test_load_config_parses_once(self, temp_project_dir):
+        """Test that an unchanged file is not parsed again."""
+        import hatch_agent.config as config_module
+
+        config_file = temp_project_dir / "config.toml"
+        config_file.write_text('provider = "openai"')
+        load_config(config_file)
+
+        with patch.object(config_module._toml_loader, "load") as mock_load:
+            result = load_config(config_file)
+
+        mock_load.assert_not_called()
+        assert result["provider"] == "openai"
+
+    def test_load_config_sees_changes(self, temp_project_dir):
+        """Test that edits and writes are picked up."""
+        config_file = temp_project_dir / "config.toml"
+        config_file.write_text('provider = "openai"')
+        assert load_config(str(config_file))["provider"] == "openai"
+
+        config_file.write_text('provider = "anthropic"')
+        assert load_config(str(config_file))["provider"] == "anthropic"
+
+        write_config({"provider": "bedrock"}, str(config_file))
+        assert load_config(str(config_file))["provider"] == "bedrock"
+
+    def test_load_config_folds_model_into_provider_config(self, temp_project_dir):
+        """Test that the top-level model is copied into underlying_config."""
+        config_file = temp_project_dir / "config.toml"
+        config_file.write_text(
+            'underlying_provider = "openai"\nmodel = "gpt-4"\n[underlying_config]\napi_key = "k"\n'
+        )
+
+        result = load_config(str(config_file))
+
+        assert result["underlying_config"] == {"api_key": "k", "model": "gpt-4"}
+        assert resolve_provider(result) == ("openai", {"api_key": "k", "model": "gpt-4"})
+
+    def test_load_config_keeps_explicit_provider_model(self, temp_project_dir):
+        """Test that a model already in underlying_config is not overwritten."""
+        config_file = temp_project_dir / "config.toml"
+        config_file.write_text('model = "gpt-4"\n[underlying_config]\nmodel = "gpt-4o"\n')
+
+        assert load_config(str(config_file))["underlying_config"] == {"model": "gpt-4o"}
+
+    def test_load_config_default_is_copy(self, temp_project_dir):
+        """Test that the default config cannot be mutated through a load."""
+        result = load_config(str(temp_project_dir / "nonexistent.toml"))
+        result["providers"]["injected"] = {}
+
+        assert "injected" not in DEFAULT_CONFIG["providers"]
+
+
+class TestResolveProvider:
+    """Test resolve_provider function."""
+
+    def test_defaults(self):
+        """Test an empty config resolves to openai with no settings."""
+        assert resolve_provider({}) == ("openai", {})
+
+    def test_model_folded_into_provider_config(self):
+        """Test the top-level model is added without mutating the input."""
+        cfg = {
+            "underlying_provider": "anthropic",
+            "model": "claude-3",
+            "underlying_config": {"api_key": "k"},
+        }
+
+        provider, provider_cfg = resolve_provider(cfg)
+
+        assert provider == "anthropic"
+        assert provider_cfg == {"api_key": "k", "model": "claude-3"}
+        assert cfg["underlying_config"] == {"api_key": "k"}
+
+    def test_explicit_provider_model_wins(self):
+        """Test a model already in the provider config is kept."""
+        cfg = {"model": "gpt-4", "underlying_config": {"model": "gpt-4o"}}
+        assert resolve_provider(cfg)[1] == {"model": "gpt-4o"}
+
 
 class TestWriteConfig:
     """Test write_config function."""
@@ -103,6 +224,19 @@ class TestWriteConfig:
         assert result is True
         assert deep_path.exists()
 
+    def test_write_config_round_trips(self, temp_project_dir):
+        """Test that written configs, including quotes and tables, load back."""
+        config_file = temp_project_dir / "config.toml"
+        config = {
+            "provider": 'say "hi"\\',
+            "tags": ["a", "b"],
+            "providers": {"openai": {"api_key": "secret", "enabled": True}},
+        }
+
+        assert write_config(config, str(config_file)) is True
+        with open(config_file, "rb") as f:
+            assert tomllib.load(f) == config
+
     def test_write_config_failure(self, temp_project_dir):
         """Test write_config returns False on failure."""
         # Try to write to a path that will fail (directory instead of file)
@@ -115,47 +249,31 @@ class TestWriteConfig:
         assert result is False
 
 
-class TestSimpleTomlDumps:
-    """Test _simple_toml_dumps function."""
-
-    def test_string_values(self):
-        """Test serializing string values."""
-        config = {"name": "test-project"}
-        result = _simple_toml_dumps(config)
-        assert 'name = "test-project"' in result
-
-    def test_boolean_values(self):
-        """Test serializing boolean values."""
-        config = {"enabled": True, "disabled": False}
-        result = _simple_toml_dumps(config)
-        assert "enabled = true" in result
-        assert "disabled = false" in result
-
-    def test_integer_values(self):
-        """Test serializing integer values."""
-        config = {"count": 42}
-        result = _simple_toml_dumps(config)
-        assert "count = 42" in result
-
-    def test_list_values(self):
-        """Test serializing list values."""
-        config = {"items": ["a", "b", "c"]}
-        result = _simple_toml_dumps(config)
-        assert "items = [" in result
-        assert '"a"' in result
-
-    def test_nested_dict(self):
-        """Test serializing nested dictionaries."""
-        config = {"top": "value", "nested": {"key1": "val1", "key2": "val2"}}
-        result = _simple_toml_dumps(config)
-        assert "[nested]" in result
-        assert 'key1 = "val1"' in result
-
-    def test_deeply_nested_dict(self):
-        """Test serializing deeply nested structure."""
-        config = {"providers": {"openai": {"api_key": "secret"}}}
-        result = _simple_toml_dumps(config)
-        assert "[providers]" in result
+class TestGenerateDefaultConfig:
+    """Test generate_default_config function."""
+
+    def test_writes_default_config(self, temp_project_dir):
+        """Test the default config round-trips through the written file."""
+        config_file = temp_project_dir / "config.toml"
+
+        assert generate_default_config(str(config_file)) is True
+
+        loaded = load_config(str(config_file))
+        assert loaded["provider"] == DEFAULT_CONFIG["provider"]
+        assert loaded["providers"] == DEFAULT_CONFIG["providers"]
+
+    def test_uses_default_path(self):
+        """Test generate_default_config falls back to get_config_path."""
+        with (
+            patch("hatch_agent.config.get_config_path", return_value="/tmp/x.toml"),
+            patch("hatch_agent.config.write_config", return_value=True) as mock_write,
+        ):
+            assert generate_default_config() is True
+
+        config, path = mock_write.call_args.args
+        assert path == "/tmp/x.toml"
+        assert config == DEFAULT_CONFIG
+        assert config["providers"] is not DEFAULT_CONFIG["providers"]
 
 
 class TestDefaultConfig:
@@ -213,62 +331,31 @@ class TestProviderTemplates:
         for provider, template in PROVIDER_TEMPLATES.items():
             assert "underlying_config" in template, f"{provider} missing underlying_config"
 
+    def test_templates_are_read_only(self):
+        """Test templates and their nested config cannot be mutated."""
+        with pytest.raises(TypeError):
+            PROVIDER_TEMPLATES["openai"]["model"] = "other"
+        with pytest.raises(TypeError):
+            PROVIDER_TEMPLATES["openai"]["underlying_config"]["api_key"] = "secret"
 
-class TestSimpleTomlDumpsExtended:
-    """Extended tests for _simple_toml_dumps edge cases."""
-
-    def test_nested_dict_with_boolean(self):
-        """Test nested dict with boolean values."""
-        config = {"section": {"enabled": True, "disabled": False}}
-        result = _simple_toml_dumps(config)
-        assert "[section]" in result
-        assert "enabled = true" in result
-        assert "disabled = false" in result
-
-    def test_nested_dict_with_integer(self):
-        """Test nested dict with integer values."""
-        config = {"settings": {"timeout": 30, "retries": 3}}
-        result = _simple_toml_dumps(config)
-        assert "[settings]" in result
-        assert "timeout = 30" in result
-        assert "retries = 3" in result
-
-    def test_empty_dict(self):
-        """Test serializing empty dict."""
-        config = {}
-        result = _simple_toml_dumps(config)
-        assert result == ""
-
-    def test_mixed_top_level(self):
-        """Test mixed top-level values."""
-        config = {"name": "project", "count": 5, "enabled": True, "tags": ["a", "b"]}
-        result = _simple_toml_dumps(config)
-        assert 'name = "project"' in result
-        assert "count = 5" in result
-        assert "enabled = true" in result
-        assert "tags = [" in result
-
-
-class TestWriteConfigFallback:
-    """Test write_config fallback path."""
-
-    def test_write_config_with_fallback(self, temp_project_dir):
-        """Test write_config uses fallback when tomli_w not available."""
-        import hatch_agent.config as config_module
 
-        # Temporarily set the writer to None to trigger fallback
-        original_writer = config_module._toml_writer
-        config_module._toml_writer = None
+class TestMaterializeTemplate:
+    """Test materialize_template function."""
+
+    def test_returns_editable_copy(self):
+        """Test edits to the copy leave the template untouched."""
+        config = materialize_template("bedrock")
+        config["model"] = "other"
+        config["underlying_config"]["region"] = "eu-west-1"
 
-        try:
-            config_file = temp_project_dir / "fallback.toml"
-            config = {"provider": "test", "model": "gpt-4"}
+        assert isinstance(config, dict)
+        assert isinstance(config["underlying_config"], dict)
+        assert PROVIDER_TEMPLATES["bedrock"]["model"] != "other"
+        assert PROVIDER_TEMPLATES["bedrock"]["underlying_config"]["region"] == "us-east-1"
 
-            result = write_config(config, str(config_file))
+    def test_copy_is_writable_as_toml(self, temp_project_dir):
+        """Test the materialized template can be written as config."""
+        config_file = temp_project_dir / "config.toml"
 
-            assert result is True
-            assert config_file.exists()
-            content = config_file.read_text()
-            assert 'provider = "test"' in content
-        finally:
-            config_module._toml_writer = original_writer
+        assert write_config(materialize_template("azure"), str(config_file)) is True
+        assert load_config(str(config_file))["underlying_provider"] == "azure"